@@ -0,0 +1,191 @@
+import os
+import json
+import time
+import inspect
+import logging
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+# Timing of one slash command, keyed by its trigger_id
+class CommandTrace:
+    def __init__(self, command, received_at):
+        self.command = command
+        self.received_at = received_at
+        self.time_to_ack = None
+        self.phases = []
+
+
+# Measures how close slash commands get to Slack's 3 second deadline: time from the envelope's
+# receipt by the Socket Mode client (see envelope_received) to ack() reaching the handler, and
+# to views.open returning with the trigger_id. Without receipt times, e.g. outside Socket Mode,
+# timing starts at dispatch and leaves out the time spent queued for a worker.
+# Slow commands are logged with a per-phase breakdown; when the p99 of either measure nears
+# the deadline a structured warning with a percentile summary is logged.
+class AckWatchdog:
+    def __init__(self, deadline=3.0, warn_ratio=0.8, slow_seconds=1.5, window=1000, check_interval=10.0, warn_interval=60.0, max_traces=1000):
+        self.deadline = deadline
+        self.warn_ratio = warn_ratio
+        self.slow_seconds = slow_seconds
+        self.check_interval = check_interval
+        self.warn_interval = warn_interval
+        self.max_traces = max_traces
+        self._traces = OrderedDict()
+        # trigger_id -> receipt time of slash commands not dispatched yet
+        self._received = OrderedDict()
+        self._samples = {"time_to_ack": deque(maxlen=window), "time_to_views_open": deque(maxlen=window)}
+        self._lock = threading.Lock()
+        self._next_check = 0.0
+        self._last_warning = {}
+
+    # ACK_DEADLINE_SECONDS, ACK_WARN_RATIO, ACK_SLOW_SECONDS, ACK_WATCHDOG_WINDOW
+    @classmethod
+    def from_env(cls):
+        return cls(
+            deadline=float(os.environ.get("ACK_DEADLINE_SECONDS", "3")),
+            warn_ratio=float(os.environ.get("ACK_WARN_RATIO", "0.8")),
+            slow_seconds=float(os.environ.get("ACK_SLOW_SECONDS", "1.5")),
+            window=int(os.environ.get("ACK_WATCHDOG_WINDOW", "1000"))
+        )
+
+    # Lifecycle.on_receive callback: note when a slash command's envelope was read
+    def envelope_received(self, envelope):
+        if envelope.get("type") != "slash_commands":
+            return
+        trigger_id = (envelope.get("payload") or {}).get("trigger_id")
+        with self._lock:
+            self._received[trigger_id] = time.monotonic()
+            while len(self._received) > self.max_traces:
+                self._received.popitem(last=False)
+
+    def _start(self, body):
+        now = time.monotonic()
+        with self._lock:
+            received_at = self._received.pop(body.get("trigger_id"), now)
+        trace = CommandTrace(body["command"], received_at)
+        if received_at < now:
+            trace.phases.append(("queued", now - received_at))
+        with self._lock:
+            self._traces[body.get("trigger_id")] = trace
+            while len(self._traces) > self.max_traces:
+                self._traces.popitem(last=False)
+        return trace
+
+    def _acked(self, trace):
+        trace.time_to_ack = time.monotonic() - trace.received_at
+        self._record("time_to_ack", trace.time_to_ack)
+        if trace.time_to_ack >= self.slow_seconds:
+            self._log_slow(trace, "ack", trace.time_to_ack)
+
+    # Global middleware, installed first: next() returns once the listener has acked
+    def middleware(self, body, next):
+        if not body.get("command"):
+            return next()
+        trace = self._start(body)
+        try:
+            return next()
+        finally:
+            self._acked(trace)
+
+    async def async_middleware(self, body, next):
+        if not body.get("command"):
+            return await next()
+        trace = self._start(body)
+        try:
+            return await next()
+        finally:
+            self._acked(trace)
+
+    def _trace(self, trigger_id):
+        with self._lock:
+            return self._traces.get(trigger_id)
+
+    def record_phase(self, trigger_id, name, seconds):
+        trace = self._trace(trigger_id)
+        if trace is not None:
+            trace.phases.append((name, seconds))
+
+    # Time a step of the command's slow path, e.g. the reminder lookup
+    @contextmanager
+    def phase(self, trigger_id, name):
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record_phase(trigger_id, name, time.monotonic() - started)
+
+    # views.open returned; api_started times the API call itself for the breakdown
+    def views_opened(self, trigger_id, api_started=None):
+        with self._lock:
+            trace = self._traces.pop(trigger_id, None)
+        if trace is None:
+            return
+        now = time.monotonic()
+        if api_started is not None:
+            trace.phases.append(("api_call", now - api_started))
+        elapsed = now - trace.received_at
+        self._record("time_to_views_open", elapsed)
+        if elapsed >= self.slow_seconds:
+            self._log_slow(trace, "views.open", elapsed)
+
+    def _log_slow(self, trace, step, elapsed):
+        breakdown = ", ".join(f"{name} {seconds:.3f}s" for name, seconds in trace.phases)
+        ack = "pending" if trace.time_to_ack is None else f"{trace.time_to_ack:.3f}s"
+        logger.warning(f"Slow {trace.command}: {step} at {elapsed:.3f}s of {self.deadline:.1f}s (ack {ack}; {breakdown or 'no phases'})")
+
+    def _record(self, measure, seconds):
+        now = time.monotonic()
+        with self._lock:
+            self._samples[measure].append(seconds)
+            if now < self._next_check:
+                return
+            self._next_check = now + self.check_interval
+        self._check(now)
+
+    def _check(self, now):
+        threshold = self.deadline * self.warn_ratio
+        for measure, summary in self.stats().items():
+            if not summary or summary["p99"] < threshold or now - self._last_warning.get(measure, -self.warn_interval) < self.warn_interval:
+                continue
+            self._last_warning[measure] = now
+            logger.warning(json.dumps(dict(summary, event="ack_deadline_at_risk", measure=measure, deadline=self.deadline, threshold=round(threshold, 3))))
+
+    # p50/p90/p99/max in seconds over the most recent commands, per measure
+    def stats(self):
+        with self._lock:
+            samples = {measure: sorted(values) for measure, values in self._samples.items()}
+        return {
+            measure: {
+                "samples": len(ordered),
+                "p50": round(_percentile(ordered, 0.5), 4),
+                "p90": round(_percentile(ordered, 0.9), 4),
+                "p99": round(_percentile(ordered, 0.99), 4),
+                "max": round(ordered[-1], 4)
+            } if ordered else {}
+            for measure, ordered in samples.items()
+        }
+
+
+# Shared by the sync and async apps and by views.open_view
+watchdog = AckWatchdog.from_env()
+
+
+async def _views_opened_async(trigger_id, response, api_started):
+    response = await response
+    watchdog.views_opened(trigger_id, api_started)
+    return response
+
+
+# Mark views.open as returned for the trigger_id, awaiting it first for AsyncWebClient
+def views_opened(trigger_id, response, api_started):
+    if inspect.isawaitable(response):
+        return _views_opened_async(trigger_id, response, api_started)
+    watchdog.views_opened(trigger_id, api_started)
+    return response
@@ -0,0 +1,68 @@
+from datetime import timedelta
+from storage import ROLLUP_FIELDS
+from views import TEAM_NAMES
+
+
+# Period keys a report date is rolled up under: the day and its ISO week
+def day_key(day):
+    return day.isoformat()
+
+
+def week_key(day):
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _ratio(numerator, denominator):
+    return numerator / denominator if denominator else None
+
+
+# Completion ratio, tested ratio and defect rate of a rollup
+def _rates(counts):
+    if not counts:
+        return None
+    return dict(
+        counts,
+        completion_ratio=_ratio(counts["definition_of_done"], counts["deliverable_tickets"]),
+        tested_ratio=_ratio(counts["tested_tickets"], counts["deliverable_tickets"]),
+        defect_rate=_ratio(counts["defects"], counts["tested_tickets"])
+    )
+
+
+def _trend(current, previous, key):
+    if not current or not previous or current[key] is None or previous[key] is None:
+        return None
+    return current[key] - previous[key]
+
+
+# Per-team rollups of BA and QA report numbers.
+# Each submission updates its team's day and week rows in the store as it arrives, so a
+# summary reads a handful of precomputed rows and never rescans submitted reports.
+class ReportAggregator:
+    def __init__(self, store, teams=TEAM_NAMES):
+        self.store = store
+        self.teams = teams
+
+    # Fold a parsed BA/QA report into its team's day and week
+    def record(self, report_type, report):
+        if not report.get("team_name") or not report.get("date"):
+            return
+        day = report["date"]
+        counts = {field: report.get(field) for field in ROLLUP_FIELDS}
+        self.store.record_rollup(report_type, report["team_name"], day_key(day), week_key(day), counts)
+
+    # Today's numbers, this week's and the week-over-week change of the ratios, per team
+    def summary(self, report_type, today):
+        day, week, previous_week = day_key(today), week_key(today), week_key(today - timedelta(days=7))
+        rollups = self.store.get_rollups(report_type, (day, week, previous_week))
+        teams = {}
+        for team in self.teams:
+            current = _rates(rollups.get((week, team)))
+            previous = _rates(rollups.get((previous_week, team)))
+            teams[team] = {
+                "day": _rates(rollups.get((day, team))),
+                "week": current,
+                "completion_trend": _trend(current, previous, "completion_ratio"),
+                "defect_trend": _trend(current, previous, "defect_rate")
+            }
+        return {"report_type": report_type, "date": today, "week": week, "teams": teams}
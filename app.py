@@ -1,10 +1,30 @@
 import os
+import time
 import logging
-import json
-import pytz
-from datetime import datetime
+import threading
 from slack_bolt import App
 from slack_bolt.adapter.socket_mode import SocketModeHandler
+from storage import open_store
+from views import DEPLOY_FORM, BULK_DEPLOY_FORM, BA_FORM, QA_FORM, open_view
+from reports import deploy_message_blocks, bulk_deploy_message_blocks, chunk_blocks, ba_message_blocks, qa_message_blocks, summary_message_blocks, deploy_history_blocks
+from bulk_deploy import parse_projects
+from deploy_history import parse_history_query
+from reminders import process_reminder_message
+from reminder_window import window_for_channel
+from aggregates import ReportAggregator
+from prefilter import MessagePrefilter
+from backfill import backfill_reminders
+from scheduler import Scheduler
+from nudges import NudgeTracker
+from outbound import OutboundQueue
+from task_links import TaskLinkProcessor
+from dedup import DedupCache
+from http_transport import transport
+from rate_limit import RateLimitedWebClient, limiter
+from workers import worker_count, run_workers
+from metrics import metrics
+from ack_watchdog import watchdog
+from lifecycle import lifecycle
 
 # Set up basic logging if the application is running in development
 if os.environ.get("ENV") == "development":
@@ -12,1135 +32,310 @@ if os.environ.get("ENV") == "development":
 elif os.environ.get("ENV") == "production":
     logging.basicConfig(level=logging.INFO)
     
-# Function to store reminder timestamp in a file, ensuring one entry per channel
+# Reminders and submitted reports live in the backend selected by STORAGE_BACKEND
+store = open_store()
+
+# Function to store reminder timestamp, ensuring one entry per channel
 def store_reminder_ts(channel_id, message_ts):
-    reminder_data = {
-        "channel_id": channel_id,
-        "message_ts": message_ts
-    }
+    store.store_reminder(channel_id, message_ts)
+    nudges.reminder_stored(channel_id, message_ts)
 
-    try:
-        with open('reminder_ts.json', 'r') as f:
-            try:
-                reminders = json.load(f)
-            except json.JSONDecodeError:
-                reminders = {}
-    except FileNotFoundError:
-        reminders = {}
+# Function to retrieve reminder timestamp for a specific channel
+def get_reminder_ts(channel_id):
+    return store.get_reminder(channel_id)
 
-    # Ensure only one entry per channel
-    reminders[channel_id] = reminder_data
+# Thread a report under the reminder of its selected date; dates without one (or older than
+# REMINDER_HISTORY_DAYS) fall back to the reminder the modal was opened for
+def report_thread_ts(channel_id, report, reminder_message_ts):
+    return store.get_reminder_for_date(channel_id, report["date"].isoformat()) or reminder_message_ts
 
-    with open('reminder_ts.json', 'w') as f:
-        json.dump(reminders, f, indent=4)
+# Initializes your app with your bot token and socket mode handler.
+# Every Web API call goes through the process-wide, tier-aware rate limiter.
+# SLACK_API_URL points the app at another Web API, e.g. the fake one used by the load test.
+# Listeners run their post-ack work on the lifecycle's pool, so a shutdown can wait for it.
+app = App(client=RateLimitedWebClient(
+    token=os.environ.get("SLACK_BOT_TOKEN"),
+    base_url=os.environ.get("SLACK_API_URL", RateLimitedWebClient.BASE_URL)
+), listener_executor=lifecycle.executor)
 
-# Function to retrieve reminder timestamp for a specific channel from a file
-def get_reminder_ts(channel_id):
-    try:
-        with open('reminder_ts.json', 'r') as f:
-            try:
-                reminders = json.load(f)
-                if channel_id in reminders:
-                    reminder_data = reminders[channel_id]
-                    return reminder_data["channel_id"], reminder_data["message_ts"]
-            except json.JSONDecodeError:
-                return None, None
-    except FileNotFoundError:
-        return None, None
-    return None, None
+# Time slash commands from receipt to ack and views.open; installed first so it sees everything
+if os.environ.get("ACK_WATCHDOG", "true") == "true":
+    lifecycle.on_receive(watchdog.envelope_received)
+    app.use(watchdog.middleware)
+
+# Drop message events that cannot be reminders before listener dispatch
+message_prefilter = MessagePrefilter.from_env()
+app.use(message_prefilter.middleware)
+
+# Hand listeners the rate-limited client instead of Bolt's per-request one
+app.use(app.client.middleware)
+
+# Bounded TTL cache of handled view submissions, backed by store claims
+submissions = DedupCache.from_env(store)
 
-# Initializes your app with your bot token and socket mode handler
-app = App(token=os.environ.get("SLACK_BOT_TOKEN"))
+# Per-team day and week rollups of the BA/QA numbers, updated on every submission
+aggregator = ReportAggregator(store)
+
+# Report posts are handed to a bounded worker pool with retries and a dead-letter file
+outbound = OutboundQueue.from_env(app.client).start()
+
+# Ticket keys and URLs in "Key Changes & Tasks", rendered as a deduplicated list with cached titles
+task_links = TaskLinkProcessor.from_env()
+
+# Nudges teams that have not reported NUDGE_DELAY_SECONDS after their channel's reminder
+scheduler = Scheduler(name="nudge-scheduler")
+nudges = NudgeTracker.from_env(store, outbound, scheduler)
+
+# On SIGTERM, once listeners have finished: stop nudging, post what is still queued and
+# flush reminder state
+lifecycle.on_shutdown("nudges", lambda timeout: scheduler.stop())
+lifecycle.on_shutdown("outbound", outbound.close)
+lifecycle.on_shutdown("store", lambda timeout: store.close())
 
 # The echo command simply echoes on command
 @app.command("/notify-deploy")
+@metrics.listener
 def open_modal(ack, body, client):
     # Acknowledge command request
     ack()
     
-    # Call views_open with the built-in client
-    client.views_open(
+    # Open the prebuilt modal with the built-in client
+    open_view(
+        client,
         # Pass a valid trigger_id within 3 seconds of receiving it
-        trigger_id=body["trigger_id"],
-        # View payload
-        view={
-            "type": "modal",
-            "private_metadata": body["channel_id"],
-            "callback_id": "deploy_modal",
-            "title": {"type": "plain_text", "text": "Deployment Notification"},
-            "submit": {"type": "plain_text", "text": "Send"},
-            "blocks": [
-              {
-                "type": "section",
-                "text": {
-                  "type": "plain_text",
-                  "text": ":wave: Hey!\n\nPlease fill the form to notify the team about the latest deployment.",
-                  "emoji": True
-                }
-              },
-              {
-                "type": "divider"
-              },
-              {
-                "type": "input",
-                "block_id": "project_name",
-                "label": {
-                  "type": "plain_text",
-                  "text": "Project Name",
-                  "emoji": True
-                },
-                "element": {
-                  "type": "plain_text_input",
-                  "action_id": "project_name-action"
-                }
-              },
-              {
-                "type": "input",
-                "block_id": "deployment_type",
-                "label": {
-                  "type": "plain_text",
-                  "text": "Deployment Type",
-                  "emoji": True
-                },
-                "element": {
-                  "type": "static_select",
-                  "placeholder": {
-                    "type": "plain_text",
-                    "text": "Select mode",
-                    "emoji": True
-                  },
-                  "action_id": "deployment_type-action",
-                  "options": [
-                    {
-                      "text": {
-                        "type": "plain_text",
-                        "text": "Production",
-                        "emoji": True
-                      },
-                      "value": "Production"
-                    },
-                    {
-                      "text": {
-                        "type": "plain_text",
-                        "text": "Staging",
-                        "emoji": True
-                      },
-                      "value": "Staging"
-                    },
-                    {
-                      "text": {
-                        "type": "plain_text",
-                        "text": "Development",
-                        "emoji": True
-                      },
-                      "value": "Development"
-                    }
-                  ]
-                }
-              },
-              {
-                "type": "input",
-                "block_id": "deployment_version",
-                "label": {
-                  "type": "plain_text",
-                  "text": "Deployment Version",
-                  "emoji": True
-                },
-                "element": {
-                  "type": "plain_text_input",
-                  "action_id": "deployment_version-action",
-                  "placeholder": {
-                    "type": "plain_text",
-                    "text": "e.g., v1.4.2 (Optional)",
-                    "emoji": True
-                  }
-                },
-                "optional": True
-              },
-              {
-                "type": "input",
-                "block_id": "task_links",
-                "label": {
-                  "type": "plain_text",
-                  "text": "Key Changes & Tasks",
-                  "emoji": True
-                },
-                "element": {
-                  "type": "plain_text_input",
-                  "multiline": True,
-                  "action_id": "task_links-action",
-                  "placeholder": {
-                    "type": "plain_text",
-                    "text": "List task links separated by new lines",
-                    "emoji": True
-                  }
-                }
-              },
-              {
-                "type": "input",
-                "block_id": "additional_notes",
-                "label": {
-                  "type": "plain_text",
-                  "text": "Additional Notes",
-                  "emoji": True
-                },
-                "element": {
-                  "type": "plain_text_input",
-                  "multiline": True,
-                  "action_id": "additional_notes-action",
-                  "placeholder": {
-                    "type": "plain_text",
-                    "text": "Any additional comments or notes? (Optional)",
-                    "emoji": True
-                  }
-                },
-                "optional": True
-              }
-            ]
-        }
+        body["trigger_id"],
+        # "/notify-deploy bulk" opens the multi-project form
+        "deploy_bulk_modal" if body.get("text", "").strip().lower() == "bulk" else "deploy_modal",
+        # Only the private_metadata differs between requests
+        body["channel_id"]
     )
 
 @app.view("deploy_modal")
-def handle_submission(ack, view, say):
+@metrics.listener
+def handle_submission(ack, body, view):
     ack()
     
+    # Drop Slack retries and double-submits; claims are shared by all workers
+    if submissions.is_duplicate_submission(body, view):
+      return
+    
     channel_id = view["private_metadata"]
-    project_name_value = view["state"]["values"]["project_name"]["project_name-action"]
-    deployment_type_value = view["state"]["values"]["deployment_type"]["deployment_type-action"]["selected_option"]
-    deployment_version_value = view["state"]["values"]["deployment_version"]["deployment_version-action"]
-    task_links_value = view["state"]["values"]["task_links"]["task_links-action"]
-    project_name = project_name_value.get('value')
-    deployment_type = deployment_type_value.get('value')
-    deployment_version = deployment_version_value.get('value')
-    task_links = task_links_value.get('value')
+    deployment = DEPLOY_FORM.parse(view)
+    store.store_deployment(deployment["project_name"], deployment["deployment_type"], deployment["deployment_version"], channel_id, user_id=body["user"]["id"])
+    # Titles not resolved within TASK_RESOLVE_TIMEOUT are left out rather than holding up the post
+    deployment["task_links"] = task_links.render(deployment["task_links"])
     
-    say(
+    # Posted by the outbound workers so this handler returns right after ack()
+    outbound.post_message(
       channel=channel_id,
-      blocks=[
-        {
-        "type": "header",
-        "text": {
-          "type": "plain_text",
-          "text": ":rocket: Deployment Notification :rocket:",
-          "emoji": True
-        }
-      },
-      {
-        "type": "section",
-        "text": {
-          "type": "mrkdwn",
-          "text": f"• Project: *{project_name}*\n• Mode: *{deployment_type}*, Version: *{deployment_version}*"
-        }
-      },
-      {
-        "type": "divider"
-      },
-      {
-        "type": "section",
-        "text": {
-          "type": "mrkdwn",
-          "text": ":memo: *Key Changes & Tasks:*"
-        }
-      },
-      {
-        "type": "section",
-        "text": {
-          "type": "mrkdwn",
-          "text": f"{task_links}"
-        }
-      },
-      ],
+      blocks=deploy_message_blocks(deployment),
       text=f"<@here>"
     )
-    
+
+@app.view("deploy_bulk_modal")
+@metrics.listener
+def handle_bulk_submission(ack, body, view):
+    deployment = BULK_DEPLOY_FORM.parse(view)
+    try:
+        projects = parse_projects(deployment["projects"])
+    except ValueError as e:
+        # Keep the modal open and show the problem under the projects field
+        return ack(response_action="errors", errors={"projects": str(e)})
+    ack()
+
+    # Drop Slack retries and double-submits; claims are shared by all workers
+    if submissions.is_duplicate_submission(body, view):
+        return
+
+    channel_id = view["private_metadata"]
+    store.store_deployments(deployment["deployment_type"], projects, channel_id, user_id=body["user"]["id"])
+    deployment["task_links"] = task_links.render(deployment["task_links"])
+
+    # One message for the whole release, split only where it exceeds Slack's block limit;
+    # the parts are posted in order
+    outbound.post_messages([
+        {"channel": channel_id, "blocks": blocks, "text": f"<@here>"}
+        for blocks in chunk_blocks(bulk_deploy_message_blocks(deployment, projects))
+    ])
+
    
 # Opan the modal for the BA report
 @app.command("/report-ba")
+@metrics.listener
 def report_ba_modal(ack, body, client, say):
     # Acknowledge command request
     ack()
     
     channel_id = body["channel_id"]
     
-    channel_id, reminder_message_ts = get_reminder_ts(channel_id)
+    with watchdog.phase(body["trigger_id"], "reminder_lookup"):
+        channel_id, reminder_message_ts = get_reminder_ts(channel_id)
     if not reminder_message_ts:
       return say(channel=channel_id, text="No reminder message found.")
     
-    # Call views_open with the built-in client
-    client.views_open(
+    # Open the prebuilt modal with the built-in client
+    open_view(
+        client,
         # Pass a valid trigger_id within 3 seconds of receiving it
-        trigger_id=body["trigger_id"],
-        # View payload
-        view={
-            "type": "modal",
-            "private_metadata": f'{channel_id},{reminder_message_ts}',
-            "callback_id": "report_ba_modal",
-            "title": {"type": "plain_text", "text": "Deliverable Items Report"},
-            "submit": {"type": "plain_text", "text": "Generate"},
-            "blocks": [
-              {
-                "type": "section",
-                "text": {
-                  "type": "plain_text",
-                  "text": ":wave: Hi!\n\nPlease fill the form to generate the report.",
-                  "emoji": True
-                }
-              },
-              {
-                "type": "divider"
-              },
-              {
-                "type": "input",
-                "block_id": "team_name",
-                "label": {
-                  "type": "plain_text",
-                  "text": "Team Name",
-                  "emoji": True
-                },
-                "element": {
-                  "type": "static_select",
-                  "placeholder": {
-                    "type": "plain_text",
-                    "text": "Select name",
-                    "emoji": True
-                  },
-                  "action_id": "team_name-action",
-                  "options": [
-                    {
-                      "text": {
-                        "type": "plain_text",
-                        "text": "Core",
-                        "emoji": True
-                      },
-                      "value": "Core"
-                    },
-                    {
-                      "text": {
-                        "type": "plain_text",
-                        "text": "Titan",
-                        "emoji": True
-                      },
-                      "value": "Titan"
-                    },
-                    {
-                      "text": {
-                        "type": "plain_text",
-                        "text": "AIS",
-                        "emoji": True
-                      },
-                      "value": "AIS"
-                    },
-                    {
-                      "text": {
-                        "type": "plain_text",
-                        "text": "App",
-                        "emoji": True
-                      },
-                      "value": "App"
-                    },
-                    {
-                      "text": {
-                        "type": "plain_text",
-                        "text": "Badr",
-                        "emoji": True
-                      },
-                      "value": "Badr"
-                    },
-                    {
-                      "text": {
-                        "type": "plain_text",
-                        "text": "404",
-                        "emoji": True
-                      },
-                      "value": "404"
-                    }
-                  ]
-                }
-              },
-              {
-                "type": "input",
-                "block_id": "datepicker",
-                "element": {
-                  "type": "datepicker",
-                  "placeholder": {
-                    "type": "plain_text",
-                    "text": "Select a date",
-                    "emoji": True
-                  },
-                  "action_id": "datepicker-action"
-                },
-                "label": {
-                  "type": "plain_text",
-                  "text": "Date",
-                  "emoji": True
-                }
-              },
-              {
-                "type": "input",
-                "block_id": "deliverable_tickets",
-                "label": {
-                  "type": "plain_text",
-                  "text": "Deliverable Tickets",
-                  "emoji": True
-                },
-                "element": {
-                  "type": "number_input",
-                  "is_decimal_allowed": False,
-                  "action_id": "deliverable_tickets-action"
-                }
-              },
-              {
-                "type": "input",
-                "block_id": "definition_of_done",
-                "label": {
-                  "type": "plain_text",
-                  "text": "Definition of Done",
-                  "emoji": True
-                },
-                "element": {
-                  "type": "number_input",
-                  "is_decimal_allowed": False,
-                  "action_id": "definition_of_done-action"
-                }
-              },
-              {
-                "type": "input",
-                "block_id": "tested_tickets",
-                "label": {
-                  "type": "plain_text",
-                  "text": "Tested Tickets",
-                  "emoji": True
-                },
-                "element": {
-                  "type": "number_input",
-                  "is_decimal_allowed": False,
-                  "action_id": "tested_tickets-action"
-                }
-              },
-              {
-                "type": "input",
-                "block_id": "spent_time",
-                "element": {
-                  "type": "radio_buttons",
-                  "options": [
-                    {
-                      "text": {
-                        "type": "plain_text",
-                        "text": "Yes",
-                        "emoji": True
-                      },
-                      "value": "Yes"
-                    },
-                    {
-                      "text": {
-                        "type": "plain_text",
-                        "text": "No",
-                        "emoji": True
-                      },
-                      "value": "No"
-                    },
-                    {
-                      "text": {
-                        "type": "plain_text",
-                        "text": "N/A",
-                        "emoji": True
-                      },
-                      "value": "N/A"
-                    }
-                  ],
-                  "action_id": "spent_time-action"
-                },
-                "label": {
-                  "type": "plain_text",
-                  "text": "Update spent time sheet (all status)",
-                  "emoji": True
-                }
-              },
-              {
-                "type": "input",
-                "block_id": "project_status",
-                "element": {
-                  "type": "radio_buttons",
-                  "options": [
-                    {
-                      "text": {
-                        "type": "plain_text",
-                        "text": "Yes",
-                        "emoji": True
-                      },
-                      "value": "Yes"
-                    },
-                    {
-                      "text": {
-                        "type": "plain_text",
-                        "text": "No",
-                        "emoji": True
-                      },
-                      "value": "No"
-                    },
-                    {
-                      "text": {
-                        "type": "plain_text",
-                        "text": "N/A",
-                        "emoji": True
-                      },
-                      "value": "N/A"
-                    }
-                  ],
-                  "action_id": "project_status-action"
-                },
-                "label": {
-                  "type": "plain_text",
-                  "text": "Update project status sheet",
-                  "emoji": True
-                }
-              },
-              {
-                "type": "input",
-                "block_id": "sprint_plan",
-                "element": {
-                  "type": "radio_buttons",
-                  "options": [
-                    {
-                      "text": {
-                        "type": "plain_text",
-                        "text": "Yes",
-                        "emoji": True
-                      },
-                      "value": "Yes"
-                    },
-                    {
-                      "text": {
-                        "type": "plain_text",
-                        "text": "No",
-                        "emoji": True
-                      },
-                      "value": "No"
-                    },
-                    {
-                      "text": {
-                        "type": "plain_text",
-                        "text": "N/A",
-                        "emoji": True
-                      },
-                      "value": "N/A"
-                    }
-                  ],
-                  "action_id": "sprint_plan-action"
-                },
-                "label": {
-                  "type": "plain_text",
-                  "text": "Update sprint plan sheet",
-                  "emoji": True
-                }
-              },
-              {
-                "type": "input",
-                "block_id": "client_update",
-                "element": {
-                  "type": "radio_buttons",
-                  "options": [
-                    {
-                      "text": {
-                        "type": "plain_text",
-                        "text": "Yes",
-                        "emoji": True
-                      },
-                      "value": "Yes"
-                    },
-                    {
-                      "text": {
-                        "type": "plain_text",
-                        "text": "No",
-                        "emoji": True
-                      },
-                      "value": "No"
-                    },
-                    {
-                      "text": {
-                        "type": "plain_text",
-                        "text": "N/A",
-                        "emoji": True
-                      },
-                      "value": "N/A"
-                    }
-                  ],
-                  "action_id": "client_update-action"
-                },
-                "label": {
-                  "type": "plain_text",
-                  "text": "Did we update clients?",
-                  "emoji": True
-                },
-                "optional": True
-              },
-              {
-                "type": "input",
-                "block_id": "why_failed",
-                "label": {
-                  "type": "plain_text",
-                  "text": "Why failed to done?",
-                  "emoji": True
-                },
-                "element": {
-                  "type": "plain_text_input",
-                  "multiline": True,
-                  "action_id": "why_failed-action",
-                  "placeholder": {
-                    "type": "plain_text",
-                    "text": "Write in one sentence",
-                    "emoji": True
-                  }
-                },
-                "optional": True
-              },
-              {
-                "type": "input",
-                "block_id": "additional_notes",
-                "label": {
-                  "type": "plain_text",
-                  "text": "Additional Notes",
-                  "emoji": True
-                },
-                "element": {
-                  "type": "plain_text_input",
-                  "multiline": True,
-                  "action_id": "additional_notes-action",
-                  "placeholder": {
-                    "type": "plain_text",
-                    "text": "Any additional comments or notes?",
-                    "emoji": True
-                  }
-                },
-                "optional": True
-              }
-            ]
-        }
+        body["trigger_id"],
+        "report_ba_modal",
+        # Only the private_metadata differs between requests
+        f'{channel_id},{reminder_message_ts}'
     )
 
 @app.view("report_ba_modal")
-def handle_submission_ba_report(ack, view, say):
+@metrics.listener
+def handle_submission_ba_report(ack, body, view):
     # Acknowledge the view_submission event
     ack()
     
+    # Drop Slack retries and double-submits; claims are shared by all workers
+    if submissions.is_duplicate_submission(body, view):
+      return
+    
     # Extract channel_id and reminder_message_ts from private_metadata
     channel_id, reminder_message_ts = view["private_metadata"].split(',')
+    report = BA_FORM.parse(view)
+    reminder_message_ts = report_thread_ts(channel_id, report, reminder_message_ts)
     
-    team_name_value = view["state"]["values"]["team_name"]["team_name-action"]["selected_option"]
-    datepicker_value = view["state"]["values"]["datepicker"]["datepicker-action"]["selected_date"]
-    deliverable_tickets_value = view["state"]["values"]["deliverable_tickets"]["deliverable_tickets-action"]
-    definition_of_done_value = view["state"]["values"]["definition_of_done"]["definition_of_done-action"]
-    tested_tickets_value = view["state"]["values"]["tested_tickets"]["tested_tickets-action"]
-    spent_time_value = view["state"]["values"]["spent_time"]["spent_time-action"]["selected_option"]
-    project_status_value = view["state"]["values"]["project_status"]["project_status-action"]["selected_option"]
-    sprint_plan_value = view["state"]["values"]["sprint_plan"]["sprint_plan-action"]["selected_option"]
-    client_update_value = view["state"]["values"]["client_update"]["client_update-action"]["selected_option"]
-    why_failed_value = view["state"]["values"]["why_failed"]["why_failed-action"]
-    additional_notes_value = view["state"]["values"]["additional_notes"]["additional_notes-action"]
-    team_name = team_name_value.get('value')
-    date = datepicker_value
-    deliverable_tickets = deliverable_tickets_value.get('value')
-    definition_of_done = definition_of_done_value.get('value')
-    tested_tickets = tested_tickets_value.get('value')
-    spent_time = spent_time_value.get('value')
-    project_status = project_status_value.get('value')
-    sprint_plan = sprint_plan_value.get('value')
-    client_update = client_update_value.get('value')
-    why_failed = why_failed_value.get('value')
-    additional_notes = additional_notes_value.get('value')
+    store.store_report("ba", channel_id, reminder_message_ts, report["team_name"], report["date"].isoformat(), view["state"]["values"], user_id=body["user"]["id"])
+    aggregator.record("ba", report)
     
-    say(
+    outbound.post_message(
       channel=channel_id,
-      blocks=[
-        {
-          "type": "header",
-          "text": {
-            "type": "plain_text",
-            "text": ":clipboard: Deliverable Items Report :clipboard:",
-            "emoji": True
-          }
-        },
-        {
-          "type": "section",
-          "text": {
-            "type": "mrkdwn",
-            "text": f"• Team: *{team_name}*\n• Date: *{date}*"
-          }
-        },
-        {
-          "type": "divider"
-        },
-        {
-          "type": "section",
-          "text": {
-            "type": "mrkdwn",
-            "text": ":bar_chart: *Report Summary:*"
-          }
-        },
-        {
-          "type": "section",
-          "text": {
-            "type": "mrkdwn",
-            "text": f"• Deliverable Tickets: *{deliverable_tickets}*\n• Definition of Done: *{definition_of_done}*\n• Tested Tickets: *{tested_tickets}*"
-          }
-        },
-        {
-          "type": "divider"
-        },
-        {
-          "type": "section",
-          "text": {
-            "type": "mrkdwn",
-            "text": ":chart_with_upwards_trend: *Project Status:*"
-          }
-        },
-        {
-          "type": "section",
-          "text": {
-            "type": "mrkdwn",
-            "text": f"• Update spent time sheet: *{spent_time}*\n• Update project status sheet: *{project_status}*\n• Update sprint plan sheet: *{sprint_plan}*\n• Update clients: *{client_update}*"
-          }
-        },
-        {
-          "type": "divider"
-        },
-        {
-          "type": "section",
-          "text": {
-            "type": "mrkdwn",
-            "text": ":warning: *Why failed to done:*"
-          }
-        },
-        {
-          "type": "section",
-          "text": {
-            "type": "mrkdwn",
-            "text": f"{why_failed}"
-          }
-        },
-        {
-          "type": "divider"
-        },
-        {
-          "type": "section",
-          "text": {
-            "type": "mrkdwn",
-            "text": ":memo: *Additional Notes:*"
-          }
-        },
-        {
-          "type": "section",
-          "text": {
-            "type": "mrkdwn",
-            "text": f"{additional_notes}"
-          }
-        },
-      ],
+      blocks=ba_message_blocks(report),
       text=f"<@here>",
       thread_ts=reminder_message_ts
     )
     
 # Opan the modal for the QA report
 @app.command("/report-qa")
+@metrics.listener
 def report_qa_modal(ack, body, client, say):
     # Acknowledge command request
     ack()
     
     channel_id = body["channel_id"]
     
-    channel_id, reminder_message_ts = get_reminder_ts(channel_id)
+    with watchdog.phase(body["trigger_id"], "reminder_lookup"):
+        channel_id, reminder_message_ts = get_reminder_ts(channel_id)
     if not reminder_message_ts:
       return say(channel=channel_id, text="No reminder message found.")
     
-    # Call views_open with the built-in client
-    client.views_open(
+    # Open the prebuilt modal with the built-in client
+    open_view(
+        client,
         # Pass a valid trigger_id within 3 seconds of receiving it
-        trigger_id=body["trigger_id"],
-        # View payload
-        view={
-            "type": "modal",
-            "private_metadata": f'{channel_id},{reminder_message_ts}',
-            "callback_id": "report_qa_modal",
-            "title": {"type": "plain_text", "text": "Deliverable Items Report"},
-            "submit": {"type": "plain_text", "text": "Generate"},
-            "blocks": [
-              {
-                "type": "section",
-                "text": {
-                  "type": "plain_text",
-                  "text": ":wave: Hi!\n\nPlease fill the form to generate the report.",
-                  "emoji": True
-                }
-              },
-              {
-                "type": "divider"
-              },
-              {
-                "type": "input",
-                "block_id": "team_name",
-                "label": {
-                  "type": "plain_text",
-                  "text": "Team Name",
-                  "emoji": True
-                },
-                "element": {
-                  "type": "static_select",
-                  "placeholder": {
-                    "type": "plain_text",
-                    "text": "Select name",
-                    "emoji": True
-                  },
-                  "action_id": "team_name-action",
-                  "options": [
-                    {
-                      "text": {
-                        "type": "plain_text",
-                        "text": "Core",
-                        "emoji": True
-                      },
-                      "value": "Core"
-                    },
-                    {
-                      "text": {
-                        "type": "plain_text",
-                        "text": "Titan",
-                        "emoji": True
-                      },
-                      "value": "Titan"
-                    },
-                    {
-                      "text": {
-                        "type": "plain_text",
-                        "text": "AIS",
-                        "emoji": True
-                      },
-                      "value": "AIS"
-                    },
-                    {
-                      "text": {
-                        "type": "plain_text",
-                        "text": "App",
-                        "emoji": True
-                      },
-                      "value": "App"
-                    },
-                    {
-                      "text": {
-                        "type": "plain_text",
-                        "text": "Badr",
-                        "emoji": True
-                      },
-                      "value": "Badr"
-                    },
-                    {
-                      "text": {
-                        "type": "plain_text",
-                        "text": "404",
-                        "emoji": True
-                      },
-                      "value": "404"
-                    }
-                  ]
-                }
-              },
-              {
-                "type": "input",
-                "block_id": "datepicker",
-                "element": {
-                  "type": "datepicker",
-                  "placeholder": {
-                    "type": "plain_text",
-                    "text": "Select a date",
-                    "emoji": True
-                  },
-                  "action_id": "datepicker-action"
-                },
-                "label": {
-                  "type": "plain_text",
-                  "text": "Date",
-                  "emoji": True
-                }
-              },
-              {
-                "type": "input",
-                "block_id": "deliverable_tickets",
-                "label": {
-                  "type": "plain_text",
-                  "text": "Deliverable Tickets",
-                  "emoji": True
-                },
-                "element": {
-                  "type": "number_input",
-                  "is_decimal_allowed": False,
-                  "action_id": "deliverable_tickets-action"
-                }
-              },
-              {
-                "type": "input",
-                "block_id": "definition_of_done",
-                "label": {
-                  "type": "plain_text",
-                  "text": "Definition of Done",
-                  "emoji": True
-                },
-                "element": {
-                  "type": "number_input",
-                  "is_decimal_allowed": False,
-                  "action_id": "definition_of_done-action"
-                }
-              },
-              {
-                "type": "input",
-                "block_id": "tested_tickets",
-                "label": {
-                  "type": "plain_text",
-                  "text": "Tested Tickets",
-                  "emoji": True
-                },
-                "element": {
-                  "type": "number_input",
-                  "is_decimal_allowed": False,
-                  "action_id": "tested_tickets-action"
-                }
-              },
-              {
-                "type": "input",
-                "block_id": "defects",
-                "label": {
-                  "type": "plain_text",
-                  "text": "Defects",
-                  "emoji": True
-                },
-                "element": {
-                  "type": "number_input",
-                  "is_decimal_allowed": False,
-                  "action_id": "defects-action"
-                }
-              },
-              {
-                "type": "input",
-                "block_id": "spent_time",
-                "element": {
-                  "type": "radio_buttons",
-                  "options": [
-                    {
-                      "text": {
-                        "type": "plain_text",
-                        "text": "Yes",
-                        "emoji": True
-                      },
-                      "value": "Yes"
-                    },
-                    {
-                      "text": {
-                        "type": "plain_text",
-                        "text": "No",
-                        "emoji": True
-                      },
-                      "value": "No"
-                    },
-                    {
-                      "text": {
-                        "type": "plain_text",
-                        "text": "N/A",
-                        "emoji": True
-                      },
-                      "value": "N/A"
-                    }
-                  ],
-                  "action_id": "spent_time-action"
-                },
-                "label": {
-                  "type": "plain_text",
-                  "text": "Update Actual in Spent Time Sheet",
-                  "emoji": True
-                }
-              },
-              {
-                "type": "input",
-                "block_id": "problem",
-                "label": {
-                  "type": "plain_text",
-                  "text": "Problems of the team",
-                  "emoji": True
-                },
-                "element": {
-                  "type": "plain_text_input",
-                  "multiline": True,
-                  "action_id": "problem-action",
-                  "placeholder": {
-                    "type": "plain_text",
-                    "text": "Write in one sentence",
-                    "emoji": True
-                  }
-                },
-                "optional": True
-              },
-              {
-                "type": "input",
-                "block_id": "additional_notes",
-                "label": {
-                  "type": "plain_text",
-                  "text": "Additional Notes",
-                  "emoji": True
-                },
-                "element": {
-                  "type": "plain_text_input",
-                  "multiline": True,
-                  "action_id": "additional_notes-action",
-                  "placeholder": {
-                    "type": "plain_text",
-                    "text": "Any additional comments or notes?",
-                    "emoji": True
-                  }
-                },
-                "optional": True
-              }
-            ]
-        }
+        body["trigger_id"],
+        "report_qa_modal",
+        # Only the private_metadata differs between requests
+        f'{channel_id},{reminder_message_ts}'
     )
 
 @app.view("report_qa_modal")
-def handle_submission_qa_report(ack, view, say):
+@metrics.listener
+def handle_submission_qa_report(ack, body, view):
     # Acknowledge the view_submission event
     ack()
     
+    # Drop Slack retries and double-submits; claims are shared by all workers
+    if submissions.is_duplicate_submission(body, view):
+      return
+    
     # Extract channel_id and reminder_message_ts from private_metadata
     channel_id, reminder_message_ts = view["private_metadata"].split(',')
+    report = QA_FORM.parse(view)
+    reminder_message_ts = report_thread_ts(channel_id, report, reminder_message_ts)
     
-    team_name_value = view["state"]["values"]["team_name"]["team_name-action"]["selected_option"]
-    datepicker_value = view["state"]["values"]["datepicker"]["datepicker-action"]["selected_date"]
-    deliverable_tickets_value = view["state"]["values"]["deliverable_tickets"]["deliverable_tickets-action"]
-    definition_of_done_value = view["state"]["values"]["definition_of_done"]["definition_of_done-action"]
-    tested_tickets_value = view["state"]["values"]["tested_tickets"]["tested_tickets-action"]
-    defects_value = view["state"]["values"]["defects"]["defects-action"]
-    spent_time_value = view["state"]["values"]["spent_time"]["spent_time-action"]["selected_option"]
-    problem_value = view["state"]["values"]["problem"]["problem-action"]
-    additional_notes_value = view["state"]["values"]["additional_notes"]["additional_notes-action"]
-    team_name = team_name_value.get('value')
-    date = datepicker_value
-    deliverable_tickets = deliverable_tickets_value.get('value')
-    definition_of_done = definition_of_done_value.get('value')
-    tested_tickets = tested_tickets_value.get('value')
-    spent_time = spent_time_value.get('value')
-    defects = defects_value.get('value')
-    problem = problem_value.get('value')
-    additional_notes = additional_notes_value.get('value')
+    store.store_report("qa", channel_id, reminder_message_ts, report["team_name"], report["date"].isoformat(), view["state"]["values"], user_id=body["user"]["id"])
+    aggregator.record("qa", report)
     
-    say(
+    outbound.post_message(
       channel=channel_id,
-      blocks=[
-        {
-          "type": "header",
-          "text": {
-            "type": "plain_text",
-            "text": ":clipboard: Deliverable Items Report :clipboard:",
-            "emoji": True
-          }
-        },
-        {
-          "type": "section",
-          "text": {
-            "type": "mrkdwn",
-            "text": f"• Team: *{team_name}*\n• Date: *{date}*"
-          }
-        },
-        {
-          "type": "divider"
-        },
-        {
-          "type": "section",
-          "text": {
-            "type": "mrkdwn",
-            "text": ":bar_chart: *Report Summary:*"
-          }
-        },
-        {
-          "type": "section",
-          "text": {
-            "type": "mrkdwn",
-            "text": f"• Deliverable Tickets: *{deliverable_tickets}*\n• Definition of Done: *{definition_of_done}*\n• Tested Tickets: *{tested_tickets}*\n• Defects: *{defects}*"
-          }
-        },
-        {
-          "type": "divider"
-        },
-        {
-          "type": "section",
-          "text": {
-            "type": "mrkdwn",
-            "text": ":chart_with_upwards_trend: *Project Status:*"
-          }
-        },
-        {
-          "type": "section",
-          "text": {
-            "type": "mrkdwn",
-            "text": f"• Update Actual in Spent Time Sheet: *{spent_time}*"
-          }
-        },
-        {
-          "type": "divider"
-        },
-        {
-          "type": "section",
-          "text": {
-            "type": "mrkdwn",
-            "text": ":warning: *Problems of the team:*"
-          }
-        },
-        {
-          "type": "section",
-          "text": {
-            "type": "mrkdwn",
-            "text": f"{problem}"
-          }
-        },
-        {
-          "type": "divider"
-        },
-        {
-          "type": "section",
-          "text": {
-            "type": "mrkdwn",
-            "text": ":memo: *Additional Notes:*"
-          }
-        },
-        {
-          "type": "section",
-          "text": {
-            "type": "mrkdwn",
-            "text": f"{additional_notes}"
-          }
-        },
-      ],
+      blocks=qa_message_blocks(report),
       text=f"<@here>",
       thread_ts=reminder_message_ts
     )
 
+# Reply with the precomputed BA/QA rollups; "/report-summary qa" limits it to one report type
+@app.command("/report-summary")
+@metrics.listener
+def report_summary(ack, body):
+    report_types = [report_type for report_type in ("ba", "qa") if report_type in body.get("text", "").lower().split()] or ["ba", "qa"]
+    today = window_for_channel(body["channel_id"]).local_date(time.time())
+    ack(
+        text="Report summary",
+        blocks=summary_message_blocks([aggregator.summary(report_type, today) for report_type in report_types]),
+        response_type="ephemeral"
+    )
+
+# Search recorded deployments, e.g. "/deploy-history api production since:2024-05-01"
+@app.command("/deploy-history")
+@metrics.listener
+def deploy_history(ack, body):
+    window = window_for_channel(body["channel_id"])
+    try:
+        query = parse_history_query(body.get("text", ""), window)
+    except ValueError as e:
+        return ack(text=str(e), response_type="ephemeral")
+    ack(
+        text="Deployment history",
+        blocks=deploy_history_blocks(store.get_deployments(**query), window),
+        response_type="ephemeral"
+    )
+
 # Listens to incoming messages
 @app.event("message")
+@metrics.listener
 def handle_message_events(body, logger):
-  event = body.get("event", {})
-  text = event.get("text", "")
-  
-  if "reminder" in text.lower():
-      channel_id = event.get("channel")
-      message_ts = event.get("ts")
-      
-      # store_reminder_ts(channel_id, message_ts)
-      # logger.info(f"Stored reminder message ts: {message_ts}")
-      
-      # Convert timestamp to datetime in the Asia/Dhaka timezone
-      reminder_time = datetime.fromtimestamp(float(message_ts), tz=pytz.UTC)
-      reminder_time = reminder_time.astimezone(pytz.timezone('Asia/Dhaka'))
+  process_reminder_message(body.get("event", {}), store_reminder_ts, logger)
+
+# Serve listener, Web API and store latencies plus queue gauges when METRICS_ENABLED=true
+def serve_metrics(worker_index=0):
+    metrics.add_collector("slack_prefilter", message_prefilter.stats)
+    metrics.add_collector("slack_dedup", submissions.stats)
+    metrics.add_collector("slack_outbound", outbound.stats)
+    metrics.add_collector("slack_task_links", task_links.cache.stats)
+    metrics.add_collector("slack_rate_limit", limiter.gauges, label="method")
+    if transport is not None:
+        metrics.add_collector("slack_http", transport.stats)
+    metrics.add_collector("slack_ack_watchdog", watchdog.stats, label="stat")
+    metrics.serve_from_env(worker_index)
+
+# Start the nudge timer and schedule nudges for the reminders already stored
+def start_nudges():
+    if os.environ.get("NUDGES_ENABLED", "true") == "true":
+        scheduler.start()
+        nudges.schedule_stored()
+
+# Recover reminders missed while the app was down and schedule their nudges
+def recover_reminders():
+    for channel_id, message_ts in backfill_reminders(store).items():
+        nudges.reminder_stored(channel_id, message_ts)
 
-      if reminder_time.hour >= 20:  # 8 PM in 24-hour format
-          store_reminder_ts(channel_id, message_ts)
-          logger.info(f"Stored reminder message ts: {message_ts}")
-      else:
-          logger.info(f"Reminder received at {reminder_time.strftime('%Y-%m-%d %H:%M:%S %Z')}, not storing because it is not after 8 PM.")
+# Start your app; worker_index identifies the process when running several Socket Mode workers,
+# and `ready` is set once it is connected
+def start(worker_index=0, ready=None):
+    # BOLT_RUNTIME=async runs the asyncio handlers in async_app.py instead
+    if os.environ.get("BOLT_RUNTIME") == "async":
+        import asyncio
+        from async_app import main
+        asyncio.run(main(backfill=worker_index == 0, worker_index=worker_index, ready=ready))
+    else:
+        serve_metrics(worker_index)
+        start_nudges()
+        # Recover reminders missed while the app was down, alongside the connection
+        if worker_index == 0 and os.environ.get("REMINDER_BACKFILL", "true") == "true":
+            threading.Thread(target=recover_reminders, name="reminder-backfill", daemon=True).start()
+        # Serves until SIGTERM, then drains in-flight work (see lifecycle.py)
+        lifecycle.serve(SocketModeHandler(app, os.environ.get("SLACK_APP_TOKEN")), ready)
 
-# Start your app
 if __name__ == "__main__":
-    SocketModeHandler(app, os.environ.get("SLACK_APP_TOKEN")).start()
\ No newline at end of file
+    # SOCKET_MODE_WORKERS > 1 opens that many connections, one per process.
+    # ROLLING_RELOAD=true runs even a single worker under the master, so SIGHUP reloads it
+    # without downtime; the master gives workers SHUTDOWN_TIMEOUT plus a margin to drain.
+    workers = worker_count()
+    if workers > 1 or os.environ.get("ROLLING_RELOAD") == "true":
+        run_workers(workers, start, stop_timeout=lifecycle.timeout + 10)
+    else:
+        start()
@@ -0,0 +1,323 @@
+import os
+import time
+import asyncio
+import functools
+import logging
+import aiohttp
+from slack_bolt.async_app import AsyncApp
+from slack_bolt.adapter.socket_mode.async_handler import AsyncSocketModeHandler
+from storage import open_store
+from views import DEPLOY_FORM, BULK_DEPLOY_FORM, BA_FORM, QA_FORM, open_view
+from reports import deploy_message_blocks, bulk_deploy_message_blocks, chunk_blocks, ba_message_blocks, qa_message_blocks, summary_message_blocks, deploy_history_blocks
+from bulk_deploy import parse_projects
+from deploy_history import parse_history_query
+from reminders import process_reminder_message
+from reminder_window import window_for_channel
+from aggregates import ReportAggregator
+from prefilter import MessagePrefilter
+from backfill import backfill_reminders
+from scheduler import Scheduler
+from nudges import NudgeTracker
+from outbound import OutboundQueue
+from task_links import TaskLinkProcessor
+from dedup import DedupCache
+from http_transport import transport
+from rate_limit import RateLimitedWebClient, AsyncRateLimitedWebClient, limiter
+from metrics import metrics
+from ack_watchdog import watchdog
+from lifecycle import lifecycle
+
+# Set up basic logging if the application is running in development
+if os.environ.get("ENV") == "development":
+    logging.basicConfig(level=logging.DEBUG)
+elif os.environ.get("ENV") == "production":
+    logging.basicConfig(level=logging.INFO)
+
+# Reminders and submitted reports live in the backend selected by STORAGE_BACKEND
+store = open_store()
+
+# One AsyncWebClient is shared by every handler; its aiohttp session is attached in main().
+# Every Web API call goes through the process-wide, tier-aware rate limiter.
+# SLACK_API_URL points the app at another Web API, e.g. the fake one used by the load test.
+client = AsyncRateLimitedWebClient(
+    token=os.environ.get("SLACK_BOT_TOKEN"),
+    base_url=os.environ.get("SLACK_API_URL", AsyncRateLimitedWebClient.BASE_URL)
+)
+
+# Initializes the asyncio variant of the app
+app = AsyncApp(client=client)
+
+# Time slash commands from receipt to ack and views.open; installed first so it sees everything
+if os.environ.get("ACK_WATCHDOG", "true") == "true":
+    lifecycle.on_receive(watchdog.envelope_received)
+    app.use(watchdog.async_middleware)
+
+# Drop message events that cannot be reminders before listener dispatch
+message_prefilter = MessagePrefilter.from_env()
+app.use(message_prefilter.async_middleware)
+
+# Hand listeners the rate-limited client instead of Bolt's per-request one
+app.use(client.async_middleware)
+
+# Bounded TTL cache of handled view submissions, backed by store claims
+submissions = DedupCache.from_env(store)
+
+# Per-team day and week rollups of the BA/QA numbers, updated on every submission
+aggregator = ReportAggregator(store)
+
+# Report posts are handed to a bounded worker pool with retries and a dead-letter file
+outbound = OutboundQueue.from_env(RateLimitedWebClient(
+    token=os.environ.get("SLACK_BOT_TOKEN"),
+    base_url=os.environ.get("SLACK_API_URL", RateLimitedWebClient.BASE_URL)
+)).start()
+
+# Ticket keys and URLs in "Key Changes & Tasks", rendered as a deduplicated list with cached titles
+task_links = TaskLinkProcessor.from_env()
+
+# Nudges teams that have not reported NUDGE_DELAY_SECONDS after their channel's reminder
+scheduler = Scheduler(name="nudge-scheduler")
+nudges = NudgeTracker.from_env(store, outbound, scheduler)
+
+# On SIGTERM, once listener tasks have finished: stop nudging, post what is still queued and
+# flush reminder state
+lifecycle.on_shutdown("nudges", lambda timeout: scheduler.stop())
+lifecycle.on_shutdown("outbound", outbound.close)
+lifecycle.on_shutdown("store", lambda timeout: store.close())
+
+# Run a blocking call off the event loop. Store calls go through here: a SQLite write can
+# wait up to busy_timeout on another worker's transaction, and would stall every ack meanwhile.
+async def run_blocking(function, *args, **kwargs):
+    return await asyncio.get_running_loop().run_in_executor(None, functools.partial(function, *args, **kwargs))
+
+@app.command("/notify-deploy")
+@metrics.listener
+async def open_modal(ack, body, client):
+    # Acknowledge command request
+    await ack()
+
+    # "/notify-deploy bulk" opens the multi-project form
+    callback_id = "deploy_bulk_modal" if body.get("text", "").strip().lower() == "bulk" else "deploy_modal"
+
+    # Pass a valid trigger_id within 3 seconds of receiving it
+    await open_view(client, body["trigger_id"], callback_id, body["channel_id"])
+
+@app.view("deploy_modal")
+@metrics.listener
+async def handle_submission(ack, body, view):
+    await ack()
+
+    # Drop Slack retries and double-submits; claims are shared by all workers
+    if await run_blocking(submissions.is_duplicate_submission, body, view):
+        return
+
+    channel_id = view["private_metadata"]
+    deployment = DEPLOY_FORM.parse(view)
+    await run_blocking(store.store_deployment, deployment["project_name"], deployment["deployment_type"], deployment["deployment_version"], channel_id, user_id=body["user"]["id"])
+    # Titles not resolved within TASK_RESOLVE_TIMEOUT are left out rather than holding up the post
+    deployment["task_links"] = await run_blocking(task_links.render, deployment["task_links"])
+
+    # Posted by the outbound workers, off the event loop, with retries
+    outbound.post_message(
+        channel=channel_id,
+        blocks=deploy_message_blocks(deployment),
+        text=f"<@here>"
+    )
+
+@app.view("deploy_bulk_modal")
+@metrics.listener
+async def handle_bulk_submission(ack, body, view):
+    deployment = BULK_DEPLOY_FORM.parse(view)
+    try:
+        projects = parse_projects(deployment["projects"])
+    except ValueError as e:
+        # Keep the modal open and show the problem under the projects field
+        return await ack(response_action="errors", errors={"projects": str(e)})
+    await ack()
+
+    # Drop Slack retries and double-submits; claims are shared by all workers
+    if await run_blocking(submissions.is_duplicate_submission, body, view):
+        return
+
+    channel_id = view["private_metadata"]
+    await run_blocking(store.store_deployments, deployment["deployment_type"], projects, channel_id, user_id=body["user"]["id"])
+    deployment["task_links"] = await run_blocking(task_links.render, deployment["task_links"])
+
+    # One message for the whole release, split only where it exceeds Slack's block limit;
+    # the parts are posted in order
+    outbound.post_messages([
+        {"channel": channel_id, "blocks": blocks, "text": f"<@here>"}
+        for blocks in chunk_blocks(bulk_deploy_message_blocks(deployment, projects))
+    ])
+
+# Open the modal for the BA report
+@app.command("/report-ba")
+@metrics.listener
+async def report_ba_modal(ack, body, client, say):
+    # Acknowledge command request
+    await ack()
+
+    with watchdog.phase(body["trigger_id"], "reminder_lookup"):
+        channel_id, reminder_message_ts = await run_blocking(store.get_reminder, body["channel_id"])
+    if not reminder_message_ts:
+        return await say(channel=body["channel_id"], text="No reminder message found.")
+
+    # Pass a valid trigger_id within 3 seconds of receiving it
+    await open_view(client, body["trigger_id"], "report_ba_modal", f'{channel_id},{reminder_message_ts}')
+
+@app.view("report_ba_modal")
+@metrics.listener
+async def handle_submission_ba_report(ack, body, view):
+    # Acknowledge the view_submission event
+    await ack()
+
+    # Drop Slack retries and double-submits; claims are shared by all workers
+    if await run_blocking(submissions.is_duplicate_submission, body, view):
+        return
+
+    # Extract channel_id and reminder_message_ts from private_metadata
+    channel_id, reminder_message_ts = view["private_metadata"].split(',')
+    report = BA_FORM.parse(view)
+    reminder_message_ts = await run_blocking(report_thread_ts, channel_id, report, reminder_message_ts)
+
+    await run_blocking(store_report, "ba", channel_id, reminder_message_ts, report, view["state"]["values"], body["user"]["id"])
+
+    outbound.post_message(
+        channel=channel_id,
+        blocks=ba_message_blocks(report),
+        text=f"<@here>",
+        thread_ts=reminder_message_ts
+    )
+
+# Open the modal for the QA report
+@app.command("/report-qa")
+@metrics.listener
+async def report_qa_modal(ack, body, client, say):
+    # Acknowledge command request
+    await ack()
+
+    with watchdog.phase(body["trigger_id"], "reminder_lookup"):
+        channel_id, reminder_message_ts = await run_blocking(store.get_reminder, body["channel_id"])
+    if not reminder_message_ts:
+        return await say(channel=body["channel_id"], text="No reminder message found.")
+
+    # Pass a valid trigger_id within 3 seconds of receiving it
+    await open_view(client, body["trigger_id"], "report_qa_modal", f'{channel_id},{reminder_message_ts}')
+
+@app.view("report_qa_modal")
+@metrics.listener
+async def handle_submission_qa_report(ack, body, view):
+    # Acknowledge the view_submission event
+    await ack()
+
+    # Drop Slack retries and double-submits; claims are shared by all workers
+    if await run_blocking(submissions.is_duplicate_submission, body, view):
+        return
+
+    # Extract channel_id and reminder_message_ts from private_metadata
+    channel_id, reminder_message_ts = view["private_metadata"].split(',')
+    report = QA_FORM.parse(view)
+    reminder_message_ts = await run_blocking(report_thread_ts, channel_id, report, reminder_message_ts)
+
+    await run_blocking(store_report, "qa", channel_id, reminder_message_ts, report, view["state"]["values"], body["user"]["id"])
+
+    outbound.post_message(
+        channel=channel_id,
+        blocks=qa_message_blocks(report),
+        text=f"<@here>",
+        thread_ts=reminder_message_ts
+    )
+
+# Reply with the precomputed BA/QA rollups; "/report-summary qa" limits it to one report type
+@app.command("/report-summary")
+@metrics.listener
+async def report_summary(ack, body):
+    report_types = [report_type for report_type in ("ba", "qa") if report_type in body.get("text", "").lower().split()] or ["ba", "qa"]
+    today = window_for_channel(body["channel_id"]).local_date(time.time())
+    summaries = await run_blocking(lambda: [aggregator.summary(report_type, today) for report_type in report_types])
+    await ack(
+        text="Report summary",
+        blocks=summary_message_blocks(summaries),
+        response_type="ephemeral"
+    )
+
+# Thread a report under the reminder of its selected date; dates without one (or older than
+# REMINDER_HISTORY_DAYS) fall back to the reminder the modal was opened for
+def report_thread_ts(channel_id, report, reminder_message_ts):
+    return store.get_reminder_for_date(channel_id, report["date"].isoformat()) or reminder_message_ts
+
+# Store a submitted report and update its team's rollups
+def store_report(report_type, channel_id, reminder_message_ts, report, values, user_id):
+    store.store_report(report_type, channel_id, reminder_message_ts, report["team_name"], report["date"].isoformat(), values, user_id=user_id)
+    aggregator.record(report_type, report)
+
+# Store the channel's reminder and schedule its nudge
+def store_reminder_ts(channel_id, message_ts):
+    store.store_reminder(channel_id, message_ts)
+    nudges.reminder_stored(channel_id, message_ts)
+
+# Search recorded deployments, e.g. "/deploy-history api production since:2024-05-01"
+@app.command("/deploy-history")
+@metrics.listener
+async def deploy_history(ack, body):
+    window = window_for_channel(body["channel_id"])
+    try:
+        query = parse_history_query(body.get("text", ""), window)
+    except ValueError as e:
+        return await ack(text=str(e), response_type="ephemeral")
+    deployments = await run_blocking(store.get_deployments, **query)
+    await ack(
+        text="Deployment history",
+        blocks=deploy_history_blocks(deployments, window),
+        response_type="ephemeral"
+    )
+
+# Listens to incoming messages
+@app.event("message")
+@metrics.listener
+async def handle_message_events(body, logger):
+    await run_blocking(process_reminder_message, body.get("event", {}), store_reminder_ts, logger)
+
+# Serve listener, Web API and store latencies plus queue gauges when METRICS_ENABLED=true
+def serve_metrics(worker_index=0):
+    metrics.add_collector("slack_prefilter", message_prefilter.stats)
+    metrics.add_collector("slack_dedup", submissions.stats)
+    metrics.add_collector("slack_outbound", outbound.stats)
+    metrics.add_collector("slack_task_links", task_links.cache.stats)
+    metrics.add_collector("slack_rate_limit", limiter.gauges, label="method")
+    if transport is not None:
+        metrics.add_collector("slack_http", transport.stats)
+    metrics.add_collector("slack_ack_watchdog", watchdog.stats, label="stat")
+    metrics.serve_from_env(worker_index)
+
+# Start the nudge timer and schedule nudges for the reminders already stored
+def start_nudges():
+    if os.environ.get("NUDGES_ENABLED", "true") == "true":
+        scheduler.start()
+        nudges.schedule_stored()
+
+# Recover reminders missed while the app was down and schedule their nudges
+def recover_reminders():
+    for channel_id, message_ts in backfill_reminders(store).items():
+        nudges.reminder_stored(channel_id, message_ts)
+
+# Run the app over Socket Mode with a pooled, keep-alive aiohttp session until SIGTERM;
+# `ready` is set once connected
+async def main(backfill=True, worker_index=0, ready=None):
+    serve_metrics(worker_index)
+    start_nudges()
+    connector = aiohttp.TCPConnector(
+        limit=int(os.environ.get("SLACK_HTTP_POOL_SIZE", "100")),
+        # Keep idle connections as long as the sync pool does (aiohttp drops them after 15s)
+        keepalive_timeout=float(os.environ.get("SLACK_HTTP_KEEPALIVE", "60")),
+        ttl_dns_cache=300
+    )
+    async with aiohttp.ClientSession(connector=connector) as session:
+        client.session = session
+        # Recover reminders missed while the app was down, alongside the connection
+        if backfill and os.environ.get("REMINDER_BACKFILL", "true") == "true":
+            asyncio.get_running_loop().run_in_executor(None, recover_reminders)
+        handler = AsyncSocketModeHandler(app, os.environ.get("SLACK_APP_TOKEN"))
+        await lifecycle.serve_async(handler, ready)
+
+if __name__ == "__main__":
+    asyncio.run(main())
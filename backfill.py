@@ -0,0 +1,95 @@
+import os
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from slack_sdk import WebClient
+from rate_limit import RateLimitedWebClient
+from slack_sdk.errors import SlackApiError
+from slack_sdk.http_retry.builtin_handlers import RateLimitErrorRetryHandler
+from prefilter import MessagePrefilter
+from reminder_window import window_for_channel
+
+logger = logging.getLogger(__name__)
+
+
+# Client used for the scan. It is not paced by the shared limiter, whose Tier 3 burst would
+# stretch a cold start over minutes: the scan runs at full speed and backs off only when
+# Slack answers 429, retrying after the Retry-After it sends back.
+def backfill_client(token=None, base_url=None):
+    client = RateLimitedWebClient(token=token or os.environ.get("SLACK_BOT_TOKEN"), base_url=base_url or os.environ.get("SLACK_API_URL", WebClient.BASE_URL), limiter=None)
+    client.retry_handlers.append(RateLimitErrorRetryHandler(max_retry_count=5))
+    return client
+
+
+# Channels to scan: REMINDER_CHANNELS if configured, otherwise every channel the bot is in
+def reminder_channels(client, prefilter):
+    if prefilter.channels:
+        return sorted(prefilter.channels)
+
+    channels = []
+    cursor = None
+    while True:
+        response = client.users_conversations(types="public_channel,private_channel", exclude_archived=True, limit=1000, cursor=cursor)
+        channels.extend(channel["id"] for channel in response["channels"])
+        cursor = response.get("response_metadata", {}).get("next_cursor")
+        if not cursor:
+            return channels
+
+
+# Latest message in a channel's recent history that handle_message_events would have stored.
+# History comes back newest first, so the scan stops at the first qualifying page.
+def find_latest_reminder(client, channel_id, oldest, prefilter, page_size=200):
+    window = window_for_channel(channel_id)
+    cursor = None
+    while True:
+        response = client.conversations_history(channel=channel_id, oldest=oldest, limit=page_size, cursor=cursor)
+        candidates = [
+            message for message in response["messages"]
+            if prefilter.drop_reason(dict(message, channel=channel_id)) is None
+            and "reminder" in message.get("text", "").lower()
+        ]
+        for message, after_cutoff in zip(candidates, window.classify(message["ts"] for message in candidates)):
+            if after_cutoff:
+                return message["ts"]
+
+        cursor = response.get("response_metadata", {}).get("next_cursor")
+        if not response.get("has_more") or not cursor:
+            return None
+
+
+# Rebuild the reminder index from channel history, scanning channels in parallel.
+# A reminder already in the store is only replaced by a newer one from history.
+# Returns {channel_id: message_ts} for the reminders that were restored.
+def backfill_reminders(store, client=None, prefilter=None, lookback_days=None, concurrency=None):
+    client = client or backfill_client()
+    prefilter = prefilter or MessagePrefilter.from_env()
+    lookback_days = lookback_days if lookback_days is not None else float(os.environ.get("BACKFILL_LOOKBACK_DAYS", "2"))
+    concurrency = concurrency or int(os.environ.get("BACKFILL_CONCURRENCY", "8"))
+    oldest = str(time.time() - lookback_days * 86400)
+
+    started = time.monotonic()
+    try:
+        channels = reminder_channels(client, prefilter)
+    except SlackApiError as e:
+        logger.warning(f"Reminder backfill could not list channels: {e.response.get('error')}")
+        return {}
+
+    def scan(channel_id):
+        try:
+            return channel_id, find_latest_reminder(client, channel_id, oldest, prefilter)
+        except SlackApiError as e:
+            logger.warning(f"Reminder backfill failed for {channel_id}: {e.response.get('error')}")
+            return channel_id, None
+
+    restored = {}
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="reminder-backfill") as executor:
+        for channel_id, message_ts in executor.map(scan, channels):
+            if message_ts is None:
+                continue
+            _, stored_ts = store.get_reminder(channel_id)
+            if stored_ts is None or float(message_ts) > float(stored_ts):
+                store.store_reminder(channel_id, message_ts)
+                restored[channel_id] = message_ts
+
+    logger.info(f"Reminder backfill restored {len(restored)} of {len(channels)} channels in {time.monotonic() - started:.2f}s")
+    return restored
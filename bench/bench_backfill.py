@@ -0,0 +1,54 @@
+# Cold-start reminder backfill against the fake Slack API.
+#
+#   python bench/bench_backfill.py [channels] [latency_seconds]
+#
+# Checks that every channel's restored reminder matches what handle_message_events
+# would have stored, and reports how long the scan took.
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_slack import FakeSlack, populate
+from backfill import backfill_client, backfill_reminders
+from prefilter import MessagePrefilter
+from reminder_window import window_for_channel
+from storage import SQLiteStore
+
+
+def expected_reminders(fake, oldest):
+    expected = {}
+    for channel_id, messages in fake.channels.items():
+        window = window_for_channel(channel_id)
+        for message in messages:
+            if float(message["ts"]) >= oldest and "reminder" in message["text"].lower() and window.is_after_cutoff(message["ts"]):
+                expected[channel_id] = message["ts"]
+                break
+    return expected
+
+
+def main():
+    channels = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.02
+
+    fake = populate(FakeSlack(latency=latency, rate_limit_every=40), channels=channels).start()
+    with tempfile.TemporaryDirectory() as directory:
+        store = SQLiteStore(os.path.join(directory, "backfill.db"))
+        oldest = time.time() - 2 * 86400
+
+        started = time.monotonic()
+        restored = backfill_reminders(store, client=backfill_client(token="xoxb-fake", base_url=fake.url), prefilter=MessagePrefilter(), lookback_days=2)
+        elapsed = time.monotonic() - started
+
+        expected = expected_reminders(fake, oldest)
+        assert restored == expected, "restored reminders differ from the live handler's rules"
+        print(f"channels={channels} latency={latency * 1000:.0f}ms api_calls={len(fake.calls)} "
+              f"rate_limited={len(fake.calls) // 40} restored={len(restored)} elapsed={elapsed:.2f}s")
+        store.close()
+    fake.stop()
+
+
+if __name__ == "__main__":
+    main()
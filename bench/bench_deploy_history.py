@@ -0,0 +1,75 @@
+# Deployment history queries over a large table.
+#
+#   python bench/bench_deploy_history.py [records]
+#
+# Fills a throwaway SQLite store with synthetic deployments, then times the queries
+# /deploy-history runs and prints SQLite's plan for each, to confirm they use an index.
+import os
+import sys
+import time
+import random
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage import SQLiteStore
+from views import DEPLOYMENT_TYPES
+
+QUERIES = {
+    "project, latest production": {"project_prefix": "payments-api", "deployment_type": "Production", "limit": 1},
+    "short prefix": {"project_prefix": "pay", "limit": 10},
+    "prefix + 30 day range": {"project_prefix": "payments", "since": time.time() - 30 * 86400, "until": time.time()},
+    "7 day range": {"since": time.time() - 7 * 86400, "limit": 50},
+    "type only": {"deployment_type": "Staging", "limit": 20}
+}
+
+
+def populate(store, records, seed=0):
+    rng = random.Random(seed)
+    words = ["payments", "billing", "auth", "search", "mobile", "admin", "reports", "gateway", "media", "notify"]
+    projects = [f"{first}-{second}" for first in words for second in ("api", "web", "worker", "ios", "android")]
+    now = time.time()
+    conn = store._connection()
+    with conn:
+        conn.execute("BEGIN")
+        for _ in range(records):
+            project = rng.choice(projects)
+            conn.execute(
+                "INSERT INTO deployments (project, project_key, deployment_type, version, channel_id, user_id, deployed_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (project, project.lower(), rng.choice(DEPLOYMENT_TYPES), f"v1.{rng.randrange(100)}.{rng.randrange(10)}", "C0DEPLOYS", "U0BENCH", now - rng.uniform(0, 730 * 86400))
+            )
+
+
+def main():
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    with tempfile.TemporaryDirectory() as directory:
+        store = SQLiteStore(os.path.join(directory, "deployments.db"))
+        started = time.perf_counter()
+        populate(store, records)
+        print(f"Inserted {records} deployments in {time.perf_counter() - started:.2f}s")
+
+        for name, query in QUERIES.items():
+            store.get_deployments(**query)
+            runs = 200
+            started = time.perf_counter()
+            for _ in range(runs):
+                rows = store.get_deployments(**query)
+            elapsed = (time.perf_counter() - started) / runs * 1000
+            print(f"{name:<28} {elapsed:8.3f} ms  {len(rows):3d} rows")
+
+        # Same SQL as get_deployments builds for a prefix + type query
+        plan = store._connection().execute(
+            "EXPLAIN QUERY PLAN SELECT project FROM deployments WHERE project_key >= ? AND project_key < ? AND deployment_type = ? ORDER BY deployed_at DESC LIMIT 1",
+            ("payments-api", "payments-apj", "Production")
+        ).fetchall()
+        print("plan (prefix + type):", "; ".join(row[-1] for row in plan))
+        plan = store._connection().execute(
+            "EXPLAIN QUERY PLAN SELECT project FROM deployments WHERE deployed_at >= ? ORDER BY deployed_at DESC LIMIT 50",
+            (time.time() - 7 * 86400,)
+        ).fetchall()
+        print("plan (range):", "; ".join(row[-1] for row in plan))
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# Per-call latency of the SDK's urllib transport vs. the keep-alive pool, over TLS.
+#
+#   python bench/bench_http_pool.py [calls] [threads]
+#
+# Serves the fake Slack API over HTTPS with a throwaway self-signed certificate (made with the
+# openssl CLI) and times chat.postMessage through a plain WebClient, which opens a new TCP and
+# TLS connection per call, and through PooledWebClient. Both run sequentially and from
+# `threads` threads at once, like Bolt's listener pool and the outbound workers.
+import os
+import sys
+import ssl
+import time
+import tempfile
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from slack_sdk import WebClient
+from fake_slack import FakeSlack
+from http_transport import PooledWebClient, PooledTransport, ConnectionPool
+
+
+def self_signed_certificate(directory):
+    path = os.path.join(directory, "fake_slack.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1", "-subj", "/CN=127.0.0.1",
+         "-addext", "subjectAltName=IP:127.0.0.1", "-keyout", path, "-out", path],
+        check=True, capture_output=True
+    )
+    return path
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def timed_calls(client, calls, threads):
+    def call(index):
+        started = time.perf_counter()
+        client.chat_postMessage(channel="C0BENCH", text=f"message {index}")
+        return (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    if threads == 1:
+        latencies = [call(index) for index in range(calls)]
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            latencies = list(executor.map(call, range(calls)))
+    return latencies, time.perf_counter() - started
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    with tempfile.TemporaryDirectory() as directory:
+        certfile = self_signed_certificate(directory)
+        fake = FakeSlack(certfile=certfile).start()
+        context = ssl.create_default_context(cafile=certfile)
+        pool = ConnectionPool(maxsize=threads)
+        clients = {
+            "urllib": WebClient(token="xoxb-bench", base_url=fake.url, ssl=context),
+            "pooled": PooledWebClient(token="xoxb-bench", base_url=fake.url, ssl=context, transport=PooledTransport(pool))
+        }
+        for name, client in clients.items():
+            client.chat_postMessage(channel="C0BENCH", text="warm up")
+            for concurrency in (1, threads):
+                latencies, elapsed = timed_calls(client, calls, concurrency)
+                print(
+                    f"{name:<7} threads={concurrency:<3} p50 {percentile(latencies, 0.5):6.2f} ms  p99 {percentile(latencies, 0.99):6.2f} ms"
+                    f"  {calls / elapsed:7.0f} calls/s"
+                )
+        print("pool:", pool.stats())
+        fake.stop()
+
+
+if __name__ == "__main__":
+    main()
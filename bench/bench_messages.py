@@ -0,0 +1,44 @@
+# Rendering the posted report messages from the templates in reports.py.
+#
+#   python bench/bench_messages.py [iterations]
+#
+# Prints the time per render and the bytes each rendered message keeps alive
+# (the static header, divider and title blocks are shared, so they cost nothing per message).
+import os
+import sys
+import timeit
+import tracemalloc
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from records import BAReport, QAReport, DeployNotice
+from reports import ba_message_blocks, qa_message_blocks, deploy_message_blocks
+
+SAMPLES = {
+    "deploy": (deploy_message_blocks, DeployNotice("payments-api", "Production", "v1.4.2", "• <https://tracker.example.com/browse/PAY-1|PAY-1>", None)),
+    "ba": (ba_message_blocks, BAReport("Core", date(2026, 1, 5), 12, 9, 10, "Yes", "Yes", "No", None, "Waiting on <vendor> & QA", None)),
+    "qa": (qa_message_blocks, QAReport("Titan", date(2026, 1, 5), 8, 8, 8, 1, "Yes", None, "All good"))
+}
+
+
+def retained_bytes(render, values, count=10000):
+    render(values)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [render(values) for _ in range(count)]
+    retained = (tracemalloc.get_traced_memory()[0] - before) / count
+    tracemalloc.stop()
+    del kept
+    return retained
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    for name, (render, values) in SAMPLES.items():
+        elapsed = min(timeit.repeat(lambda: render(values), number=iterations, repeat=5)) / iterations * 1e6
+        print(f"{name:<8} {elapsed:7.2f} us/render  {retained_bytes(render, values):8.0f} bytes/message  {len(render(values))} blocks")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# Memory and parse time of report records vs. plain dicts.
+#
+#   python bench/bench_records.py [records]
+#
+# Parses synthetic BA/QA/deploy submissions and reminders, keeps them all alive, and
+# reports the bytes held per 100k records for the dict form and the __slots__ records,
+# plus the time to parse one submission.
+import os
+import sys
+import timeit
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from forms import Form
+from records import ReminderRef
+from views import BA_FORM, QA_FORM, DEPLOY_FORM, TEAM_NAMES
+
+VALUES = {
+    "static_select": lambda i: {"selected_option": {"value": TEAM_NAMES[i % len(TEAM_NAMES)]}},
+    "radio_buttons": lambda i: {"selected_option": {"value": ("Yes", "No", "N/A")[i % 3]}},
+    "datepicker": lambda i: {"selected_date": (date(2026, 1, 1) + timedelta(days=i % 365)).isoformat()},
+    "number_input": lambda i: {"value": str(i % 40)},
+    "plain_text_input": lambda i: {"value": f"note {i}"}
+}
+
+
+# A view_submission view for `form` with every field filled in
+def submission(form, i):
+    return {"state": {"values": {
+        field.block_id: {field.action_id: dict(VALUES[field.element["type"]](i), type=field.element["type"])}
+        for field in form.fields
+    }}}
+
+
+# Same fields, parsed into a dict as before the records were introduced
+def as_dict_form(form):
+    return Form(form.callback_id, form.title, form.submit, form.intro, form.fields)
+
+
+def held_bytes(build, count):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [build(i) for i in range(count)]
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del kept
+    return held
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    per = 100000 / count
+    print(f"{'kind':<12} {'dict MB':>9} {'record MB':>10}   per 100k records")
+    for name, form in (("BAReport", BA_FORM), ("QAReport", QA_FORM), ("DeployNotice", DEPLOY_FORM)):
+        views = [submission(form, i) for i in range(count)]
+        dict_form = as_dict_form(form)
+        rows = [
+            held_bytes(lambda i: dict_form.parse(views[i]), count),
+            held_bytes(lambda i: form.parse(views[i]), count)
+        ]
+        print(f"{name:<12} " + " ".join(f"{row * per / 1e6:>10.2f}" for row in rows))
+        parse_dict = min(timeit.repeat(lambda: dict_form.parse(views[0]), number=20000, repeat=3)) / 20000 * 1e6
+        parse_record = min(timeit.repeat(lambda: form.parse(views[0]), number=20000, repeat=3)) / 20000 * 1e6
+        print(f"{'':<12} parse: dict {parse_dict:.2f} us, record {parse_record:.2f} us")
+
+    channels = [f"C{i:08d}" for i in range(count)]
+    timestamps = [f"{1790000000 + i}.000100" for i in range(count)]
+    rows = [
+        held_bytes(lambda i: {"channel_id": channels[i], "message_ts": timestamps[i]}, count),
+        held_bytes(lambda i: ReminderRef(channels[i], timestamps[i]), count)
+    ]
+    print(f"{'ReminderRef':<12} " + " ".join(f"{row * per / 1e6:>10.2f}" for row in rows))
+
+
+if __name__ == "__main__":
+    main()
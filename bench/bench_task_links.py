@@ -0,0 +1,58 @@
+# Task-link rendering against the fake tracker.
+#
+#   python bench/bench_task_links.py [latency]
+#
+# Renders the same "Key Changes & Tasks" text cold and warm, with one ticket slower than the
+# resolve timeout and one the tracker does not know, and prints how long each render held the
+# handler and how many lookups reached the tracker.
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_tracker import FakeTracker
+from task_links import TaskLinkProcessor, HttpTitleResolver, TTLCache
+
+TEXT = """PAY-101 fix refund rounding
+https://tracker.example.com/browse/PAY-102, https://tracker.example.com/browse/PAY-102/
+PAY-101 again, PAY-103 and PAY-404
+https://GitHub.com:443/acme/payments/pull/77#discussion
+* SLOW-1 waits on the vendor
+rolled back the feature flag for search"""
+
+
+def timed(processor, text):
+    started = time.perf_counter()
+    rendered = processor.render(text)
+    return rendered, (time.perf_counter() - started) * 1000
+
+
+def main():
+    latency = float(sys.argv[1]) if len(sys.argv) > 1 else 0.2
+    tracker = FakeTracker(latency=latency, slow_latency=3.0).start()
+    tracker.slow.add("SLOW-1")
+    tracker.missing.add("PAY-404")
+    processor = TaskLinkProcessor(
+        resolver=HttpTitleResolver(tracker.api_url),
+        cache=TTLCache(maxsize=100, ttl=60),
+        timeout=1.0,
+        ticket_url="https://tracker.example.com/browse/{key}",
+        ticket_prefixes=("PAY", "SLOW")
+    )
+
+    rendered, elapsed = timed(processor, TEXT)
+    print(f"cold render: {elapsed:7.1f} ms, tracker requests: {len(tracker.requests)}")
+    print(rendered)
+    rendered, elapsed = timed(processor, TEXT)
+    print(f"warm render: {elapsed:7.1f} ms, tracker requests: {len(tracker.requests)}")
+    time.sleep(3.0)
+    rendered, elapsed = timed(processor, TEXT)
+    print(f"after slow lookup finished: {elapsed:7.1f} ms, tracker requests: {len(tracker.requests)}")
+    print(rendered)
+    print("cache:", processor.cache.stats())
+    tracker.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# Microbenchmark: building a modal view per call vs. the prebuilt VIEWS registry.
+#
+#   python bench/bench_views.py [iterations]
+#
+# "build" is what the handlers used to do (construct the dict, then serialize it in the SDK);
+# "cached" is what open_view() does now (splice private_metadata into pre-serialized JSON).
+import os
+import sys
+import json
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from views import FORMS, VIEWS
+
+BUILDERS = {callback_id: form.view for callback_id, form in FORMS.items()}
+METADATA = "C0123456789,1714575600.000100"
+
+
+def build(callback_id):
+    return json.dumps(BUILDERS[callback_id](METADATA))
+
+
+def cached(callback_id):
+    return VIEWS[callback_id].render_json(METADATA)
+
+
+# Peak bytes allocated by a single call
+def peak_allocation(fn, callback_id):
+    fn(callback_id)
+    tracemalloc.start()
+    fn(callback_id)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    print(f"{'view':<18}{'path':<8}{'us/call':>10}{'peak bytes':>12}")
+    for callback_id in BUILDERS:
+        assert json.loads(build(callback_id)) == json.loads(cached(callback_id))
+        for name, fn in (("build", build), ("cached", cached)):
+            seconds = min(timeit.repeat(lambda: fn(callback_id), number=iterations, repeat=5))
+            print(f"{callback_id:<18}{name:<8}{seconds / iterations * 1e6:>10.2f}{peak_allocation(fn, callback_id):>12}")
+
+
+if __name__ == "__main__":
+    main()
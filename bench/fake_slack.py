@@ -0,0 +1,212 @@
+# Local stand-in for the Slack Web API, for running the app, the reminder backfill
+# and the benchmarks without a workspace.
+#
+#   python bench/fake_slack.py --port 8099 --channels 50
+#
+# Point a client at it with base_url=fake.url, or the app and the backfill with SLACK_API_URL.
+# With certfile (a PEM holding the certificate and its key) it serves HTTPS instead.
+# Only the methods the app uses are implemented; every call is recorded in `calls`.
+import ssl
+import json
+import time
+import random
+import argparse
+import threading
+from urllib.parse import parse_qs, urlparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeSlack:
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, rate_limit_every=0, retry_after=1, certfile=None):
+        # channel_id -> messages, newest first
+        self.channels = {}
+        self.calls = []
+        # Seconds to sleep before answering each call
+        self.latency = latency
+        # Answer every Nth call with a 429 and Retry-After, like a Tier limit would
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        # ws:// URL handed out by apps.connections.open (see fake_socket_mode.py)
+        self.socket_mode_url = None
+        # Called with (method, params) as each call arrives, e.g. to time views.open
+        self.on_call = None
+        self._lock = threading.Lock()
+        self._counter = 0
+        self._ts = time.time()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._scheme = "http"
+        if certfile:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(certfile)
+            self._server.socket = context.wrap_socket(self._server.socket, server_side=True)
+            self._scheme = "https"
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"{self._scheme}://{host}:{port}/api/"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-slack", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def add_message(self, channel_id, text, ts, **fields):
+        message = dict(fields, type="message", text=text, ts=ts)
+        with self._lock:
+            messages = self.channels.setdefault(channel_id, [])
+            messages.append(message)
+            messages.sort(key=lambda m: float(m["ts"]), reverse=True)
+        return message
+
+    def calls_to(self, method):
+        with self._lock:
+            return [params for name, params in self.calls if name == method]
+
+    def _next_ts(self):
+        with self._lock:
+            self._ts = max(self._ts + 0.000001, time.time())
+            return f"{self._ts:.6f}"
+
+    def _handler_class(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; without this, Nagle plus delayed ACKs
+            # stall every response on a kept-alive connection by ~40ms
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                self._dispatch()
+
+            def do_POST(self):
+                self._dispatch()
+
+            def _dispatch(self):
+                url = urlparse(self.path)
+                method = url.path.rsplit("/", 1)[-1]
+                params = {key: values[0] for key, values in parse_qs(url.query).items()}
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length).decode() if length else ""
+                if raw:
+                    if self.headers.get("Content-Type", "").startswith("application/json"):
+                        params.update(json.loads(raw))
+                    else:
+                        params.update({key: values[0] for key, values in parse_qs(raw).items()})
+
+                with fake._lock:
+                    fake._counter += 1
+                    limited = fake.rate_limit_every and fake._counter % fake.rate_limit_every == 0
+                    fake.calls.append((method, params))
+                if fake.on_call is not None:
+                    fake.on_call(method, params)
+
+                if fake.latency:
+                    time.sleep(fake.latency)
+                if limited:
+                    return self._reply({"ok": False, "error": "ratelimited"}, status=429, headers={"Retry-After": str(fake.retry_after)})
+
+                handler = getattr(fake, "api_" + method.replace(".", "_"), None)
+                if handler is None:
+                    return self._reply({"ok": False, "error": "unknown_method"})
+                self._reply(handler(params))
+
+            def _reply(self, payload, status=200, headers=None):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def api_auth_test(self, params):
+        return {"ok": True, "url": "https://fake.slack.com/", "team": "Fake", "user": "bot", "team_id": "T0FAKE", "user_id": "U0BOT", "bot_id": "B0BOT"}
+
+    def api_apps_connections_open(self, params):
+        if self.socket_mode_url is None:
+            return {"ok": False, "error": "not_allowed_token_type"}
+        return {"ok": True, "url": self.socket_mode_url}
+
+    def api_chat_postMessage(self, params):
+        ts = self._next_ts()
+        self.add_message(params["channel"], params.get("text", ""), ts)
+        return {"ok": True, "channel": params["channel"], "ts": ts}
+
+    def api_views_open(self, params):
+        view = params.get("view")
+        if isinstance(view, str):
+            view = json.loads(view)
+        return {"ok": True, "view": dict(view or {}, id="V" + self._next_ts().replace(".", ""))}
+
+    def api_users_conversations(self, params):
+        with self._lock:
+            channel_ids = sorted(self.channels)
+        return self._page([{"id": channel_id} for channel_id in channel_ids], params, "channels")
+
+    def api_conversations_history(self, params):
+        with self._lock:
+            messages = list(self.channels.get(params.get("channel"), []))
+        oldest = float(params.get("oldest") or 0)
+        latest = float(params.get("latest") or "inf")
+        messages = [message for message in messages if oldest <= float(message["ts"]) <= latest]
+        return self._page(messages, params, "messages")
+
+    # Cursor pagination: the cursor is the offset of the next page
+    def _page(self, items, params, key):
+        offset = int(params.get("cursor") or 0)
+        limit = int(params.get("limit") or 100)
+        page = items[offset:offset + limit]
+        has_more = offset + limit < len(items)
+        return {
+            "ok": True,
+            key: page,
+            "has_more": has_more,
+            "response_metadata": {"next_cursor": str(offset + limit) if has_more else ""}
+        }
+
+
+# Fill channels with chatter and a few daily "reminder" messages over the last `days` days
+def populate(fake, channels=20, messages_per_day=50, days=2, seed=0):
+    rng = random.Random(seed)
+    now = time.time()
+    for index in range(channels):
+        channel_id = f"C{index:08d}"
+        for _ in range(messages_per_day * days):
+            fake.add_message(channel_id, rng.choice(["lgtm", "deploying now", "who broke main?", "standup in 5"]), f"{now - rng.uniform(0, days * 86400):.6f}", user="U0HUMAN")
+        for day in range(days):
+            fake.add_message(channel_id, "Reminder: please submit your daily report", f"{now - day * 86400 - rng.uniform(0, 86400):.6f}", user="USLACKBOT")
+    return fake
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a fake Slack Web API")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--channels", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--rate-limit-every", type=int, default=0)
+    args = parser.parse_args()
+
+    fake = populate(FakeSlack(port=args.port, latency=args.latency, rate_limit_every=args.rate_limit_every), channels=args.channels)
+    print(f"Fake Slack API listening on {fake.url}")
+    try:
+        fake._server.serve_forever()
+    except KeyboardInterrupt:
+        fake.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# Local stand-in for Slack's Socket Mode websocket endpoint.
+#
+# Set FakeSlack.socket_mode_url = fake_socket.url so apps.connections.open hands it to the app.
+# Envelopes are pushed round-robin across the connected sockets (one per Socket Mode worker),
+# and `on_ack(envelope_id, payload)` is called when the app acknowledges one.
+import json
+import uuid
+import asyncio
+import threading
+from aiohttp import web, WSMsgType
+
+
+class FakeSocketMode:
+    def __init__(self, host="127.0.0.1", port=0, on_ack=None):
+        self.host = host
+        self.port = port
+        self.on_ack = on_ack
+        self._sockets = []
+        self._next = 0
+        self._loop = asyncio.new_event_loop()
+        self._thread = None
+        self._runner = None
+        self._connected = threading.Condition()
+
+    @property
+    def url(self):
+        return f"ws://{self.host}:{self.port}/link"
+
+    @property
+    def connections(self):
+        return len(self._sockets)
+
+    def start(self):
+        started = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(started,), name="fake-socket-mode", daemon=True)
+        self._thread.start()
+        started.wait()
+        return self
+
+    def _run(self, started):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self._serve())
+        started.set()
+        self._loop.run_forever()
+
+    async def _serve(self):
+        application = web.Application()
+        application.router.add_get("/link", self._handle)
+        self._runner = web.AppRunner(application)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+    async def _handle(self, request):
+        socket = web.WebSocketResponse(autoping=True)
+        await socket.prepare(request)
+        await socket.send_str(json.dumps({
+            "type": "hello",
+            "num_connections": len(self._sockets) + 1,
+            "connection_info": {"app_id": "A0FAKE"},
+            "debug_info": {"host": "fake-socket-mode"}
+        }))
+        with self._connected:
+            self._sockets.append(socket)
+            self._connected.notify_all()
+        try:
+            async for message in socket:
+                if message.type != WSMsgType.TEXT:
+                    continue
+                data = json.loads(message.data)
+                if "envelope_id" in data and self.on_ack is not None:
+                    self.on_ack(data["envelope_id"], data.get("payload"))
+        finally:
+            with self._connected:
+                self._sockets.remove(socket)
+        return socket
+
+    # Block until `count` connections are open; False on timeout
+    def wait_for_connections(self, count=1, timeout=30.0):
+        with self._connected:
+            return self._connected.wait_for(lambda: len(self._sockets) >= count, timeout)
+
+    # Push an envelope ("slash_commands", "interactive" or "events_api"); returns its id.
+    # Safe to call from any thread; the send itself happens on the server's loop.
+    def send(self, envelope_type, payload, envelope_id=None):
+        envelope_id = envelope_id or str(uuid.uuid4())
+        envelope = json.dumps({
+            "envelope_id": envelope_id,
+            "type": envelope_type,
+            "payload": payload,
+            "accepts_response_payload": envelope_type != "events_api",
+            "retry_attempt": 0,
+            "retry_reason": ""
+        })
+        asyncio.run_coroutine_threadsafe(self._send(envelope), self._loop)
+        return envelope_id
+
+    async def _send(self, envelope):
+        socket = self._sockets[self._next % len(self._sockets)]
+        self._next += 1
+        await socket.send_str(envelope)
+
+    def stop(self):
+        async def shutdown():
+            for socket in list(self._sockets):
+                await socket.close()
+            await self._runner.cleanup()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result(10)
+        self._loop.call_soon_threadsafe(self._loop.stop)
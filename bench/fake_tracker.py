@@ -0,0 +1,87 @@
+# Local stand-in for an issue tracker's REST API, for exercising task-link title lookups.
+#
+#   python bench/fake_tracker.py --port 8098 --latency 0.2
+#
+# GET /rest/api/2/issue/<KEY> answers {"key": ..., "fields": {"summary": ...}} for any key,
+# 404 for keys listed in `missing`; keys in `slow` take `slow_latency` seconds instead of `latency`.
+# Point the app at it with TASK_TITLE_RESOLVER=http and TASK_TRACKER_API_URL=fake.api_url.
+import json
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeTracker:
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, slow_latency=5.0):
+        self.latency = latency
+        self.slow_latency = slow_latency
+        self.slow = set()
+        self.missing = set()
+        # Keys in the order they were requested
+        self.requests = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+
+    @property
+    def api_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/rest/api/2/issue/{{key}}?fields=summary"
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, name="fake-tracker", daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler_class(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                key = self.path.split("?", 1)[0].rsplit("/", 1)[-1]
+                with fake._lock:
+                    fake.requests.append(key)
+                time.sleep(fake.slow_latency if key in fake.slow else fake.latency)
+                if key in fake.missing:
+                    return self._reply({"errorMessages": ["Issue does not exist"]}, status=404)
+                self._reply({"key": key, "fields": {"summary": f"Summary of {key} <with> & markup"}})
+
+            def _reply(self, payload, status=200):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a fake issue tracker API")
+    parser.add_argument("--port", type=int, default=8098)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    fake = FakeTracker(port=args.port, latency=args.latency)
+    print(f"Fake tracker listening on {fake.api_url}")
+    try:
+        fake._server.serve_forever()
+    except KeyboardInterrupt:
+        fake.stop()
+
+
+if __name__ == "__main__":
+    main()
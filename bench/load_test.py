@@ -0,0 +1,378 @@
+# Load test: runs app.py against the fake Web API and a fake Socket Mode server, replays
+# synthetic slash commands, view submissions and message events at a fixed rate, and
+# reports per-handler throughput, ack latency percentiles, error rates and memory growth.
+#
+#   python bench/load_test.py --rate 20 --duration 60 --output results.json
+#   python bench/load_test.py --runtime async --workers 2 --compare results.json
+#
+# --mix weights the traffic, e.g. "report-qa=5,submit-qa=5,message=1".
+# Results are written as JSON; --compare prints per-handler deltas against an earlier file.
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import argparse
+import tempfile
+import threading
+import subprocess
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_slack import FakeSlack
+from fake_socket_mode import FakeSocketMode
+from views import FORMS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Slack's ack deadline for every envelope type
+ACK_DEADLINE = 3.0
+
+# Traffic kinds: (handler label, envelope type)
+KINDS = {
+    "notify-deploy": ("/notify-deploy", "slash_commands"),
+    "report-ba": ("/report-ba", "slash_commands"),
+    "report-qa": ("/report-qa", "slash_commands"),
+    "submit-deploy": ("deploy_modal", "interactive"),
+    "submit-ba": ("report_ba_modal", "interactive"),
+    "submit-qa": ("report_qa_modal", "interactive"),
+    "message": ("message", "events_api")
+}
+
+DEFAULT_MIX = "notify-deploy=1,report-ba=3,report-qa=3,submit-deploy=1,submit-ba=3,submit-qa=3,message=2"
+
+
+def _percentiles(values):
+    if not values:
+        return {}
+    ordered = sorted(values)
+    pick = lambda fraction: round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 4)
+    return {"p50": pick(0.5), "p90": pick(0.9), "p99": pick(0.99), "max": round(ordered[-1], 4)}
+
+
+# Resident set size in bytes of a process and its children (Linux /proc)
+def _rss(pid):
+    total = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+            with open(f"/proc/{current}/task/{current}/children") as f:
+                pending.extend(int(child) for child in f.read().split())
+        except (FileNotFoundError, ProcessLookupError):
+            continue
+    return total or None
+
+
+# state.values for a submission; the sequence number keeps each one unique for the dedup cache
+def _state_values(callback_id, sequence, rng):
+    values = {}
+    for field in FORMS[callback_id].fields:
+        element = field.element
+        if element["type"] in ("static_select", "radio_buttons"):
+            action = {"type": element["type"], "selected_option": rng.choice(element["options"])}
+        elif element["type"] == "datepicker":
+            action = {"type": "datepicker", "selected_date": date.today().isoformat()}
+        elif element["type"] == "number_input":
+            action = {"type": "number_input", "value": str(rng.randint(0, 20))}
+        else:
+            action = {"type": "plain_text_input", "value": f"load test {sequence}"}
+        values[field.block_id] = {field.action_id: action}
+    return values
+
+
+class LoadTest:
+    def __init__(self, rate, duration, mix, channels=20, workers=1, runtime="sync", latency=0.0, seed=0, app_log=None):
+        self.rate = rate
+        self.duration = duration
+        self.mix = mix
+        self.channels = [f"C{index:08d}" for index in range(channels)]
+        self.workers = workers
+        self.runtime = runtime
+        self.app_log = app_log
+        self.rng = random.Random(seed)
+        self.fake = FakeSlack(latency=latency).start()
+        self.socket = FakeSocketMode(on_ack=self._acked).start()
+        self.fake.socket_mode_url = self.socket.url
+        self.fake.on_call = self._api_called
+        self.reminders = {}
+        self._lock = threading.Lock()
+        self._sent = {}
+        self._acks = {}
+        self._triggers = {}
+        self._views_open = {}
+        self._sequence = 0
+
+    def _acked(self, envelope_id, payload):
+        now = time.perf_counter()
+        with self._lock:
+            sent = self._sent.get(envelope_id)
+            if sent is not None and envelope_id not in self._acks:
+                self._acks[envelope_id] = now - sent[1]
+
+    def _api_called(self, method, params):
+        if method != "views.open":
+            return
+        now = time.perf_counter()
+        with self._lock:
+            sent_at = self._triggers.pop(params.get("trigger_id"), None)
+            if sent_at is not None:
+                handler, started = sent_at
+                self._views_open.setdefault(handler, []).append(now - started)
+
+    def _send(self, handler, envelope_type, payload, trigger_id=None):
+        envelope_id = str(uuid.uuid4())
+        now = time.perf_counter()
+        with self._lock:
+            self._sent[envelope_id] = (handler, now)
+            if trigger_id:
+                self._triggers[trigger_id] = (handler, now)
+        self.socket.send(envelope_type, payload, envelope_id)
+
+    def _next_sequence(self):
+        self._sequence += 1
+        return self._sequence
+
+    def send(self, kind, channel_id):
+        handler, envelope_type = KINDS[kind]
+        sequence = self._next_sequence()
+        user_id = f"U{self.rng.randrange(200):07d}"
+        if envelope_type == "slash_commands":
+            trigger_id = f"{sequence}.{uuid.uuid4().hex}"
+            payload = {
+                "command": handler, "text": "", "channel_id": channel_id, "user_id": user_id,
+                "team_id": "T0FAKE", "api_app_id": "A0FAKE", "trigger_id": trigger_id,
+                "response_url": "https://hooks.slack.invalid/commands"
+            }
+            return self._send(handler, envelope_type, payload, trigger_id)
+        if envelope_type == "interactive":
+            metadata = channel_id if handler == "deploy_modal" else f"{channel_id},{self.reminders[channel_id]}"
+            payload = {
+                "type": "view_submission", "team": {"id": "T0FAKE"}, "user": {"id": user_id}, "api_app_id": "A0FAKE",
+                "view": {
+                    "id": f"V{sequence:010d}", "hash": uuid.uuid4().hex, "type": "modal", "callback_id": handler,
+                    "private_metadata": metadata, "state": {"values": _state_values(handler, sequence, self.rng)}
+                }
+            }
+            return self._send(handler, envelope_type, payload)
+        return self._send(handler, envelope_type, self._message_event(channel_id, user_id, self.rng.choice(["lgtm", "deploying now", "Reminder: reports due"])))
+
+    def _message_event(self, channel_id, user_id, text):
+        ts = f"{time.time():.6f}"
+        return {
+            "type": "event_callback", "team_id": "T0FAKE", "api_app_id": "A0FAKE", "event_id": f"Ev{uuid.uuid4().hex[:10]}",
+            "event_time": int(time.time()),
+            "event": {"type": "message", "channel": channel_id, "user": user_id, "text": text, "ts": ts, "channel_type": "channel"}
+        }
+
+    def _start_app(self, directory):
+        env = dict(
+            os.environ,
+            SLACK_API_URL=self.fake.url,
+            SLACK_BOT_TOKEN="xoxb-load-test",
+            SLACK_APP_TOKEN="xapp-load-test",
+            STORAGE_BACKEND="sqlite",
+            DATABASE_PATH=os.path.join(directory, "load_test.db"),
+            OUTBOUND_DEAD_LETTER_FILE=os.path.join(directory, "dead_letter.jsonl"),
+            REMINDER_BACKFILL="false",
+            REMINDER_CUTOFF_HOUR="0",
+            SOCKET_MODE_WORKERS=str(self.workers),
+            BOLT_RUNTIME=self.runtime
+        )
+        log = open(self.app_log or os.path.join(directory, "app.log"), "w")
+        return subprocess.Popen([sys.executable, os.path.join(ROOT, "app.py")], cwd=directory, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+    # Store a reminder per channel so /report-* and report submissions have a thread
+    def _seed_reminders(self):
+        for channel_id in self.channels:
+            payload = self._message_event(channel_id, "USLACKBOT", "Reminder: please submit your daily report")
+            self.reminders[channel_id] = payload["event"]["ts"]
+            self._send("seed", "events_api", payload)
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline and len(self._acks) < len(self.channels):
+            time.sleep(0.05)
+        time.sleep(0.5)
+        with self._lock:
+            self._sent.clear()
+            self._acks.clear()
+
+    def run(self):
+        kinds, weights = zip(*self.mix.items())
+        with tempfile.TemporaryDirectory() as directory:
+            app = self._start_app(directory)
+            try:
+                if not self.socket.wait_for_connections(self.workers, timeout=60):
+                    raise RuntimeError(f"app did not open {self.workers} Socket Mode connection(s); see its log")
+                self._seed_reminders()
+                rss_start = _rss(app.pid)
+                rss_samples = [rss_start]
+                api_calls_before = len(self.fake.calls)
+
+                started = time.perf_counter()
+                total = int(self.rate * self.duration)
+                next_sample = started + 1.0
+                for index in range(total):
+                    target = started + index / self.rate
+                    delay = target - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                    self.send(self.rng.choices(kinds, weights)[0], self.rng.choice(self.channels))
+                    if time.perf_counter() >= next_sample:
+                        rss_samples.append(_rss(app.pid))
+                        next_sample += 1.0
+                send_seconds = time.perf_counter() - started
+
+                # Let outstanding acks, views.open calls and queued posts finish
+                deadline = time.perf_counter() + ACK_DEADLINE + 2
+                while time.perf_counter() < deadline and (len(self._acks) < len(self._sent) or self._triggers):
+                    time.sleep(0.05)
+                elapsed = time.perf_counter() - started
+                rss_end = _rss(app.pid)
+                rss_samples.append(rss_end)
+                alive = app.poll() is None
+            finally:
+                app.terminate()
+                try:
+                    app.wait(15)
+                except subprocess.TimeoutExpired:
+                    app.kill()
+            with open(self.app_log or os.path.join(directory, "app.log")) as f:
+                log_errors = sum(1 for line in f if "ERROR" in line or "Traceback" in line)
+
+        return self._report(send_seconds, elapsed, rss_start, rss_end, [rss for rss in rss_samples if rss], alive, log_errors, self.fake.calls[api_calls_before:])
+
+    def _report(self, send_seconds, elapsed, rss_start, rss_end, rss_samples, alive, log_errors, api_calls):
+        handlers = {}
+        with self._lock:
+            sent = dict(self._sent)
+            acks = dict(self._acks)
+            views_open = {handler: list(values) for handler, values in self._views_open.items()}
+            unopened = {}
+            for handler, _ in self._triggers.values():
+                unopened[handler] = unopened.get(handler, 0) + 1
+
+        for envelope_id, (handler, _) in sent.items():
+            entry = handlers.setdefault(handler, {"sent": 0, "latencies": []})
+            entry["sent"] += 1
+            if envelope_id in acks:
+                entry["latencies"].append(acks[envelope_id])
+
+        report = {}
+        for handler, entry in sorted(handlers.items()):
+            latencies = entry.pop("latencies")
+            late = sum(1 for latency in latencies if latency > ACK_DEADLINE)
+            errors = entry["sent"] - len(latencies) + late
+            result = {
+                "sent": entry["sent"],
+                "acked": len(latencies),
+                "late_acks": late,
+                "error_rate": round(errors / entry["sent"], 4),
+                "throughput_per_second": round(len(latencies) / elapsed, 2),
+                "ack_latency_seconds": _percentiles(latencies)
+            }
+            if handler.startswith("/"):
+                result["views_open"] = len(views_open.get(handler, []))
+                result["views_open_missing"] = unopened.get(handler, 0)
+                result["time_to_views_open_seconds"] = _percentiles(views_open.get(handler, []))
+            report[handler] = result
+
+        methods = {}
+        for method, _ in api_calls:
+            methods[method] = methods.get(method, 0) + 1
+        submissions = sum(report[handler]["sent"] for handler in ("deploy_modal", "report_ba_modal", "report_qa_modal") if handler in report)
+        return {
+            "version": _version(),
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "config": {"rate": self.rate, "duration": self.duration, "mix": self.mix, "channels": len(self.channels), "workers": self.workers, "runtime": self.runtime, "api_latency": self.fake.latency},
+            "elapsed_seconds": round(elapsed, 3),
+            "offered_rate": round(sum(entry["sent"] for entry in report.values()) / send_seconds, 2),
+            "handlers": report,
+            "web_api_calls": methods,
+            "reports_posted": methods.get("chat.postMessage", 0),
+            "reports_expected": submissions,
+            "app_alive": alive,
+            "app_log_errors": log_errors,
+            "memory": {
+                "rss_start_bytes": rss_start,
+                "rss_end_bytes": rss_end,
+                "rss_peak_bytes": max(rss_samples) if rss_samples else None,
+                "rss_growth_bytes": rss_end - rss_start if rss_start and rss_end else None
+            }
+        }
+
+    def stop(self):
+        self.socket.stop()
+        self.fake.stop()
+
+
+def _version():
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        kind, _, weight = part.partition("=")
+        if kind.strip() not in KINDS:
+            raise argparse.ArgumentTypeError(f"unknown traffic kind {kind!r}; choose from {', '.join(KINDS)}")
+        mix[kind.strip()] = float(weight or 1)
+    return mix
+
+
+def print_report(result, baseline=None):
+    print(f"{result['version']}: {result['offered_rate']}/s offered for {result['elapsed_seconds']}s, "
+          f"RSS {result['memory']['rss_start_bytes']} -> {result['memory']['rss_end_bytes']} bytes, "
+          f"{result['reports_posted']}/{result['reports_expected']} reports posted, {result['app_log_errors']} app log errors")
+    print(f"{'handler':<18}{'sent':>7}{'acked':>7}{'err%':>7}{'ack/s':>8}{'p50':>9}{'p99':>9}{'max':>9}")
+    for handler, entry in result["handlers"].items():
+        latency = entry["ack_latency_seconds"]
+        line = (f"{handler:<18}{entry['sent']:>7}{entry['acked']:>7}{entry['error_rate'] * 100:>7.1f}{entry['throughput_per_second']:>8.1f}"
+                f"{latency.get('p50', 0):>9.4f}{latency.get('p99', 0):>9.4f}{latency.get('max', 0):>9.4f}")
+        previous = (baseline or {}).get("handlers", {}).get(handler)
+        if previous and previous["ack_latency_seconds"] and latency:
+            line += f"   p99 {latency['p99'] - previous['ack_latency_seconds']['p99']:+.4f}s vs {baseline['version']}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test app.py against fake Slack servers")
+    parser.add_argument("--rate", type=float, default=10.0, help="envelopes per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of traffic")
+    parser.add_argument("--mix", type=_parse_mix, default=_parse_mix(DEFAULT_MIX))
+    parser.add_argument("--channels", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=1, help="SOCKET_MODE_WORKERS for the app")
+    parser.add_argument("--runtime", choices=("sync", "async"), default="sync")
+    parser.add_argument("--latency", type=float, default=0.0, help="fake Web API latency in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--app-log", help="keep the app's output in this file")
+    parser.add_argument("--output", default="load_test_results.json")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    test = LoadTest(args.rate, args.duration, args.mix, args.channels, args.workers, args.runtime, args.latency, args.seed, args.app_log)
+    try:
+        result = test.run()
+    finally:
+        test.stop()
+
+    with open(args.output, "w") as f:
+        json.dump(result, f, indent=4)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(result, baseline)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
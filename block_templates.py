@@ -0,0 +1,147 @@
+import re
+
+# Block Kit messages prepared once from a layout with marked slots.
+# A slot is "{field}" or "{field|text shown when empty}" inside a block's text. Blocks without
+# slots are shared by every render; a block with slots keeps its text as a str.format pattern
+# that is filled per message. The returned lists must be treated as read-only.
+# Slot values are mrkdwn-escaped unless the field is listed in `raw` (already mrkdwn, e.g.
+# rendered task links); None and "" take the slot's default, "—" if it has none.
+
+SLOT_PATTERN = re.compile(r"\{(\w+)(?:\|([^{}]*))?\}")
+EMPTY = "—"
+
+# Slack rejects section text longer than this many characters
+MAX_SECTION_TEXT = 3000
+
+
+# Escape the characters Slack treats as markup in mrkdwn text, so user input cannot
+# form links or mentions (<!here>, <@U123>) or break the surrounding formatting
+def escape_mrkdwn(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _value(value, default):
+    if value is None or value == "":
+        return default
+    if not isinstance(value, str):
+        return str(value)
+    return escape_mrkdwn(value)
+
+
+def _raw_value(value, default):
+    return default if value is None or value == "" else value
+
+
+def section(text):
+    return {
+      "type": "section",
+      "text": {
+        "type": "mrkdwn",
+        "text": text
+      }
+    }
+
+
+# A line in pieces of at most MAX_SECTION_TEXT characters, never splitting an escape like &amp;
+def _pieces(line):
+    while len(line) > MAX_SECTION_TEXT:
+        cut = MAX_SECTION_TEXT
+        entity = line.rfind("&", cut - 4, cut)
+        if entity > 0:
+            cut = entity
+        yield line[:cut]
+        line = line[cut:]
+    yield line
+
+
+# Sections listing `lines`, as many to a section as fit in MAX_SECTION_TEXT; a line too long
+# for a section of its own continues in the next one
+def line_sections(lines):
+    sections, current, length = [], [], 0
+    for line in lines:
+        for piece in _pieces(line):
+            if current and length + 1 + len(piece) > MAX_SECTION_TEXT:
+                sections.append(section("\n".join(current)))
+                current, length = [], 0
+            length += len(piece) + (1 if current else 0)
+            current.append(piece)
+    if current:
+        sections.append(section("\n".join(current)))
+    return sections
+
+
+# A group of blocks left out entirely when `field` is empty, e.g. an optional notes section
+class OptionalGroup:
+    def __init__(self, field, *blocks):
+        self.field = field
+        self.blocks = blocks
+
+
+# The lines of `field` (a list, or text split at newlines) as line_sections()
+class LineSections:
+    def __init__(self, field):
+        self.field = field
+
+
+# A block with slots: its text as a format pattern plus (field, default, fill) per slot
+class _SlotBlock:
+    def __init__(self, block, raw):
+        text = block["text"]["text"]
+        self.block = block
+        self.slots = []
+        pattern = []
+        position = 0
+        for match in SLOT_PATTERN.finditer(text):
+            pattern.append(text[position:match.start()].replace("{", "{{").replace("}", "}}") + "{}")
+            name, default = match.group(1), match.group(2)
+            self.slots.append((name, EMPTY if default is None else default, _raw_value if name in raw else _value))
+            position = match.end()
+        pattern.append(text[position:].replace("{", "{{").replace("}", "}}"))
+        self.pattern = "".join(pattern)
+
+    def render(self, get):
+        text = self.pattern.format(*[fill(get(name), default) for name, default, fill in self.slots])
+        return dict(self.block, text=dict(self.block["text"], text=text))
+
+
+class MessageTemplate:
+    def __init__(self, layout, raw=()):
+        self.layout = layout
+        self.raw = frozenset(raw)
+        self._steps = self._prepare(layout)
+
+    # Layout items as steps for render(): shared blocks, slot blocks, groups and line sections
+    def _prepare(self, layout):
+        steps = []
+        for item in layout:
+            if isinstance(item, OptionalGroup):
+                steps.append(("group", item.field, self._prepare(item.blocks)))
+            elif isinstance(item, LineSections):
+                steps.append(("lines", item.field, item.field in self.raw))
+            elif isinstance(item.get("text"), dict) and SLOT_PATTERN.search(item["text"].get("text", "")):
+                steps.append(("slots", _SlotBlock(item, self.raw), None))
+            else:
+                steps.append(("block", item, None))
+        return steps
+
+    def _render(self, steps, get, blocks):
+        for kind, item, extra in steps:
+            if kind == "block":
+                blocks.append(item)
+            elif kind == "slots":
+                blocks.append(item.render(get))
+            elif kind == "group":
+                if _raw_value(get(item), None) is not None:
+                    self._render(extra, get, blocks)
+            else:
+                lines = get(item)
+                if lines is None or lines == "":
+                    continue
+                if not isinstance(lines, list):
+                    lines = str(lines).splitlines()
+                blocks += line_sections(lines if extra else [escape_mrkdwn(line) for line in lines])
+        return blocks
+
+    # Blocks for a message; `values` is a dict or a records.Record
+    def render(self, values):
+        return self._render(self._steps, values.get, [])
@@ -0,0 +1,46 @@
+import csv
+
+# Most projects one bulk notification accepts
+MAX_PROJECTS = 200
+
+# Longest project name and version accepted, so that each line of the message stays short
+MAX_PROJECT_LENGTH = 100
+MAX_VERSION_LENGTH = 50
+
+HEADER_NAMES = {"project", "project name", "projects"}
+
+
+def _split(line):
+    if "\t" in line:
+        cells = line.split("\t")
+    elif "," in line or '"' in line:
+        cells = next(csv.reader([line], skipinitialspace=True))
+    else:
+        # "payments-api v1.4.2"
+        cells = line.rsplit(None, 1) if len(line.split()) > 1 else [line]
+    return [cell.strip() for cell in cells]
+
+
+# [(project, version or None), ...] from the bulk modal's projects field.
+# Accepts "project, version" CSV, tab-separated rows pasted from a spreadsheet, or
+# "project version"; a header row is skipped. Raises ValueError with a message for the modal.
+def parse_projects(text):
+    projects = []
+    for number, line in enumerate((text or "").splitlines(), 1):
+        if not line.strip():
+            continue
+        cells = _split(line)
+        if not projects and cells[0].lower() in HEADER_NAMES:
+            continue
+        if not cells[0]:
+            raise ValueError(f"Line {number} has no project name")
+        if len(cells[0]) > MAX_PROJECT_LENGTH:
+            raise ValueError(f"Line {number}: project names are at most {MAX_PROJECT_LENGTH} characters")
+        if len(cells) > 1 and len(cells[1]) > MAX_VERSION_LENGTH:
+            raise ValueError(f"Line {number}: versions are at most {MAX_VERSION_LENGTH} characters")
+        projects.append((cells[0], cells[1] if len(cells) > 1 and cells[1] else None))
+    if not projects:
+        raise ValueError("List at least one project")
+    if len(projects) > MAX_PROJECTS:
+        raise ValueError(f"At most {MAX_PROJECTS} projects per notification")
+    return projects
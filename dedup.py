@@ -0,0 +1,77 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+# Bounded set of recently seen keys with TTL eviction.
+# Keys expire in insertion order (the TTL is fixed), so eviction only ever looks at the
+# oldest entries and every operation is O(1) amortized; maxsize caps memory regardless of load.
+# With a store, keys are also claimed there so duplicates are caught across restarts and workers.
+class DedupCache:
+    def __init__(self, maxsize=10000, ttl=3600.0, store=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.store = store
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # DEDUP_MAX_ENTRIES, DEDUP_TTL_SECONDS; DEDUP_PERSIST=false keeps it in memory only
+    @classmethod
+    def from_env(cls, store):
+        return cls(
+            maxsize=int(os.environ.get("DEDUP_MAX_ENTRIES", "10000")),
+            ttl=float(os.environ.get("DEDUP_TTL_SECONDS", "3600")),
+            store=store if os.environ.get("DEDUP_PERSIST", "true") == "true" else None
+        )
+
+    def _evict(self, now):
+        entries = self._entries
+        while entries:
+            key, expires_at = next(iter(entries.items()))
+            if expires_at > now and len(entries) <= self.maxsize:
+                break
+            entries.popitem(last=False)
+
+    # Record the keys; returns False if any of them was already seen
+    def add(self, *keys):
+        now = time.monotonic()
+        with self._lock:
+            self._evict(now)
+            if any(key in self._entries for key in keys):
+                self.hits += 1
+                return False
+            for key in keys:
+                self._entries[key] = now + self.ttl
+            self._evict(now)
+
+        # Claim every key, even once one is taken, so both are recorded for later submissions
+        if self.store is not None and not all([self.store.claim(key, self.ttl) for key in keys]):
+            with self._lock:
+                self.hits += 1
+            return False
+
+        with self._lock:
+            self.misses += 1
+        return True
+
+    # True if this view_submission is a retry of, or identical to, one already handled.
+    # Retries share the view id and hash; double-submits from a second modal share the content.
+    def is_duplicate_submission(self, body, view):
+        content = json.dumps(
+            [view.get("callback_id"), body.get("user", {}).get("id"), view.get("private_metadata"), view["state"]["values"]],
+            sort_keys=True,
+            separators=(",", ":")
+        )
+        return not self.add(
+            f"view:{view['id']}:{view.get('hash', '')}",
+            "content:" + hashlib.sha256(content.encode()).hexdigest()
+        )
+
+    def stats(self):
+        with self._lock:
+            return {"size": len(self._entries), "duplicates": self.hits, "unique": self.misses}
@@ -0,0 +1,36 @@
+from datetime import date
+from views import DEPLOYMENT_TYPES
+
+USAGE = "Usage: /deploy-history [project prefix] [production|staging|development] [since:YYYY-MM-DD] [until:YYYY-MM-DD] [limit:N]"
+
+# Most rows one reply will list
+MAX_LIMIT = 50
+
+
+# Parse the /deploy-history text into store.get_deployments() arguments.
+# Dates are local calendar days of the channel's reminder window; until: includes that day.
+# Raises ValueError with a message for the user on malformed input.
+def parse_history_query(text, window):
+    query = {"project_prefix": None, "deployment_type": None, "since": None, "until": None, "limit": 10}
+    types = {deployment_type.lower(): deployment_type for deployment_type in DEPLOYMENT_TYPES}
+    words = []
+    for token in text.split():
+        name, separator, value = token.partition(":")
+        name = name.lower()
+        if separator and name in ("since", "until"):
+            try:
+                day_start, day_end = window.day_range(date.fromisoformat(value))
+            except ValueError:
+                raise ValueError(f"Invalid date {value!r}. {USAGE}")
+            query[name] = day_start if name == "since" else day_end
+        elif separator and name == "limit":
+            if not value.isdigit() or int(value) < 1:
+                raise ValueError(f"Invalid limit {value!r}. {USAGE}")
+            query["limit"] = min(int(value), MAX_LIMIT)
+        elif name in types and not separator:
+            query["deployment_type"] = types[name]
+        else:
+            words.append(token)
+    if words:
+        query["project_prefix"] = " ".join(words)
+    return query
@@ -0,0 +1,126 @@
+from datetime import date
+
+# Declarative modal forms.
+# A Form lists its fields once; the same definition builds the modal blocks and
+# extracts typed values from a view_submission in a single pass over state.values.
+
+
+def _plain_text(text):
+    return {"type": "plain_text", "text": text, "emoji": True}
+
+
+def _options(values):
+    return [{"text": _plain_text(value), "value": value} for value in values]
+
+
+def _selected_value(action):
+    option = action.get("selected_option")
+    return option.get("value") if option else None
+
+
+def _text_value(action):
+    return action.get("value") or None
+
+
+def _int_value(action):
+    value = action.get("value")
+    return int(value) if value not in (None, "") else None
+
+
+def _date_value(action):
+    value = action.get("selected_date")
+    return date.fromisoformat(value) if value else None
+
+
+# One input block of a form.
+# `name` is the key in the parsed result; `block_id` defaults to it.
+class Field:
+    def __init__(self, name, label, element, parse, optional=False, block_id=None):
+        self.name = name
+        self.label = label
+        self.element = element
+        self.parse = parse
+        self.optional = optional
+        self.block_id = block_id or name
+        self.action_id = f"{self.block_id}-action"
+
+    def block(self):
+        block = {
+            "type": "input",
+            "block_id": self.block_id,
+            "label": _plain_text(self.label),
+            "element": dict(self.element, action_id=self.action_id)
+        }
+        if self.optional:
+            block["optional"] = True
+        return block
+
+
+def select(name, label, options, placeholder, optional=False, block_id=None):
+    element = {"type": "static_select", "placeholder": _plain_text(placeholder), "options": _options(options)}
+    return Field(name, label, element, _selected_value, optional, block_id)
+
+
+def radio(name, label, options, optional=False, block_id=None):
+    element = {"type": "radio_buttons", "options": _options(options)}
+    return Field(name, label, element, _selected_value, optional, block_id)
+
+
+def datepicker(name, label, placeholder, optional=False, block_id=None):
+    element = {"type": "datepicker", "placeholder": _plain_text(placeholder)}
+    return Field(name, label, element, _date_value, optional, block_id)
+
+
+def number(name, label, optional=False, block_id=None):
+    element = {"type": "number_input", "is_decimal_allowed": False}
+    return Field(name, label, element, _int_value, optional, block_id)
+
+
+def text(name, label, placeholder=None, multiline=False, optional=False, block_id=None):
+    element = {"type": "plain_text_input"}
+    if multiline:
+        element["multiline"] = True
+    if placeholder:
+        element["placeholder"] = _plain_text(placeholder)
+    return Field(name, label, element, _text_value, optional, block_id)
+
+
+# `record` is a records.Record class whose fields include every field name; parse() then
+# returns one of those instead of a dict.
+class Form:
+    def __init__(self, callback_id, title, submit, intro, fields, record=None):
+        self.callback_id = callback_id
+        self.title = title
+        self.submit = submit
+        self.intro = intro
+        self.fields = fields
+        self.record = record
+        self._names = record.__slots__ if record is not None else tuple(field.name for field in fields)
+        # block_id -> (result position, action_id, parser), compiled once for parse()
+        self._extractors = {field.block_id: (self._names.index(field.name), field.action_id, field.parse) for field in fields}
+
+    def view(self, private_metadata):
+        return {
+            "type": "modal",
+            "private_metadata": private_metadata,
+            "callback_id": self.callback_id,
+            "title": {"type": "plain_text", "text": self.title},
+            "submit": {"type": "plain_text", "text": self.submit},
+            "blocks": [
+                {"type": "section", "text": _plain_text(self.intro)},
+                {"type": "divider"}
+            ] + [field.block() for field in self.fields]
+        }
+
+    # Typed field values of a view_submission; fields missing from the state are None
+    def parse(self, view):
+        values = [None] * len(self._names)
+        extractors = self._extractors
+        for block_id, actions in view["state"]["values"].items():
+            extractor = extractors.get(block_id)
+            if extractor is not None:
+                index, action_id, parse = extractor
+                values[index] = parse(actions.get(action_id) or {})
+        if self.record is not None:
+            return self.record(*values)
+        return dict(zip(self._names, values))
@@ -0,0 +1,234 @@
+import os
+import ssl
+import time
+import socket
+import select
+import logging
+import threading
+import http.client
+from io import BytesIO
+from collections import Counter, deque
+from urllib.parse import urlsplit
+from urllib.error import HTTPError
+from slack_sdk import WebClient
+
+logger = logging.getLogger(__name__)
+
+# A pooled connection failing like this while the request is sent was closed by Slack while idle
+STALE_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError, ConnectionAbortedError)
+
+
+# The request went out but the connection failed before the whole response came back, so Slack
+# may have acted on it. Neither the pool nor the SDK's connection-error retry handler sends it
+# again; the caller decides whether the call is safe to repeat.
+class ResponseLost(OSError):
+    pass
+
+
+# An idle connection that has anything to read was closed by the server (or broke protocol)
+def _dropped(connection):
+    if connection.sock is None:
+        return True
+    try:
+        return bool(select.select([connection.sock], [], [], 0)[0])
+    except (OSError, ValueError):
+        return True
+
+
+# Keep-alive HTTP/1.1 connections shared by every WebClient in the process.
+# urllib sends "Connection: close", so the SDK's default transport pays for a TCP and TLS
+# handshake on every call. Here idle connections are kept per (scheme, host, port), up to
+# `maxsize` each, and the most recently used one is handed out first; connections idle longer
+# than `idle_timeout` are dropped, since servers close them on their side.
+class ConnectionPool:
+    def __init__(self, maxsize=16, timeout=30.0, idle_timeout=60.0):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.ssl_context = ssl.create_default_context()
+        # key -> deque of (connection, released_at)
+        self._idle = {}
+        self._lock = threading.Lock()
+        self._counts = Counter()
+
+    def _connect(self, key, timeout):
+        scheme, host, port, ssl_context = key
+        if scheme == "https":
+            connection = http.client.HTTPSConnection(host, port, timeout=timeout, context=ssl_context or self.ssl_context)
+        else:
+            connection = http.client.HTTPConnection(host, port, timeout=timeout)
+        connection.connect()
+        # Let the OS notice dead peers on connections that sit idle in the pool, and send small
+        # requests at once instead of waiting on Nagle's algorithm
+        connection.sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        connection.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self._lock:
+            self._counts["opened"] += 1
+        return connection
+
+    def _checkout(self, key):
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get(key)
+            while idle:
+                connection, released_at = idle.pop()
+                if now - released_at >= self.idle_timeout:
+                    self._counts["expired"] += 1
+                elif _dropped(connection):
+                    self._counts["stale"] += 1
+                else:
+                    self._counts["reused"] += 1
+                    return connection
+                connection.close()
+        return None
+
+    def _checkin(self, key, connection):
+        with self._lock:
+            idle = self._idle.setdefault(key, deque())
+            if len(idle) < self.maxsize:
+                idle.append((connection, time.monotonic()))
+                return
+            self._counts["discarded"] += 1
+        connection.close()
+
+    # POST `body` to `url`; returns (status, reason, headers, body bytes)
+    def request(self, url, body, headers, ssl_context=None, timeout=None):
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80), ssl_context)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        timeout = timeout or self.timeout
+        connection = self._checkout(key)
+        reused = connection is not None
+        while True:
+            if connection is None:
+                connection = self._connect(key, timeout)
+            try:
+                connection.sock.settimeout(timeout)
+                connection.request("POST", path, body=body, headers=headers)
+            except STALE_ERRORS:
+                connection.close()
+                if not reused:
+                    raise
+                # The request could not be written to a connection Slack had already closed;
+                # retry once on a new one
+                with self._lock:
+                    self._counts["stale"] += 1
+                connection, reused = None, False
+                continue
+            except BaseException:
+                connection.close()
+                raise
+            try:
+                response = connection.getresponse()
+                data = response.read()
+            except Exception as e:
+                # Reset, timeout, IncompleteRead, BadStatusLine...: the request was sent
+                connection.close()
+                with self._lock:
+                    self._counts["response_lost"] += 1
+                raise ResponseLost(f"{type(e).__name__} after sending POST {parts.path}: {e}") from e
+            except BaseException:
+                connection.close()
+                raise
+            if response.will_close:
+                connection.close()
+            else:
+                self._checkin(key, connection)
+            return response.status, response.reason, response.msg, data
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counts, idle=sum(len(idle) for idle in self._idle.values()))
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection, _ in connections:
+                connection.close()
+
+
+# The response dict the SDK expects from its urllib transport; errors raise HTTPError like urlopen
+def _sdk_response(url, status, reason, headers, body):
+    if status >= 400:
+        raise HTTPError(url, status, reason, headers, BytesIO(body))
+    if headers.get_content_type() == "application/gzip":
+        return {"status": status, "headers": headers, "body": body}
+    return {"status": status, "headers": headers, "body": body.decode(headers.get_content_charset() or "utf-8")}
+
+
+class PooledTransport:
+    def __init__(self, pool):
+        self.pool = pool
+
+    def perform(self, client, url, request):
+        status, reason, headers, body = self.pool.request(url, request.data, dict(request.header_items()), client.ssl, client.timeout)
+        return _sdk_response(url, status, reason, headers, body)
+
+    def stats(self):
+        return self.pool.stats()
+
+
+# HTTP/2 through httpx, an optional dependency: pip install "httpx[http2]".
+# One multiplexed connection per host carries concurrent calls from every thread.
+class Http2Transport:
+    def __init__(self, maxsize=16, timeout=30.0, idle_timeout=60.0):
+        import httpx
+        self.httpx = httpx
+        self.client = httpx.Client(
+            http2=True,
+            timeout=timeout,
+            limits=httpx.Limits(max_keepalive_connections=maxsize, keepalive_expiry=idle_timeout)
+        )
+
+    def perform(self, client, url, request):
+        try:
+            response = self.client.post(url, content=request.data, headers=dict(request.header_items()), timeout=client.timeout)
+        except (self.httpx.ReadError, self.httpx.ReadTimeout, self.httpx.RemoteProtocolError) as e:
+            # Failed while waiting for the response, after the request was sent
+            raise ResponseLost(f"{type(e).__name__} after sending POST {urlsplit(url).path}: {e}") from e
+        headers = http.client.HTTPMessage()
+        for name, value in response.headers.multi_items():
+            headers[name] = value
+        return _sdk_response(url, response.status_code, response.reason_phrase, headers, response.content)
+
+    def stats(self):
+        return {}
+
+
+# SLACK_HTTP_TRANSPORT: "pooled" (default), "http2" or "urllib" (the SDK's own, one connection
+# per call); SLACK_HTTP_POOL_SIZE idle connections kept per host, SLACK_HTTP_TIMEOUT and
+# SLACK_HTTP_KEEPALIVE (seconds a connection may sit idle before it is dropped)
+def transport_from_env():
+    kind = os.environ.get("SLACK_HTTP_TRANSPORT", "pooled")
+    maxsize = int(os.environ.get("SLACK_HTTP_POOL_SIZE", "16"))
+    timeout = float(os.environ.get("SLACK_HTTP_TIMEOUT", "30"))
+    idle_timeout = float(os.environ.get("SLACK_HTTP_KEEPALIVE", "60"))
+    if kind == "urllib":
+        return None
+    if kind == "http2":
+        try:
+            return Http2Transport(maxsize, timeout, idle_timeout)
+        except ImportError:
+            logger.warning("SLACK_HTTP_TRANSPORT=http2 needs httpx[http2]; using pooled HTTP/1.1 connections")
+    elif kind != "pooled":
+        raise ValueError(f"Unknown SLACK_HTTP_TRANSPORT: {kind}")
+    return PooledTransport(ConnectionPool(maxsize, timeout, idle_timeout))
+
+
+# Process-wide transport shared by the app's client, the outbound queue and the backfill
+transport = transport_from_env()
+
+
+# WebClient that sends its calls through `transport` instead of a fresh urllib connection.
+# This overrides the SDK's urllib hook (slack_sdk is pinned in requirements.txt); calls
+# through a proxy keep the SDK's own transport.
+class PooledWebClient(WebClient):
+    def __init__(self, *args, transport=transport, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.transport = transport
+
+    def _perform_urllib_http_request_internal(self, url, req):
+        if self.transport is None or self.proxy is not None or not url.lower().startswith("http"):
+            return super()._perform_urllib_http_request_internal(url, req)
+        return self.transport.perform(self, url, req)
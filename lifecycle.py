@@ -0,0 +1,239 @@
+import os
+import json
+import time
+import signal
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+# Bolt's listener pool, counting the listeners still queued or running.
+# Bolt acks first and runs the rest of a listener (views.open, posting the report) here, so
+# shutdown waits on this pool for work that Slack already considers delivered.
+class DrainingExecutor(ThreadPoolExecutor):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pending = 0
+        self._idle = threading.Condition()
+
+    def submit(self, fn, /, *args, **kwargs):
+        with self._idle:
+            self._pending += 1
+        try:
+            future = super().submit(fn, *args, **kwargs)
+        except BaseException:
+            self._done(None)
+            raise
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future):
+        with self._idle:
+            self._pending -= 1
+            if not self._pending:
+                self._idle.notify_all()
+
+    # Wait up to `timeout` seconds for every listener to finish; returns how many are left
+    def drain(self, timeout):
+        deadline = time.monotonic() + timeout
+        with self._idle:
+            while self._pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._idle.wait(remaining)
+            return self._pending
+
+
+# Orderly shutdown of one Socket Mode worker on SIGTERM or SIGINT, within `timeout` seconds:
+#  1. stop reading from the Socket Mode connection, without reconnecting,
+#  2. wait for the envelopes already read to be acked (at most `ack_grace`), then close it;
+#     Slack sends new envelopes to the app's other connections,
+#  3. wait for listeners to finish their work after ack,
+#  4. run the shutdown hooks in order, e.g. drain the outbound queue and flush the store.
+# Closing the socket while acks are still being sent would fail them; only envelopes Slack
+# sends in the moment between steps 1 and 2 go unread. workers.run_workers connects a
+# replacement before it stops a worker.
+class Lifecycle:
+    def __init__(self, timeout=20.0, ack_grace=3.0, listener_threads=5):
+        self.timeout = timeout
+        self.ack_grace = ack_grace
+        self.executor = DrainingExecutor(max_workers=listener_threads, thread_name_prefix="bolt-listener")
+        self.stopping = threading.Event()
+        # Ids of envelopes received and not acked yet
+        self._unacked = set()
+        self._lock = threading.Lock()
+        self._hooks = []
+        self._receivers = []
+
+    # SHUTDOWN_TIMEOUT, SHUTDOWN_ACK_GRACE (seconds)
+    @classmethod
+    def from_env(cls):
+        return cls(
+            timeout=float(os.environ.get("SHUTDOWN_TIMEOUT", "20")),
+            ack_grace=float(os.environ.get("SHUTDOWN_ACK_GRACE", "3"))
+        )
+
+    def _received(self, message):
+        envelope = json.loads(message)
+        envelope_id = envelope.get("envelope_id")
+        if envelope_id is not None:
+            with self._lock:
+                self._unacked.add(envelope_id)
+        for receiver in self._receivers:
+            receiver(envelope)
+
+    def _acked(self, response):
+        envelope_id = response.envelope_id if hasattr(response, "envelope_id") else response.get("envelope_id")
+        with self._lock:
+            self._unacked.discard(envelope_id)
+
+    # Follow every envelope of a Socket Mode client from the moment it is read to its ack,
+    # including those queued inside the client that Bolt has not dispatched yet
+    def track(self, client):
+        enqueue_message, send_socket_mode_response = client.enqueue_message, client.send_socket_mode_response
+
+        def enqueue(message):
+            self._received(message)
+            return enqueue_message(message)
+
+        def send_response(response):
+            try:
+                return send_socket_mode_response(response)
+            finally:
+                self._acked(response)
+
+        client.enqueue_message, client.send_socket_mode_response = enqueue, send_response
+
+    def track_async(self, client):
+        enqueue_message, send_socket_mode_response = client.enqueue_message, client.send_socket_mode_response
+
+        async def enqueue(message):
+            self._received(message)
+            return await enqueue_message(message)
+
+        async def send_response(response):
+            try:
+                return await send_socket_mode_response(response)
+            finally:
+                self._acked(response)
+
+        client.enqueue_message, client.send_socket_mode_response = enqueue, send_response
+
+    # Call receiver(envelope) for every envelope as it is read, before it waits for a worker
+    def on_receive(self, receiver):
+        self._receivers.append(receiver)
+
+    # Call hook(seconds_left) once listeners have finished; hooks run in registration order
+    def on_shutdown(self, name, hook):
+        self._hooks.append((name, hook))
+
+    def request_stop(self, signum=None, frame=None):
+        if not self.stopping.is_set():
+            logger.info(f"Shutting down within {self.timeout:.0f}s")
+        self.stopping.set()
+
+    def _remaining(self, deadline):
+        return max(0.0, deadline - time.monotonic())
+
+    def _run_hooks(self, deadline):
+        for name, hook in self._hooks:
+            try:
+                hook(self._remaining(deadline))
+            except Exception:
+                logger.exception(f"Shutdown hook {name} failed")
+
+    # Connect, report readiness through `ready` (an Event set once connected), then serve
+    # until SIGTERM or SIGINT and shut down
+    def serve(self, handler, ready=None):
+        signal.signal(signal.SIGTERM, self.request_stop)
+        signal.signal(signal.SIGINT, self.request_stop)
+        # SIGHUP is the master's reload signal (workers.run_workers); a worker that gets it
+        # too, e.g. sent to the whole process group, keeps serving
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        self.track(handler.client)
+        handler.connect()
+        logger.info("Socket Mode connection open")
+        if ready is not None:
+            ready.set()
+        while not self.stopping.wait(1.0):
+            pass
+        self.shutdown(handler)
+
+    # Close the builtin client's connection once the envelopes read from it are acked.
+    # The SDK's disconnect() holds the send lock while it waits for the reader, which blocks
+    # the acks of whatever the reader still hands over; so the reader is paused first, through
+    # the session's receive lock (slack_sdk is pinned in requirements.txt).
+    def _close_connection(self, client, ack_deadline):
+        client.auto_reconnect_enabled = False
+        session = client.current_session
+        if session is not None and session.sock_receive_lock.acquire(timeout=self._remaining(ack_deadline)):
+            try:
+                while self._unacked and time.monotonic() < ack_deadline:
+                    time.sleep(0.01)
+                with session.sock_send_lock:
+                    if session.sock is not None:
+                        session.sock.close()
+                        session.sock = None
+            finally:
+                session.sock_receive_lock.release()
+        client.disconnect()
+
+    def shutdown(self, handler):
+        started = time.monotonic()
+        deadline = started + self.timeout
+        self._close_connection(handler.client, min(deadline, started + self.ack_grace))
+        if self._unacked:
+            logger.warning(f"{len(self._unacked)} envelopes left without ack")
+        left = self.executor.drain(self._remaining(deadline))
+        if left:
+            logger.warning(f"{left} listeners still running at the shutdown deadline")
+        self._run_hooks(deadline)
+        # Joins the client's threads, which takes a few seconds; nothing is received by now
+        handler.close()
+        logger.info(f"Shut down in {time.monotonic() - started:.1f}s")
+
+    async def serve_async(self, handler, ready=None):
+        loop = asyncio.get_running_loop()
+        stopping = asyncio.Event()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signum, stopping.set)
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        self.track_async(handler.client)
+        await handler.connect_async()
+        logger.info("Socket Mode connection open")
+        if ready is not None:
+            ready.set()
+        await stopping.wait()
+        self.request_stop()
+        await self.shutdown_async(handler)
+
+    async def shutdown_async(self, handler):
+        started = time.monotonic()
+        deadline = started + self.timeout
+        ack_deadline = min(deadline, started + self.ack_grace)
+        client = handler.client
+        client.auto_reconnect_enabled = False
+        # Stop reading; the session stays open for the acks of envelopes already read
+        if client.message_receiver is not None:
+            client.message_receiver.cancel()
+        while self._unacked and time.monotonic() < ack_deadline:
+            await asyncio.sleep(0.01)
+        if self._unacked:
+            logger.warning(f"{len(self._unacked)} envelopes left without ack")
+        await handler.close_async()
+        # Listeners run as tasks after ack
+        tasks = asyncio.all_tasks() - {asyncio.current_task()}
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=self._remaining(deadline))
+            if pending:
+                logger.warning(f"{len(pending)} tasks still running at the shutdown deadline")
+        await asyncio.get_running_loop().run_in_executor(None, self._run_hooks, deadline)
+        logger.info(f"Shut down in {time.monotonic() - started:.1f}s")
+
+
+# Shared by the sync and async apps
+lifecycle = Lifecycle.from_env()
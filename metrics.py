@@ -0,0 +1,241 @@
+import os
+import time
+import errno
+import logging
+import functools
+import threading
+import inspect
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds; 3s is Slack's ack / trigger_id deadline
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0)
+
+
+def _label_text(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"' for name, value in labels) + "}"
+
+
+class Histogram:
+    def __init__(self, name, help, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def samples(self):
+        with self._lock:
+            series = {key: list(values) for key, values in self._series.items()}
+        for key, values in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), values):
+                cumulative += count
+                yield f"{self.name}_bucket{_label_text(key + (('le', bound),))} {cumulative}"
+            yield f"{self.name}_sum{_label_text(key)} {values[-1]}"
+            yield f"{self.name}_count{_label_text(key)} {cumulative}"
+
+    def render(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"] + list(self.samples())
+
+
+class Counter:
+    def __init__(self, name, help):
+        self.name = name
+        self.help = help
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"] + [
+            f"{self.name}{_label_text(key)} {value}" for key, value in values
+        ]
+
+
+# Process-wide metrics registry with a Prometheus text exposition.
+# When disabled, the decorators hand back the undecorated function and observe() calls
+# are skipped behind a single attribute check, so instrumentation costs next to nothing.
+class Metrics:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.listener_duration = Histogram("slack_listener_duration_seconds", "Time spent in each Bolt listener")
+        self.listener_calls = Counter("slack_listener_calls_total", "Listener invocations by outcome")
+        self.acks = Counter("slack_acks_total", "ack() calls made by each listener")
+        self.api_duration = Histogram("slack_api_duration_seconds", "Slack Web API call latency by method, excluding rate limiter waits")
+        self.api_errors = Counter("slack_api_errors_total", "Failed Slack Web API calls by method")
+        self.store_duration = Histogram("slack_store_duration_seconds", "Reminder/report store operation latency")
+        self._collectors = []
+
+    # Time a listener, count its outcome and its ack() calls.
+    # Bolt injects arguments by name and follows __wrapped__, so the wrapper keeps the signature.
+    def listener(self, func):
+        if not self.enabled:
+            return func
+        name = func.__name__
+
+        def counted_ack(kwargs):
+            ack = kwargs.get("ack")
+            if ack is None:
+                return
+            if inspect.iscoroutinefunction(func):
+                async def async_ack(*args, **ack_kwargs):
+                    self.acks.inc(listener=name)
+                    return await ack(*args, **ack_kwargs)
+                kwargs["ack"] = async_ack
+            else:
+                def sync_ack(*args, **ack_kwargs):
+                    self.acks.inc(listener=name)
+                    return ack(*args, **ack_kwargs)
+                kwargs["ack"] = sync_ack
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(**kwargs):
+                counted_ack(kwargs)
+                started = time.perf_counter()
+                outcome = "error"
+                try:
+                    result = await func(**kwargs)
+                    outcome = "ok"
+                    return result
+                finally:
+                    self.listener_duration.observe(time.perf_counter() - started, listener=name)
+                    self.listener_calls.inc(listener=name, outcome=outcome)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(**kwargs):
+            counted_ack(kwargs)
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                result = func(**kwargs)
+                outcome = "ok"
+                return result
+            finally:
+                self.listener_duration.observe(time.perf_counter() - started, listener=name)
+                self.listener_calls.inc(listener=name, outcome=outcome)
+        return wrapper
+
+    # Time a store operation
+    def store_operation(self, operation):
+        def decorator(func):
+            if not self.enabled:
+                return func
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.store_duration.observe(time.perf_counter() - started, operation=operation)
+            return wrapper
+        return decorator
+
+    def observe_api_call(self, method, seconds, error=None):
+        self.api_duration.observe(seconds, method=method)
+        if error is not None:
+            self.api_errors.inc(method=method, error=error)
+
+    # Register a callable returning {metric_name: value or {label_value: value}} gauges,
+    # read at scrape time (queue depths, prefilter counts, ...)
+    def add_collector(self, prefix, collect, label="kind"):
+        self._collectors.append((prefix, collect, label))
+
+    def render(self):
+        lines = []
+        for metric in (self.listener_duration, self.listener_calls, self.acks, self.api_duration, self.api_errors, self.store_duration):
+            lines.extend(metric.render())
+        for prefix, collect, label in self._collectors:
+            try:
+                values = collect()
+            except Exception:
+                logger.exception(f"Metrics collector {prefix} failed")
+                continue
+            for name, value in sorted(values.items()):
+                if isinstance(value, dict):
+                    lines.append(f"# TYPE {prefix}_{name} gauge")
+                    lines.extend(f"{prefix}_{name}{_label_text(((label, key),))} {inner}" for key, inner in sorted(value.items()) if isinstance(inner, (int, float)))
+                elif isinstance(value, (int, float)):
+                    lines.append(f"# TYPE {prefix}_{name} gauge")
+                    lines.append(f"{prefix}_{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    # Serve /metrics on a local port from a daemon thread
+    def serve(self, port, address="127.0.0.1"):
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((address, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        logger.info(f"Serving metrics on http://{address}:{server.server_address[1]}/metrics")
+        return server
+
+    # METRICS_PORT is offset by the worker index so each Socket Mode worker gets its own port
+    def serve_from_env(self, worker_index=0):
+        if not self.enabled:
+            return None
+        port = int(os.environ.get("METRICS_PORT", "9108")) + worker_index
+        address = os.environ.get("METRICS_ADDRESS", "127.0.0.1")
+        try:
+            return self.serve(port, address)
+        except OSError as error:
+            if error.errno != errno.EADDRINUSE:
+                raise
+        # During a rolling reload the worker being replaced holds the port until it has drained
+        logger.info(f"Metrics port {port} is in use, serving once it is free")
+        threading.Thread(target=self._serve_when_free, args=(port, address), name="metrics-http-wait", daemon=True).start()
+        return None
+
+    def _serve_when_free(self, port, address, interval=1.0):
+        while True:
+            time.sleep(interval)
+            try:
+                self.serve(port, address)
+                return
+            except OSError as error:
+                if error.errno != errno.EADDRINUSE:
+                    logger.exception(f"Cannot serve metrics on port {port}")
+                    return
+
+
+# METRICS_ENABLED=true turns instrumentation on; it is decided once at import time
+metrics = Metrics(enabled=os.environ.get("METRICS_ENABLED", "false") == "true")
@@ -0,0 +1,94 @@
+import os
+import time
+import logging
+from views import TEAM_NAMES
+from reports import nudge_message_blocks
+
+logger = logging.getLogger(__name__)
+
+# REMINDER_CHANNEL_TEAMS ("C123=Core|Titan,...") narrows the teams expected to report in a
+# channel; channels not listed expect every team in the modals' team_name options
+CHANNEL_TEAMS = dict(
+    (channel_id.strip(), [team.strip() for team in teams.split("|") if team.strip()])
+    for channel_id, _, teams in (
+        item.partition("=") for item in os.environ.get("REMINDER_CHANNEL_TEAMS", "").split(",") if "=" in item
+    )
+)
+
+
+# Nudges teams that have not reported some time after a channel's reminder.
+# Each stored reminder schedules one job per channel (a newer reminder replaces it); when it
+# fires, the reports filed in the reminder thread are compared with the expected teams and a
+# single message listing everyone missing is queued for the thread.
+class NudgeTracker:
+    def __init__(self, store, outbound, scheduler, delay=7200.0, report_types=("ba", "qa"), grace=3600.0, channel_teams=CHANNEL_TEAMS):
+        self.store = store
+        self.outbound = outbound
+        self.scheduler = scheduler
+        self.delay = delay
+        self.report_types = report_types
+        # Nudges due longer ago than this (e.g. while the app was down) are dropped
+        self.grace = grace
+        self.channel_teams = channel_teams
+
+    # NUDGE_DELAY_SECONDS, NUDGE_REPORT_TYPES, NUDGE_GRACE_SECONDS
+    @classmethod
+    def from_env(cls, store, outbound, scheduler):
+        return cls(
+            store,
+            outbound,
+            scheduler,
+            delay=float(os.environ.get("NUDGE_DELAY_SECONDS", "7200")),
+            report_types=tuple(item.strip() for item in os.environ.get("NUDGE_REPORT_TYPES", "ba,qa").split(",") if item.strip()),
+            grace=float(os.environ.get("NUDGE_GRACE_SECONDS", "3600"))
+        )
+
+    def expected_teams(self, channel_id):
+        return self.channel_teams.get(channel_id) or TEAM_NAMES
+
+    def reminder_stored(self, channel_id, message_ts):
+        due = float(message_ts) + self.delay
+        if time.time() - due > self.grace:
+            return
+        self.scheduler.schedule(due, ("nudge", channel_id), self.nudge, channel_id, message_ts)
+
+    # Schedule nudges for the reminders already in the store, e.g. after a restart
+    def schedule_stored(self):
+        for channel_id, message_ts in self.store.get_reminders():
+            self.reminder_stored(channel_id, message_ts)
+
+    # {report_type: [teams]} still missing from the reminder thread; None if the store keeps no reports
+    def missing_teams(self, channel_id, thread_ts):
+        reported = self.store.get_reported_teams(channel_id, thread_ts)
+        if reported is None:
+            return None
+        missing = {}
+        for report_type in self.report_types:
+            teams = [team for team in self.expected_teams(channel_id) if team not in reported.get(report_type, ())]
+            if teams:
+                missing[report_type] = teams
+        return missing
+
+    def nudge(self, channel_id, message_ts):
+        _, current_ts = self.store.get_reminder(channel_id)
+        if current_ts != message_ts:
+            return
+        # Every worker schedules the stored reminders on startup; only one of them nudges
+        if not self.store.claim(f"nudge:{channel_id}:{message_ts}"):
+            return
+
+        missing = self.missing_teams(channel_id, message_ts)
+        if missing is None:
+            logger.info(f"Not nudging {channel_id}: the storage backend keeps no reports")
+            return
+        if not missing:
+            logger.info(f"Every team has reported in {channel_id}")
+            return
+
+        logger.info(f"Nudging {channel_id} about {sum(len(teams) for teams in missing.values())} missing reports")
+        self.outbound.post_message(
+            channel=channel_id,
+            blocks=nudge_message_blocks(missing),
+            text="Reports still missing",
+            thread_ts=message_ts
+        )
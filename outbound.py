@@ -0,0 +1,212 @@
+import os
+import sys
+import json
+import time
+import queue
+import random
+import atexit
+import logging
+import threading
+from collections import Counter
+from slack_sdk import WebClient
+from slack_sdk.errors import SlackApiError
+from http_transport import ResponseLost
+
+logger = logging.getLogger(__name__)
+
+# Slack errors worth retrying; anything else goes straight to the dead-letter file
+RETRYABLE_ERRORS = {"ratelimited", "internal_error", "fatal_error", "service_unavailable", "request_timeout"}
+
+
+# Header names arrive lowercased over HTTP/2 and from aiohttp, capitalized over HTTP/1.1
+def _header(headers, name, default=None):
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return default
+
+
+# Queue of outbound chat.postMessage calls served by a bounded pool of worker threads,
+# so interaction handlers can ack and return without waiting on Slack.
+# 429s are retried after Retry-After, transient failures with exponential backoff; calls that
+# still fail (or cannot be queued) are appended to a JSON-lines dead-letter file. A post whose
+# response was lost may already be in the channel, so it is dead-lettered rather than resent.
+class OutboundQueue:
+    def __init__(self, client, workers=4, maxsize=10000, max_attempts=5, base_delay=1.0, max_delay=60.0, dead_letter_path="outbound_dead_letter.jsonl"):
+        self.client = client
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.dead_letter_path = dead_letter_path
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._threads = []
+        self._timers = set()
+        self._lock = threading.Lock()
+        self._counts = Counter()
+        self._stopped = False
+
+    @classmethod
+    def from_env(cls, client):
+        return cls(
+            client,
+            workers=int(os.environ.get("OUTBOUND_WORKERS", "4")),
+            maxsize=int(os.environ.get("OUTBOUND_QUEUE_SIZE", "10000")),
+            max_attempts=int(os.environ.get("OUTBOUND_MAX_ATTEMPTS", "5")),
+            dead_letter_path=os.environ.get("OUTBOUND_DEAD_LETTER_FILE", "outbound_dead_letter.jsonl")
+        )
+
+    def start(self):
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"outbound-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        atexit.register(self.close)
+        return self
+
+    def post_message(self, **kwargs):
+        self._enqueue({"method": "chat.postMessage", "kwargs": kwargs, "attempts": 0})
+
+    # Post several messages (kwargs dicts) in order, e.g. the parts of a long notification.
+    # They travel as one item, so no part is posted before the one ahead of it has been.
+    def post_messages(self, messages):
+        self._enqueue({"method": "chat.postMessage", "kwargs": messages[0], "rest": list(messages[1:]), "attempts": 0})
+
+    def _enqueue(self, item):
+        if self._stopped:
+            return self._dead_letter(item, "shutting_down")
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self._dead_letter(item, "queue_full")
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._send(item)
+            except Exception:
+                # Keep the worker alive whatever happened to this item
+                logger.exception(f"Outbound worker failed on {item['method']}")
+            finally:
+                self._queue.task_done()
+
+    # Send the item's message, then any messages queued behind it in the same item; a failure
+    # retries or dead-letters the rest of the item from the message that failed
+    def _send(self, item):
+        while True:
+            item["attempts"] += 1
+            try:
+                self.client.api_call(item["method"], json=item["kwargs"])
+            except SlackApiError as e:
+                error = e.response.get("error")
+                if e.response.status_code == 429:
+                    return self._retry(item, error, float(_header(e.response.headers, "Retry-After", self.base_delay)))
+                if e.response.status_code >= 500 or error in RETRYABLE_ERRORS:
+                    return self._retry(item, error)
+                return self._dead_letter(item, error)
+            except ResponseLost as e:
+                return self._dead_letter(item, f"response_lost: {e}")
+            except (OSError, TimeoutError) as e:
+                return self._retry(item, repr(e))
+            except Exception as e:
+                # Protocol errors (IncompleteRead, BadStatusLine), SlackRequestError, httpx errors:
+                # not known to be safe to resend, so kept for replay
+                return self._dead_letter(item, f"{type(e).__name__}: {e}")
+
+            with self._lock:
+                self._counts["sent"] += 1
+            if not item.get("rest"):
+                return
+            item["kwargs"], item["rest"], item["attempts"] = item["rest"][0], item["rest"][1:], 0
+
+    def _retry(self, item, error, delay=None):
+        if item["attempts"] >= self.max_attempts or self._stopped:
+            return self._dead_letter(item, error)
+
+        if delay is None:
+            delay = min(self.max_delay, self.base_delay * 2 ** (item["attempts"] - 1))
+            delay *= random.uniform(0.8, 1.2)
+        logger.info(f"Retrying {item['method']} in {delay:.1f}s after {error} (attempt {item['attempts']})")
+        with self._lock:
+            self._counts["retried"] += 1
+
+        timer = threading.Timer(delay, self._requeue, (item,))
+        timer.daemon = True
+        with self._lock:
+            self._timers.add(timer)
+        timer.start()
+
+    def _requeue(self, item):
+        with self._lock:
+            if threading.current_thread() not in self._timers:
+                # close() already took this retry over and dead-lettered it
+                return
+            self._timers.discard(threading.current_thread())
+        self._enqueue(item)
+
+    def _dead_letter(self, item, error):
+        record = dict(item, error=error, failed_at=time.time())
+        logger.error(f"Dead-lettering {item['method']} to {item['kwargs'].get('channel')}: {error}")
+        with self._lock:
+            self._counts["dead_lettered"] += 1
+            with open(self.dead_letter_path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+
+    # Move dead-lettered calls back onto the queue; returns how many were requeued
+    def requeue_dead_letters(self):
+        with self._lock:
+            try:
+                with open(self.dead_letter_path, "r") as f:
+                    records = [json.loads(line) for line in f if line.strip()]
+            except FileNotFoundError:
+                return 0
+            os.remove(self.dead_letter_path)
+
+        for record in records:
+            self._enqueue({"method": record["method"], "kwargs": record["kwargs"], "rest": record.get("rest", []), "attempts": 0})
+        return len(records)
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self._counts, pending_retries=len(self._timers))
+        counts["queue_depth"] = self._queue.qsize()
+        return counts
+
+    # Drain queued calls until the deadline; whatever is still queued or waiting for a
+    # retry is dead-lettered so a restart can replay it
+    def close(self, timeout=10.0):
+        if self._stopped:
+            return
+        deadline = time.monotonic() + timeout
+        while (self._queue.unfinished_tasks or self._timers) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self._stopped = True
+
+        with self._lock:
+            timers, self._timers = self._timers, set()
+        for timer in timers:
+            timer.cancel()
+            self._dead_letter(timer.args[0], "shutting_down")
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self._dead_letter(item, "shutting_down")
+            self._queue.task_done()
+        for _ in self._threads:
+            self._queue.put(None)
+
+
+# Replay the dead-letter file: python outbound.py replay
+if __name__ == "__main__":
+    if sys.argv[1:] != ["replay"]:
+        sys.exit("usage: python outbound.py replay")
+    logging.basicConfig(level=logging.INFO)
+    outbound = OutboundQueue.from_env(WebClient(token=os.environ.get("SLACK_BOT_TOKEN"), base_url=os.environ.get("SLACK_API_URL", WebClient.BASE_URL))).start()
+    print(f"Requeued {outbound.requeue_dead_letters()} messages")
+    outbound.close(timeout=60)
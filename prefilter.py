@@ -0,0 +1,91 @@
+import os
+import re
+import threading
+from collections import Counter
+from slack_bolt.response import BoltResponse
+
+# Subtypes that never carry a new reminder
+IGNORED_SUBTYPES = (
+    "message_changed",
+    "message_deleted",
+    "message_replied",
+    "channel_join",
+    "channel_leave",
+    "channel_topic",
+    "channel_purpose",
+    "channel_name"
+)
+
+
+def _env_list(name, default=()):
+    value = os.environ.get(name)
+    if value is None:
+        return list(default)
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+# Global middleware that drops message events which cannot be reminders before Bolt
+# dispatches them to listeners. Dropped events are still acked with a 200.
+# Empty channel/sender allow-lists accept everything.
+class MessagePrefilter:
+    def __init__(self, channels=(), senders=(), ignored_subtypes=IGNORED_SUBTYPES, keywords=("reminder",)):
+        self.channels = frozenset(channels)
+        self.senders = frozenset(senders)
+        self.ignored_subtypes = frozenset(ignored_subtypes)
+        self.keyword_pattern = re.compile("|".join(re.escape(keyword) for keyword in keywords), re.IGNORECASE) if keywords else None
+        self._counts = Counter()
+        self._lock = threading.Lock()
+
+    # Configure from REMINDER_CHANNELS, REMINDER_SENDERS, PREFILTER_IGNORED_SUBTYPES and REMINDER_KEYWORDS
+    @classmethod
+    def from_env(cls):
+        return cls(
+            channels=_env_list("REMINDER_CHANNELS"),
+            senders=_env_list("REMINDER_SENDERS"),
+            ignored_subtypes=_env_list("PREFILTER_IGNORED_SUBTYPES", IGNORED_SUBTYPES),
+            keywords=_env_list("REMINDER_KEYWORDS", ("reminder",))
+        )
+
+    # Reason for dropping the event, or None if it should reach the listeners
+    def drop_reason(self, event):
+        if event.get("subtype") in self.ignored_subtypes:
+            return "subtype"
+        if self.channels and event.get("channel") not in self.channels:
+            return "channel"
+        if self.senders and event.get("bot_id") not in self.senders and event.get("user") not in self.senders:
+            return "sender"
+        if self.keyword_pattern is not None and not self.keyword_pattern.search(event.get("text") or ""):
+            return "keyword"
+        return None
+
+    def _check(self, body):
+        event = body.get("event")
+        if body.get("type") != "event_callback" or not event or event.get("type") != "message":
+            return True
+
+        reason = self.drop_reason(event)
+        with self._lock:
+            if reason is None:
+                self._counts["processed"] += 1
+            else:
+                self._counts["dropped"] += 1
+                self._counts[f"dropped_{reason}"] += 1
+        return reason is None
+
+    def middleware(self, body, next):
+        if not self._check(body):
+            return BoltResponse(status=200, body="")
+        return next()
+
+    async def async_middleware(self, body, next):
+        if not self._check(body):
+            return BoltResponse(status=200, body="")
+        return await next()
+
+    # Counts of processed and dropped message events, with drops broken down by reason
+    def stats(self):
+        with self._lock:
+            counts = dict(self._counts)
+        counts.setdefault("processed", 0)
+        counts.setdefault("dropped", 0)
+        return counts
@@ -0,0 +1,235 @@
+import os
+import time
+import asyncio
+import logging
+import threading
+from collections import Counter, defaultdict
+from slack_sdk.web.async_client import AsyncWebClient
+from slack_sdk.errors import SlackApiError
+from metrics import metrics
+from http_transport import PooledWebClient
+
+logger = logging.getLogger(__name__)
+
+# Requests per minute for each Slack rate limit tier
+TIER_LIMITS = {1: 1, 2: 20, 3: 50, 4: 100}
+
+# Tier of each method the app calls; anything unlisted is treated as Tier 3.
+# chat.postMessage has no tier: Slack limits it per channel (see RateLimiter).
+METHOD_TIERS = {
+    "apps.connections.open": 1,
+    "auth.test": 4,
+    "conversations.history": 3,
+    "conversations.list": 2,
+    "users.conversations": 3,
+    "views.open": 4,
+    "views.push": 4,
+    "views.update": 4
+}
+
+# Methods never delayed client-side. views.* must reach Slack within the 3 seconds a
+# trigger_id is valid, and a Socket Mode reconnect must not queue a minute for its Tier 1
+# token; Slack's own 429 still applies to them, and the caller sees it as an error at once.
+UNPACED_METHODS = {"views.open", "views.push", "views.update", "apps.connections.open"}
+
+
+# Token bucket that hands out reservations: callers are told how long to wait for their
+# token instead of being refused, so bursts are spread out in arrival order.
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    # Take a token and return the seconds to wait before using it
+    def reserve(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+# Client-side pacing for every outbound Web API call in the process.
+# Each method gets a bucket sized for its tier, except chat.postMessage, which is paced per
+# channel only (1 message per second, with a small burst allowance) so that posts to different
+# channels never queue behind each other; `post_rate` (posts per second, with `post_burst`)
+# optionally caps posts across all channels as well.
+class RateLimiter:
+    def __init__(self, channel_rate=1.0, channel_burst=3, post_rate=None, post_burst=10):
+        self.channel_rate = channel_rate
+        self.channel_burst = channel_burst
+        self._post_bucket = TokenBucket(post_rate, post_burst) if post_rate else None
+        self._method_buckets = {}
+        self._channel_buckets = {}
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._counts = Counter()
+        self._wait_seconds = defaultdict(float)
+        self._max_wait = defaultdict(float)
+
+    def _method_bucket(self, method):
+        bucket = self._method_buckets.get(method)
+        if bucket is None:
+            limit = TIER_LIMITS[METHOD_TIERS.get(method, 3)]
+            with self._lock:
+                bucket = self._method_buckets.setdefault(method, TokenBucket(limit / 60.0, max(1, limit // 10)))
+        return bucket
+
+    def _channel_bucket(self, channel):
+        bucket = self._channel_buckets.get(channel)
+        if bucket is None:
+            with self._lock:
+                bucket = self._channel_buckets.setdefault(channel, TokenBucket(self.channel_rate, self.channel_burst))
+        return bucket
+
+    # Seconds the caller has to wait before making the call
+    def reserve(self, method, channel=None):
+        if method in UNPACED_METHODS:
+            with self._lock:
+                self._counts[method] += 1
+            return 0.0
+        if method == "chat.postMessage":
+            wait = self._channel_bucket(channel).reserve() if channel else 0.0
+            if self._post_bucket is not None:
+                wait = max(wait, self._post_bucket.reserve())
+        else:
+            wait = self._method_bucket(method).reserve()
+        with self._lock:
+            self._counts[method] += 1
+            if wait > 0:
+                self._counts[f"{method}:delayed"] += 1
+                self._wait_seconds[method] += wait
+                self._max_wait[method] = max(self._max_wait[method], wait)
+        return wait
+
+    def _waiting_changed(self, delta):
+        with self._lock:
+            self._waiting += delta
+
+    def acquire(self, method, channel=None):
+        wait = self.reserve(method, channel)
+        if wait > 0:
+            self._waiting_changed(1)
+            try:
+                time.sleep(wait)
+            finally:
+                self._waiting_changed(-1)
+
+    async def acquire_async(self, method, channel=None):
+        wait = self.reserve(method, channel)
+        if wait > 0:
+            self._waiting_changed(1)
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                self._waiting_changed(-1)
+
+    # Calls currently waiting for a token, plus per-method call/delay counts and wait times
+    def stats(self):
+        with self._lock:
+            return {
+                "waiting": self._waiting,
+                "methods": {
+                    method: {
+                        "calls": self._counts[method],
+                        "delayed": self._counts[f"{method}:delayed"],
+                        "wait_seconds_total": round(self._wait_seconds[method], 3),
+                        "wait_seconds_max": round(self._max_wait[method], 3)
+                    }
+                    for method in list(self._counts) if ":" not in method
+                }
+            }
+
+    # Flat gauges for the metrics endpoint
+    def gauges(self):
+        stats = self.stats()
+        return {
+            "waiting": stats["waiting"],
+            "calls": {method: values["calls"] for method, values in stats["methods"].items()},
+            "delayed_calls": {method: values["delayed"] for method, values in stats["methods"].items()},
+            "wait_seconds_total": {method: values["wait_seconds_total"] for method, values in stats["methods"].items()}
+        }
+
+
+# Shared by every client in the process so all outbound calls draw from the same buckets.
+# SLACK_POST_RATE (posts per second across all channels) is unset by default: no cap.
+limiter = RateLimiter(
+    channel_rate=float(os.environ.get("SLACK_CHANNEL_POST_RATE", "1")),
+    channel_burst=int(os.environ.get("SLACK_CHANNEL_POST_BURST", "3")),
+    post_rate=float(os.environ.get("SLACK_POST_RATE", "0")) or None,
+    post_burst=int(os.environ.get("SLACK_POST_BURST", "10"))
+)
+
+
+def _channel_of(kwargs):
+    for key in ("json", "data", "params"):
+        args = kwargs.get(key)
+        if args and args.get("channel"):
+            return args["channel"]
+    return None
+
+
+# Label for a failed call: Slack's error code, or the exception type for transport failures
+def _error_of(exception):
+    if isinstance(exception, SlackApiError):
+        return exception.response.get("error") or str(exception.response.status_code)
+    return type(exception).__name__
+
+
+# WebClient that waits for the shared limiter before every API call (limiter=None leaves
+# pacing to Slack's 429s); requests go over the process-wide keep-alive connection pool
+# (see http_transport.py)
+class RateLimitedWebClient(PooledWebClient):
+    def __init__(self, *args, limiter=limiter, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.limiter = limiter
+
+    def api_call(self, api_method, **kwargs):
+        if self.limiter is not None:
+            self.limiter.acquire(api_method, _channel_of(kwargs))
+        if not metrics.enabled:
+            return super().api_call(api_method, **kwargs)
+        started = time.perf_counter()
+        error = None
+        try:
+            return super().api_call(api_method, **kwargs)
+        except Exception as e:
+            error = _error_of(e)
+            raise
+        finally:
+            metrics.observe_api_call(api_method, time.perf_counter() - started, error)
+
+    # Global middleware: Bolt builds a fresh client per request, so hand listeners this
+    # client instead to keep their calls behind the limiter
+    def middleware(self, context, next):
+        context["client"] = self
+        return next()
+
+
+class AsyncRateLimitedWebClient(AsyncWebClient):
+    def __init__(self, *args, limiter=limiter, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.limiter = limiter
+
+    async def api_call(self, api_method, **kwargs):
+        if self.limiter is not None:
+            await self.limiter.acquire_async(api_method, _channel_of(kwargs))
+        if not metrics.enabled:
+            return await super().api_call(api_method, **kwargs)
+        started = time.perf_counter()
+        error = None
+        try:
+            return await super().api_call(api_method, **kwargs)
+        except Exception as e:
+            error = _error_of(e)
+            raise
+        finally:
+            metrics.observe_api_call(api_method, time.perf_counter() - started, error)
+
+    async def async_middleware(self, context, next):
+        context["client"] = self
+        return await next()
@@ -0,0 +1,74 @@
+# Fixed-field records for parsed submissions and reminders, constructed with values in field order.
+# Each class lists its fields in __slots__, so instances carry no per-record dict; item
+# access (record["team_name"], record.get(...)) is kept so the block builders and the
+# aggregator read records and plain dicts alike.
+
+
+class Record:
+    __slots__ = ()
+    _fields = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fields = frozenset(cls.__slots__)
+
+    # Values in field order; fields left out are None
+    def __init__(self, *values):
+        if len(values) > len(self.__slots__):
+            raise TypeError(f"{type(self).__name__} takes at most {len(self.__slots__)} values")
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+        for name in self.__slots__[len(values):]:
+            setattr(self, name, None)
+
+    def __getitem__(self, name):
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name) from None
+
+    def __setitem__(self, name, value):
+        if name not in self.__slots__:
+            raise KeyError(name)
+        setattr(self, name, value)
+
+    def get(self, name, default=None):
+        return getattr(self, name, default) if name in self._fields else default
+
+    def __eq__(self, other):
+        return type(other) is type(self) and self.to_tuple() == other.to_tuple()
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)})"
+
+    def to_tuple(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+# A channel's reminder message
+class ReminderRef(Record):
+    __slots__ = ("channel_id", "message_ts")
+
+
+# Parsed /report-ba submission
+class BAReport(Record):
+    __slots__ = (
+        "team_name", "date", "deliverable_tickets", "definition_of_done", "tested_tickets",
+        "spent_time", "project_status", "sprint_plan", "client_update", "why_failed", "additional_notes"
+    )
+
+
+# Parsed /report-qa submission
+class QAReport(Record):
+    __slots__ = (
+        "team_name", "date", "deliverable_tickets", "definition_of_done", "tested_tickets",
+        "defects", "spent_time", "problem", "additional_notes"
+    )
+
+
+# Parsed /notify-deploy submission
+class DeployNotice(Record):
+    __slots__ = ("project_name", "deployment_type", "deployment_version", "task_links", "additional_notes")
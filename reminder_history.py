@@ -0,0 +1,76 @@
+import os
+from reminder_window import window_for_channel
+
+# Days of reminders kept per channel for threading late reports
+DEFAULT_HISTORY_DAYS = int(os.environ.get("REMINDER_HISTORY_DAYS", "14"))
+
+
+# Local calendar day (ISO string) a channel's reminder belongs to
+def reminder_day(channel_id, message_ts):
+    return window_for_channel(channel_id).local_date(message_ts).isoformat()
+
+
+# Fixed-size ring of (day, message_ts) for one channel, ordered by day.
+# Reminders arrive in date order, so adding one normally overwrites the oldest slot;
+# lookups by day bisect over the ring's logical order.
+class ReminderHistory:
+    def __init__(self, size=DEFAULT_HISTORY_DAYS, entries=()):
+        self.size = size
+        self._days = [None] * size
+        self._timestamps = [None] * size
+        self._start = 0
+        self._count = 0
+        for day, message_ts in entries:
+            self.add(day, message_ts)
+
+    def __len__(self):
+        return self._count
+
+    # (day, message_ts) pairs, oldest first
+    def __iter__(self):
+        for i in range(self._count):
+            slot = self._slot(i)
+            yield self._days[slot], self._timestamps[slot]
+
+    def _slot(self, i):
+        return (self._start + i) % self.size
+
+    # Logical index of the first day >= `day`
+    def _bisect(self, day):
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._days[self._slot(middle)] < day:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def add(self, day, message_ts):
+        i = self._bisect(day)
+        if i < self._count and self._days[self._slot(i)] == day:
+            # The latest reminder of a day wins, as for the channel's current reminder
+            slot = self._slot(i)
+            if float(message_ts) >= float(self._timestamps[slot]):
+                self._timestamps[slot] = message_ts
+            return
+        if self._count == self.size:
+            if i == 0:
+                # Older than everything kept
+                return
+            self._start = self._slot(1)
+            self._count -= 1
+            i -= 1
+        # Shift newer entries one slot along; a no-op for the usual newest-day append
+        for j in range(self._count, i, -1):
+            self._days[self._slot(j)] = self._days[self._slot(j - 1)]
+            self._timestamps[self._slot(j)] = self._timestamps[self._slot(j - 1)]
+        self._days[self._slot(i)] = day
+        self._timestamps[self._slot(i)] = message_ts
+        self._count += 1
+
+    def get(self, day):
+        i = self._bisect(day)
+        if i < self._count and self._days[self._slot(i)] == day:
+            return self._timestamps[self._slot(i)]
+        return None
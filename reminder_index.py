@@ -0,0 +1,150 @@
+import os
+import json
+import atexit
+import logging
+import tempfile
+import threading
+from reminder_history import ReminderHistory, DEFAULT_HISTORY_DAYS
+from records import ReminderRef
+
+logger = logging.getLogger(__name__)
+
+
+# In-memory index of the latest reminder message per channel, plus a bounded history of
+# each channel's reminders by day. Lookups are served from memory; changes are flushed to disk in batches by a
+# background thread, using a temp file plus rename so the file is never half-written.
+class ReminderIndex:
+    def __init__(self, path="reminder_ts.json", flush_interval=1.0, history_days=DEFAULT_HISTORY_DAYS):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.history_days = history_days
+        self._reminders = {}
+        self._history = {}
+        self._lock = threading.Lock()
+        self._pending = False
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    # Load the reminders file once, tolerating a missing or corrupt file
+    def load(self):
+        try:
+            with open(self.path, "r") as f:
+                reminders = json.load(f)
+        except FileNotFoundError:
+            reminders = {}
+        except json.JSONDecodeError:
+            logger.warning(f"Ignoring unreadable reminder file {self.path}")
+            reminders = {}
+
+        reminders = reminders if isinstance(reminders, dict) else {}
+        with self._lock:
+            self._reminders = {
+                channel_id: ReminderRef(data["channel_id"], data["message_ts"])
+                for channel_id, data in reminders.items()
+            }
+            self._history = {
+                channel_id: ReminderHistory(self.history_days, data.get("history", ()))
+                for channel_id, data in reminders.items() if data.get("history")
+            }
+        return self
+
+    def get(self, channel_id):
+        reminder = self._reminders.get(channel_id)
+        if reminder is None:
+            return None, None
+        return reminder.channel_id, reminder.message_ts
+
+    def items(self):
+        with self._lock:
+            return [(channel_id, reminder.message_ts) for channel_id, reminder in self._reminders.items()]
+
+    # The channel's reminder for a local day (ISO string), if it is still in the history
+    def get_for_date(self, channel_id, day):
+        with self._lock:
+            history = self._history.get(channel_id)
+            return history.get(day) if history is not None else None
+
+    # (channel_id, day, message_ts) of every reminder in the history
+    def history_items(self):
+        with self._lock:
+            return [(channel_id, day, message_ts) for channel_id, history in self._history.items() for day, message_ts in history]
+
+    def set(self, channel_id, message_ts, day=None):
+        with self._lock:
+            # Ensure only one entry per channel, the newest
+            current = self._reminders.get(channel_id)
+            if current is None or float(message_ts) > float(current.message_ts):
+                self._reminders[channel_id] = ReminderRef(channel_id, message_ts)
+            if day is not None:
+                history = self._history.get(channel_id)
+                if history is None:
+                    history = self._history[channel_id] = ReminderHistory(self.history_days)
+                history.add(day, message_ts)
+            self._pending = True
+        self._wake.set()
+
+    # Start the write-behind thread and make sure pending changes hit disk on exit
+    def start(self):
+        if self._thread is not None:
+            return self
+        self._thread = threading.Thread(target=self._run, name="reminder-index-flush", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+        return self
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            # Give concurrent updates a moment to pile up so they share one write
+            self._stopped.wait(self.flush_interval)
+            try:
+                self.flush()
+            except OSError:
+                logger.exception(f"Failed to flush reminder index to {self.path}")
+
+    def flush(self):
+        with self._lock:
+            if not self._pending:
+                return
+            self._pending = False
+            snapshot = {
+                channel_id: dict(reminder.to_dict(), history=list(self._history[channel_id])) if channel_id in self._history else reminder.to_dict()
+                for channel_id, reminder in self._reminders.items()
+            }
+
+        try:
+            _atomic_write_json(self.path, snapshot)
+        except OSError:
+            # Keep the changes pending so the next flush retries them
+            with self._lock:
+                self._pending = True
+            self._wake.set()
+            raise
+
+    def close(self):
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.flush()
+
+
+# Write JSON to a temp file in the same directory and rename it over the target
+def _atomic_write_json(path, data):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".reminder_ts.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
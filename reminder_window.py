@@ -0,0 +1,87 @@
+import os
+import pytz
+from bisect import bisect_right
+from datetime import datetime, timedelta
+
+DEFAULT_TIMEZONE = "Asia/Dhaka"
+DEFAULT_CUTOFF_HOUR = 20  # 8 PM in 24-hour format
+
+
+# Decides whether a message ts falls in the evening reminder window of its local day,
+# i.e. between the cutoff hour and midnight in the configured timezone.
+# Each local day is resolved to UTC epoch bounds once, so classifying a ts is a numeric comparison.
+class ReminderWindow:
+    def __init__(self, timezone=DEFAULT_TIMEZONE, cutoff_hour=DEFAULT_CUTOFF_HOUR):
+        self.tz = pytz.timezone(timezone)
+        self.cutoff_hour = cutoff_hour
+        self._days = {}
+        # (day_start, cutoff, day_end) of the most recently used day
+        self._last = (0.0, 0.0, 0.0)
+
+    # (day_start, cutoff, day_end) epoch bounds of a local calendar day
+    def _bounds(self, day):
+        bounds = self._days.get(day)
+        if bounds is None:
+            midnight = datetime(day.year, day.month, day.day)
+            bounds = (
+                self.tz.localize(midnight).timestamp(),
+                self.tz.localize(midnight.replace(hour=self.cutoff_hour)).timestamp(),
+                self.tz.localize(midnight + timedelta(days=1)).timestamp()
+            )
+            self._days[day] = bounds
+        return bounds
+
+    # Epoch bounds [start, end) of a local calendar day
+    def day_range(self, day):
+        day_start, _, day_end = self._bounds(day)
+        return day_start, day_end
+
+    def local_time(self, ts):
+        return datetime.fromtimestamp(float(ts), tz=self.tz)
+
+    def local_date(self, ts):
+        return self.local_time(ts).date()
+
+    def is_after_cutoff(self, ts):
+        ts = float(ts)
+        day_start, cutoff, day_end = self._last
+        if not day_start <= ts < day_end:
+            day_start, cutoff, day_end = self._last = self._bounds(self.local_date(ts))
+        return ts >= cutoff
+
+    # Classify many timestamps at once, e.g. a page of channel history.
+    # Day bounds are resolved once for the whole span and each ts is placed by bisection.
+    def classify(self, timestamps):
+        values = [float(ts) for ts in timestamps]
+        if not values:
+            return []
+
+        day = self.local_date(min(values))
+        last_day = self.local_date(max(values))
+        starts, cutoffs = [], []
+        while day <= last_day:
+            day_start, cutoff, _ = self._bounds(day)
+            starts.append(day_start)
+            cutoffs.append(cutoff)
+            day += timedelta(days=1)
+
+        return [ts >= cutoffs[bisect_right(starts, ts) - 1] for ts in values]
+
+
+# REMINDER_CHANNEL_TIMEZONES ("C123=Europe/London,...") overrides the workspace-wide
+# REMINDER_TIMEZONE per channel; REMINDER_CUTOFF_HOUR applies to all of them
+CHANNEL_TIMEZONES = dict(
+    (channel_id.strip(), timezone.strip())
+    for channel_id, _, timezone in (
+        item.partition("=") for item in os.environ.get("REMINDER_CHANNEL_TIMEZONES", "").split(",") if "=" in item
+    )
+)
+_windows = {}
+
+
+def window_for_channel(channel_id):
+    timezone = CHANNEL_TIMEZONES.get(channel_id) or os.environ.get("REMINDER_TIMEZONE", DEFAULT_TIMEZONE)
+    window = _windows.get(timezone)
+    if window is None:
+        window = _windows[timezone] = ReminderWindow(timezone, int(os.environ.get("REMINDER_CUTOFF_HOUR", DEFAULT_CUTOFF_HOUR)))
+    return window
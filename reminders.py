@@ -0,0 +1,19 @@
+from reminder_window import window_for_channel
+
+
+# Store a "reminder" message as the channel's reminder if it was sent after the
+# channel's cutoff hour (8 PM Asia/Dhaka by default)
+def process_reminder_message(event, store_reminder_ts, logger):
+    text = event.get("text", "")
+
+    if "reminder" in text.lower():
+        channel_id = event.get("channel")
+        message_ts = event.get("ts")
+        window = window_for_channel(channel_id)
+
+        if window.is_after_cutoff(message_ts):
+            store_reminder_ts(channel_id, message_ts)
+            logger.info(f"Stored reminder message ts: {message_ts}")
+        else:
+            reminder_time = window.local_time(message_ts)
+            logger.info(f"Reminder received at {reminder_time.strftime('%Y-%m-%d %H:%M:%S %Z')}, not storing because it is not after {window.cutoff_hour}:00.")
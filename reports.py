@@ -0,0 +1,216 @@
+from block_templates import MessageTemplate, OptionalGroup, LineSections, escape_mrkdwn, section, line_sections
+
+# Layout of the messages posted for submitted modals.
+# Each function takes the values parsed by the matching form in views.FORMS.
+# The report and deployment layouts are prepared once as MessageTemplates (see block_templates.py).
+
+HEADER_DEPLOY = {
+  "type": "header",
+  "text": {
+    "type": "plain_text",
+    "text": ":rocket: Deployment Notification :rocket:",
+    "emoji": True
+  }
+}
+
+HEADER_REPORT = {
+  "type": "header",
+  "text": {
+    "type": "plain_text",
+    "text": ":clipboard: Deliverable Items Report :clipboard:",
+    "emoji": True
+  }
+}
+
+DIVIDER = {
+  "type": "divider"
+}
+
+
+# A divider, a bold title and the field's lines, in as many sections as Slack's text limit
+# needs (escaping, or rendering the task list, can take text past it); left out when the
+# field is empty
+def _notes(title, field):
+    return OptionalGroup(field, DIVIDER, section(title), LineSections(field))
+
+
+# task_links arrives as mrkdwn already escaped by TaskLinkProcessor.render
+DEPLOY_TEMPLATE = MessageTemplate([
+    HEADER_DEPLOY,
+    section("• Project: *{project_name}*\n• Mode: *{deployment_type}*, Version: *{deployment_version|no version}*"),
+    _notes(":memo: *Key Changes & Tasks:*", "task_links"),
+    _notes(":memo: *Additional Notes:*", "additional_notes")
+], raw=("task_links",))
+
+# project_lines are built (and escaped) by bulk_deploy_message_blocks
+BULK_DEPLOY_TEMPLATE = MessageTemplate([
+    HEADER_DEPLOY,
+    section("• Mode: *{deployment_type}*, Projects: *{project_count}*"),
+    DIVIDER,
+    LineSections("project_lines"),
+    _notes(":memo: *Key Changes & Tasks:*", "task_links"),
+    _notes(":memo: *Additional Notes:*", "additional_notes")
+], raw=("task_links", "project_lines"))
+
+BA_TEMPLATE = MessageTemplate([
+    HEADER_REPORT,
+    section("• Team: *{team_name}*\n• Date: *{date}*"),
+    DIVIDER,
+    section(":bar_chart: *Report Summary:*"),
+    section("• Deliverable Tickets: *{deliverable_tickets}*\n• Definition of Done: *{definition_of_done}*\n• Tested Tickets: *{tested_tickets}*"),
+    DIVIDER,
+    section(":chart_with_upwards_trend: *Project Status:*"),
+    section("• Update spent time sheet: *{spent_time}*\n• Update project status sheet: *{project_status}*\n• Update sprint plan sheet: *{sprint_plan}*\n• Update clients: *{client_update|not answered}*"),
+    _notes(":warning: *Why failed to done:*", "why_failed"),
+    _notes(":memo: *Additional Notes:*", "additional_notes")
+])
+
+QA_TEMPLATE = MessageTemplate([
+    HEADER_REPORT,
+    section("• Team: *{team_name}*\n• Date: *{date}*"),
+    DIVIDER,
+    section(":bar_chart: *Report Summary:*"),
+    section("• Deliverable Tickets: *{deliverable_tickets}*\n• Definition of Done: *{definition_of_done}*\n• Tested Tickets: *{tested_tickets}*\n• Defects: *{defects}*"),
+    DIVIDER,
+    section(":chart_with_upwards_trend: *Project Status:*"),
+    section("• Update Actual in Spent Time Sheet: *{spent_time}*"),
+    _notes(":warning: *Problems of the team:*", "problem"),
+    _notes(":memo: *Additional Notes:*", "additional_notes")
+])
+
+
+# Blocks for the deployment notification posted by /notify-deploy
+def deploy_message_blocks(report):
+    return DEPLOY_TEMPLATE.render(report)
+
+
+# Blocks for the deliverable items report posted by /report-ba
+def ba_message_blocks(report):
+    return BA_TEMPLATE.render(report)
+
+
+# Blocks for the deliverable items report posted by /report-qa
+def qa_message_blocks(report):
+    return QA_TEMPLATE.render(report)
+
+
+def _percent(ratio):
+    return "n/a" if ratio is None else f"{ratio:.0%}"
+
+
+def _points(delta):
+    return "" if delta is None else f" ({delta * 100:+.0f} pts)"
+
+
+# One line per team for /report-summary
+def _summary_line(team, rollup, report_type):
+    day, week = rollup["day"], rollup["week"]
+    if week is None:
+        return f"• *{team}*: no reports this week"
+    line = f"• *{team}*: "
+    if day is not None:
+        line += f"today {day['definition_of_done']}/{day['deliverable_tickets']} done, {day['tested_tickets']} tested"
+        if report_type == "qa":
+            line += f", {day['defects']} defects"
+        line += " | "
+    line += f"week ({week['reports']} reports): {_percent(week['completion_ratio'])} done{_points(rollup['completion_trend'])}, {_percent(week['tested_ratio'])} tested"
+    if report_type == "qa":
+        line += f", defect rate {_percent(week['defect_rate'])}{_points(rollup['defect_trend'])}"
+    return line
+
+
+# Blocks for /report-summary, built from ReportAggregator.summary() results
+def summary_message_blocks(summaries):
+    blocks = [
+        {
+          "type": "header",
+          "text": {
+            "type": "plain_text",
+            "text": ":bar_chart: Report Summary :bar_chart:",
+            "emoji": True
+          }
+        }
+    ]
+    for summary in summaries:
+        blocks += [
+            {
+              "type": "section",
+              "text": {
+                "type": "mrkdwn",
+                "text": f"*{summary['report_type'].upper()}* — {summary['date']} (week {summary['week']}, trends vs last week)"
+              }
+            },
+            {
+              "type": "section",
+              "text": {
+                "type": "mrkdwn",
+                "text": "\n".join(_summary_line(team, rollup, summary["report_type"]) for team, rollup in summary["teams"].items())
+              }
+            },
+            {
+              "type": "divider"
+            }
+        ]
+    return blocks[:-1]
+
+
+# Blocks for the nudge posted in a reminder thread, listing the teams that have not reported
+def nudge_message_blocks(missing):
+    lines = "\n".join(
+        f"• {report_type.upper()}: {', '.join(f'*{team}*' for team in teams)}" for report_type, teams in missing.items()
+    )
+    return [
+        {
+          "type": "section",
+          "text": {
+            "type": "mrkdwn",
+            "text": f":hourglass_flowing_sand: <!here> Reports still missing:\n{lines}"
+          }
+        }
+    ]
+
+
+# Blocks for /deploy-history; times are shown in the channel's reminder timezone
+def deploy_history_blocks(deployments, window):
+    if not deployments:
+        return [
+            {
+              "type": "section",
+              "text": {
+                "type": "mrkdwn",
+                "text": "No matching deployments found."
+              }
+            }
+        ]
+    lines = [
+        f"• *{escape_mrkdwn(deployment['project'])}*: {deployment['deployment_type']} *{escape_mrkdwn(deployment['version']) if deployment['version'] else 'no version'}*"
+        f" on {window.local_time(deployment['deployed_at']).strftime('%Y-%m-%d %H:%M %Z')} in <#{deployment['channel_id']}>"
+        for deployment in deployments
+    ]
+    return line_sections(lines)
+
+
+# Slack rejects messages with more than 50 blocks
+MAX_BLOCKS = 50
+
+
+# Blocks for a bulk deployment notification; project lines fill sections up to Slack's text limit
+def bulk_deploy_message_blocks(deployment, projects):
+    project_lines = [f"• *{escape_mrkdwn(project)}*: *{escape_mrkdwn(version) if version else 'no version'}*" for project, version in projects]
+    return BULK_DEPLOY_TEMPLATE.render(dict(deployment, project_count=len(projects), project_lines=project_lines))
+
+
+# Split blocks into messages of at most MAX_BLOCKS, labelling each part when there are several
+def chunk_blocks(blocks, size=MAX_BLOCKS):
+    if len(blocks) <= size:
+        return [blocks]
+    parts = [blocks[start:start + size - 1] for start in range(0, len(blocks), size - 1)]
+    return [
+        part + [
+            {
+              "type": "context",
+              "elements": [{"type": "mrkdwn", "text": f"Part {index} of {len(parts)}"}]
+            }
+        ]
+        for index, part in enumerate(parts, 1)
+    ]
@@ -0,0 +1,83 @@
+import time
+import heapq
+import atexit
+import logging
+import itertools
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+# In-process timer: a heap of (due, sequence, key) served by one thread that sleeps on a
+# condition until the earliest deadline, or until an earlier job is scheduled; nothing polls.
+# Scheduling a key again replaces its pending job; replaced entries are skipped when they surface.
+class Scheduler:
+    def __init__(self, name="scheduler"):
+        self.name = name
+        self._heap = []
+        # key -> (sequence, callback, args) of the live job for that key
+        self._jobs = {}
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+            atexit.register(self.stop)
+        return self
+
+    # Run callback(*args) at the epoch time `due` (immediately if it has passed)
+    def schedule(self, due, key, callback, *args):
+        with self._condition:
+            sequence = next(self._sequence)
+            self._jobs[key] = (sequence, callback, args)
+            heapq.heappush(self._heap, (due, sequence, key))
+            if self._heap[0][1] == sequence:
+                self._condition.notify()
+
+    def cancel(self, key):
+        with self._condition:
+            return self._jobs.pop(key, None) is not None
+
+    def pending(self):
+        with self._condition:
+            return len(self._jobs)
+
+    def _live(self, entry):
+        job = self._jobs.get(entry[2])
+        return job is not None and job[0] == entry[1]
+
+    def _next_job(self):
+        with self._condition:
+            while not self._stopped:
+                while self._heap and not self._live(self._heap[0]):
+                    heapq.heappop(self._heap)
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+                delay = self._heap[0][0] - time.time()
+                if delay <= 0:
+                    _, _, key = heapq.heappop(self._heap)
+                    _, callback, args = self._jobs.pop(key)
+                    return callback, args
+                self._condition.wait(delay)
+            return None
+
+    def _run(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            callback, args = job
+            try:
+                callback(*args)
+            except Exception:
+                logger.exception(f"Scheduled job {callback.__name__} failed")
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
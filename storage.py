@@ -0,0 +1,412 @@
+import os
+import json
+import time
+import logging
+import sqlite3
+import threading
+from reminder_index import ReminderIndex
+from reminder_history import DEFAULT_HISTORY_DAYS, reminder_day
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reminders (
+    channel_id TEXT PRIMARY KEY,
+    message_ts TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reminder_history (
+    channel_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    message_ts TEXT NOT NULL,
+    PRIMARY KEY (channel_id, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    report_type TEXT NOT NULL,
+    channel_id TEXT NOT NULL,
+    thread_ts TEXT,
+    team TEXT,
+    date TEXT,
+    user_id TEXT,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reports_channel_id ON reports (channel_id);
+CREATE INDEX IF NOT EXISTS idx_reports_team_date ON reports (team, date);
+CREATE INDEX IF NOT EXISTS idx_reports_report_type ON reports (report_type);
+CREATE TABLE IF NOT EXISTS claims (
+    key TEXT PRIMARY KEY,
+    claimed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS report_rollups (
+    period TEXT NOT NULL,
+    report_type TEXT NOT NULL,
+    team TEXT NOT NULL,
+    reports INTEGER NOT NULL,
+    deliverable_tickets INTEGER NOT NULL,
+    definition_of_done INTEGER NOT NULL,
+    tested_tickets INTEGER NOT NULL,
+    defects INTEGER NOT NULL,
+    PRIMARY KEY (period, report_type, team)
+);
+CREATE TABLE IF NOT EXISTS deployments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    project TEXT NOT NULL,
+    project_key TEXT NOT NULL,
+    deployment_type TEXT,
+    version TEXT,
+    channel_id TEXT,
+    user_id TEXT,
+    deployed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_deployments_project_key ON deployments (project_key, deployed_at);
+CREATE INDEX IF NOT EXISTS idx_deployments_type ON deployments (deployment_type, deployed_at);
+CREATE INDEX IF NOT EXISTS idx_deployments_deployed_at ON deployments (deployed_at);
+"""
+
+# Numeric report fields kept per team in report_rollups
+ROLLUP_FIELDS = ("deliverable_tickets", "definition_of_done", "tested_tickets", "defects")
+
+# Longest a claim is kept; Slack stops retrying long before this
+CLAIM_RETENTION_SECONDS = 86400
+
+
+# Reminder and report store backed by SQLite in WAL mode.
+# Each thread gets its own connection so Bolt's worker threads can write concurrently;
+# reminder updates are single upserts, so there is no read-modify-write race.
+# reminder_history keeps each channel's reminders for its last `history_days` days.
+class SQLiteStore:
+    def __init__(self, path="devops_slack.db", busy_timeout=5.0, history_days=DEFAULT_HISTORY_DAYS):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self.history_days = history_days
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        self._claims_since_prune = 0
+
+        conn = self._connection()
+        conn.executescript(SCHEMA)
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    # Keeps the newer of the stored and the given reminder, so an older ts (e.g. found by the
+    # backfill while a live reminder arrived) never replaces a newer one
+    @metrics.store_operation("store_reminder")
+    def store_reminder(self, channel_id, message_ts):
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT INTO reminders (channel_id, message_ts, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (channel_id) DO UPDATE SET message_ts = excluded.message_ts, updated_at = excluded.updated_at "
+                "WHERE CAST(excluded.message_ts AS REAL) > CAST(reminders.message_ts AS REAL)",
+                (channel_id, message_ts, time.time())
+            )
+            self._add_history(conn, channel_id, reminder_day(channel_id, message_ts), message_ts)
+
+    # Record a reminder under its day (the latest of a day wins) and drop days beyond history_days
+    def _add_history(self, conn, channel_id, day, message_ts):
+        conn.execute(
+            "INSERT INTO reminder_history (channel_id, day, message_ts) VALUES (?, ?, ?) "
+            "ON CONFLICT (channel_id, day) DO UPDATE SET message_ts = excluded.message_ts "
+            "WHERE CAST(excluded.message_ts AS REAL) >= CAST(reminder_history.message_ts AS REAL)",
+            (channel_id, day, message_ts)
+        )
+        conn.execute(
+            "DELETE FROM reminder_history WHERE channel_id = ? AND day <= "
+            "(SELECT day FROM reminder_history WHERE channel_id = ? ORDER BY day DESC LIMIT 1 OFFSET ?)",
+            (channel_id, channel_id, self.history_days)
+        )
+
+    # The channel's reminder for a local day (ISO string); a primary key lookup
+    @metrics.store_operation("get_reminder_for_date")
+    def get_reminder_for_date(self, channel_id, day):
+        row = self._connection().execute(
+            "SELECT message_ts FROM reminder_history WHERE channel_id = ? AND day = ?",
+            (channel_id, day)
+        ).fetchone()
+        return row[0] if row else None
+
+    @metrics.store_operation("get_reminder")
+    def get_reminder(self, channel_id):
+        row = self._connection().execute(
+            "SELECT channel_id, message_ts FROM reminders WHERE channel_id = ?",
+            (channel_id,)
+        ).fetchone()
+        if row is None:
+            return None, None
+        return row[0], row[1]
+
+    def get_reminders(self):
+        return self._connection().execute("SELECT channel_id, message_ts FROM reminders").fetchall()
+
+    @metrics.store_operation("store_report")
+    def store_report(self, report_type, channel_id, thread_ts, team, date, payload, user_id=None):
+        self._connection().execute(
+            "INSERT INTO reports (report_type, channel_id, thread_ts, team, date, user_id, payload, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (report_type, channel_id, thread_ts, team, date, user_id, json.dumps(payload), time.time())
+        )
+
+    # Reports for a team, newest date first; served from the (team, date) index
+    @metrics.store_operation("get_reports")
+    def get_reports(self, team, date_from=None, date_to=None, report_type=None):
+        query = "SELECT report_type, channel_id, thread_ts, team, date, user_id, payload, created_at FROM reports WHERE team = ?"
+        params = [team]
+        if date_from is not None:
+            query += " AND date >= ?"
+            params.append(date_from)
+        if date_to is not None:
+            query += " AND date <= ?"
+            params.append(date_to)
+        if report_type is not None:
+            query += " AND report_type = ?"
+            params.append(report_type)
+        query += " ORDER BY date DESC, id DESC"
+
+        return [
+            {
+                "report_type": row[0],
+                "channel_id": row[1],
+                "thread_ts": row[2],
+                "team": row[3],
+                "date": row[4],
+                "user_id": row[5],
+                "payload": json.loads(row[6]),
+                "created_at": row[7]
+            }
+            for row in self._connection().execute(query, params)
+        ]
+
+    @metrics.store_operation("store_deployment")
+    def store_deployment(self, project, deployment_type, version, channel_id, user_id=None, deployed_at=None):
+        self.store_deployments(deployment_type, [(project, version)], channel_id, user_id, deployed_at)
+
+    # Projects shipped together by a bulk notification, written in one transaction
+    @metrics.store_operation("store_deployments")
+    def store_deployments(self, deployment_type, projects, channel_id, user_id=None, deployed_at=None):
+        deployed_at = deployed_at or time.time()
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN")
+            conn.executemany(
+                "INSERT INTO deployments (project, project_key, deployment_type, version, channel_id, user_id, deployed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(project, project.strip().lower(), deployment_type, version, channel_id, user_id, deployed_at) for project, version in projects]
+            )
+
+    # Newest deployments first. A project prefix (case-insensitive) is a range scan on
+    # idx_deployments_project_key; without one the type or time index serves the query.
+    @metrics.store_operation("get_deployments")
+    def get_deployments(self, project_prefix=None, deployment_type=None, since=None, until=None, limit=20):
+        query = "SELECT project, deployment_type, version, channel_id, user_id, deployed_at FROM deployments WHERE 1 = 1"
+        params = []
+        if project_prefix:
+            prefix = project_prefix.strip().lower()
+            query += " AND project_key >= ? AND project_key < ?"
+            params += [prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)]
+        if deployment_type is not None:
+            query += " AND deployment_type = ?"
+            params.append(deployment_type)
+        if since is not None:
+            query += " AND deployed_at >= ?"
+            params.append(since)
+        if until is not None:
+            query += " AND deployed_at < ?"
+            params.append(until)
+        query += " ORDER BY deployed_at DESC LIMIT ?"
+        params.append(limit)
+
+        return [
+            {
+                "project": row[0],
+                "deployment_type": row[1],
+                "version": row[2],
+                "channel_id": row[3],
+                "user_id": row[4],
+                "deployed_at": row[5]
+            }
+            for row in self._connection().execute(query, params)
+        ]
+
+    # Claim a unit of work (e.g. a view submission) for this process for `ttl` seconds.
+    # Returns False if any worker process holds an unexpired claim on the key.
+    @metrics.store_operation("claim")
+    def claim(self, key, ttl=CLAIM_RETENTION_SECONDS):
+        now = time.time()
+        conn = self._connection()
+        claimed = conn.execute(
+            "INSERT INTO claims (key, claimed_at) VALUES (?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET claimed_at = excluded.claimed_at WHERE claims.claimed_at < ?",
+            (key, now, now - ttl)
+        ).rowcount == 1
+
+        self._claims_since_prune += 1
+        if self._claims_since_prune >= 1000:
+            self._claims_since_prune = 0
+            conn.execute("DELETE FROM claims WHERE claimed_at < ?", (now - CLAIM_RETENTION_SECONDS,))
+        return claimed
+
+    # {report_type: {team, ...}} of the reports filed in a reminder thread
+    @metrics.store_operation("get_reported_teams")
+    def get_reported_teams(self, channel_id, thread_ts):
+        reported = {}
+        for report_type, team in self._connection().execute(
+            "SELECT DISTINCT report_type, team FROM reports WHERE channel_id = ? AND thread_ts = ?",
+            (channel_id, thread_ts)
+        ):
+            reported.setdefault(report_type, set()).add(team)
+        return reported
+
+    # Record a team's numbers for a day and fold them into its week.
+    # The day row holds the latest submission, so a corrected report replaces the earlier one;
+    # the week row is adjusted by the difference instead of being recomputed from the days.
+    @metrics.store_operation("record_rollup")
+    def record_rollup(self, report_type, team, day, week, counts):
+        values = [int(counts.get(field) or 0) for field in ROLLUP_FIELDS]
+        columns = ", ".join(ROLLUP_FIELDS)
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            previous = conn.execute(
+                f"SELECT {columns} FROM report_rollups WHERE period = ? AND report_type = ? AND team = ?",
+                (day, report_type, team)
+            ).fetchone()
+            conn.execute(
+                f"INSERT OR REPLACE INTO report_rollups (period, report_type, team, reports, {columns}) VALUES (?, ?, ?, 1, ?, ?, ?, ?)",
+                (day, report_type, team, *values)
+            )
+            deltas = values if previous is None else [value - old for value, old in zip(values, previous)]
+            conn.execute(
+                f"INSERT INTO report_rollups (period, report_type, team, reports, {columns}) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (period, report_type, team) DO UPDATE SET reports = reports + excluded.reports, "
+                + ", ".join(f"{field} = {field} + excluded.{field}" for field in ROLLUP_FIELDS),
+                (week, report_type, team, 1 if previous is None else 0, *deltas)
+            )
+
+    # {(period, team): {"reports": n, field: total, ...}} for the given periods
+    @metrics.store_operation("get_rollups")
+    def get_rollups(self, report_type, periods):
+        periods = list(periods)
+        rows = self._connection().execute(
+            f"SELECT period, team, reports, {', '.join(ROLLUP_FIELDS)} FROM report_rollups "
+            f"WHERE report_type = ? AND period IN ({', '.join('?' * len(periods))})",
+            (report_type, *periods)
+        )
+        return {(row[0], row[1]): dict(zip(("reports",) + ROLLUP_FIELDS, row[2:])) for row in rows}
+
+    def has_reminders(self):
+        return self._connection().execute("SELECT 1 FROM reminders LIMIT 1").fetchone() is not None
+
+    # Seed the reminders table from a legacy reminder_ts.json file
+    def import_reminder_file(self, path):
+        index = ReminderIndex(path).load()
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN")
+            for channel_id, message_ts in index.items():
+                conn.execute(
+                    "INSERT OR IGNORE INTO reminders (channel_id, message_ts, updated_at) VALUES (?, ?, ?)",
+                    (channel_id, message_ts, time.time())
+                )
+                self._add_history(conn, channel_id, reminder_day(channel_id, message_ts), message_ts)
+            for channel_id, day, message_ts in index.history_items():
+                self._add_history(conn, channel_id, day, message_ts)
+
+    def close(self):
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+        self._local = threading.local()
+
+
+# Reminder store backed by the in-memory index and reminder_ts.json.
+# Reports are not persisted by this backend.
+class JsonStore:
+    def __init__(self, path="reminder_ts.json", history_days=DEFAULT_HISTORY_DAYS):
+        self.index = ReminderIndex(path, history_days=history_days).load().start()
+
+    @metrics.store_operation("store_reminder")
+    def store_reminder(self, channel_id, message_ts):
+        self.index.set(channel_id, message_ts, reminder_day(channel_id, message_ts))
+
+    @metrics.store_operation("get_reminder")
+    def get_reminder(self, channel_id):
+        return self.index.get(channel_id)
+
+    @metrics.store_operation("get_reminder_for_date")
+    def get_reminder_for_date(self, channel_id, day):
+        return self.index.get_for_date(channel_id, day)
+
+    def get_reminders(self):
+        return self.index.items()
+
+    @metrics.store_operation("store_report")
+    def store_report(self, report_type, channel_id, thread_ts, team, date, payload, user_id=None):
+        logger.debug(f"Not persisting {report_type} report for {team}: json backend keeps reminders only")
+
+    @metrics.store_operation("get_reports")
+    def get_reports(self, team, date_from=None, date_to=None, report_type=None):
+        return []
+
+    # None: reports are not kept, so nobody can be known to be missing
+    @metrics.store_operation("get_reported_teams")
+    def get_reported_teams(self, channel_id, thread_ts):
+        return None
+
+    @metrics.store_operation("record_rollup")
+    def record_rollup(self, report_type, team, day, week, counts):
+        logger.debug(f"Not aggregating {report_type} report for {team}: json backend keeps reminders only")
+
+    @metrics.store_operation("get_rollups")
+    def get_rollups(self, report_type, periods):
+        return {}
+
+    @metrics.store_operation("store_deployment")
+    def store_deployment(self, project, deployment_type, version, channel_id, user_id=None, deployed_at=None):
+        logger.debug(f"Not recording deployment of {project}: json backend keeps reminders only")
+
+    @metrics.store_operation("store_deployments")
+    def store_deployments(self, deployment_type, projects, channel_id, user_id=None, deployed_at=None):
+        logger.debug(f"Not recording {len(projects)} deployments: json backend keeps reminders only")
+
+    @metrics.store_operation("get_deployments")
+    def get_deployments(self, project_prefix=None, deployment_type=None, since=None, until=None, limit=20):
+        return []
+
+    # No durable claims: with a single process the in-memory DedupCache is enough
+    @metrics.store_operation("claim")
+    def claim(self, key, ttl=CLAIM_RETENTION_SECONDS):
+        return True
+
+    def close(self):
+        self.index.close()
+
+
+# Build the storage backend selected by STORAGE_BACKEND ("sqlite" or "json")
+def open_store(backend=None):
+    backend = backend or os.environ.get("STORAGE_BACKEND", "sqlite")
+    reminder_file = os.environ.get("REMINDER_FILE", "reminder_ts.json")
+
+    if backend == "json":
+        return JsonStore(reminder_file)
+    if backend == "sqlite":
+        store = SQLiteStore(os.environ.get("DATABASE_PATH", "devops_slack.db"))
+        if not store.has_reminders() and os.path.exists(reminder_file):
+            logger.info(f"Importing reminders from {reminder_file}")
+            store.import_reminder_file(reminder_file)
+        return store
+    raise ValueError(f"Unknown STORAGE_BACKEND: {backend}")
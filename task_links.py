@@ -0,0 +1,241 @@
+import os
+import re
+import json
+import time
+import logging
+import threading
+import urllib.request
+from collections import OrderedDict
+from urllib.parse import urlsplit, urlunsplit, quote
+from concurrent.futures import ThreadPoolExecutor, wait
+from block_templates import escape_mrkdwn
+
+logger = logging.getLogger(__name__)
+
+URL_PATTERN = re.compile(r"https?://[^\s<>|]+")
+TICKET_PATTERN = re.compile(r"\b[A-Z][A-Z0-9_]+-\d+\b")
+TRAILING_PUNCTUATION = ".,;:!?'\")]}"
+
+
+# One task reference from a deploy notification: a URL, a ticket key, or both
+class TaskLink:
+    def __init__(self, url=None, key=None, note=None):
+        self.url = url
+        self.key = key
+        # What the author wrote next to it, shown when the tracker has no title
+        self.note = note
+
+    @property
+    def identity(self):
+        return self.key or self.url
+
+
+def normalize_url(url):
+    url = url.rstrip(TRAILING_PUNCTUATION)
+    parts = urlsplit(url)
+    netloc = parts.netloc.lower()
+    if (parts.scheme == "http" and netloc.endswith(":80")) or (parts.scheme == "https" and netloc.endswith(":443")):
+        netloc = netloc.rsplit(":", 1)[0]
+    path = parts.path.rstrip("/") if parts.path not in ("", "/") else ""
+    return urlunsplit((parts.scheme.lower(), netloc, path, parts.query, ""))
+
+
+# Bounded LRU cache whose entries also expire after `ttl` seconds
+class TTLCache:
+    def __init__(self, maxsize=2048, ttl=3600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # (found, value)
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# Looks up ticket titles in the tracker's REST API, e.g.
+# TASK_TRACKER_API_URL="https://example.atlassian.net/rest/api/2/issue/{key}?fields=summary"
+# with TASK_TRACKER_TITLE_FIELD="fields.summary". Only ticket keys are resolved, never arbitrary
+# URLs from the modal, so the app does not fetch whatever users paste.
+class HttpTitleResolver:
+    def __init__(self, api_url, title_field="fields.summary", token=None, timeout=5.0):
+        self.api_url = api_url
+        self.title_field = title_field.split(".")
+        self.token = token
+        self.timeout = timeout
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            os.environ["TASK_TRACKER_API_URL"],
+            title_field=os.environ.get("TASK_TRACKER_TITLE_FIELD", "fields.summary"),
+            token=os.environ.get("TASK_TRACKER_TOKEN")
+        )
+
+    def resolve(self, link):
+        if not link.key:
+            return None
+        request = urllib.request.Request(self.api_url.format(key=quote(link.key)), headers={"Accept": "application/json"})
+        if self.token:
+            request.add_header("Authorization", f"Bearer {self.token}")
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            value = json.loads(response.read())
+        for name in self.title_field:
+            value = value.get(name) if isinstance(value, dict) else None
+        return value if isinstance(value, str) else None
+
+
+# TASK_TITLE_RESOLVER picks one; "none" renders links without titles
+RESOLVERS = {
+    "none": lambda: None,
+    "http": HttpTitleResolver.from_env
+}
+
+
+# Turns the free-form "Key Changes & Tasks" text into a deduplicated list of links.
+# Titles come from the resolver through a shared LRU+TTL cache; uncached ones are resolved
+# concurrently and whatever is not back within `timeout` is rendered without a title
+# (the lookup keeps running and fills the cache for the next notification).
+class TaskLinkProcessor:
+    def __init__(self, resolver=None, cache=None, timeout=1.0, ticket_url=None, ticket_prefixes=(), workers=8, failure_ttl=60.0):
+        self.resolver = resolver
+        self.cache = cache or TTLCache()
+        self.timeout = timeout
+        # Template that turns a bare ticket key into a link, e.g. "https://example.atlassian.net/browse/{key}"
+        self.ticket_url = ticket_url
+        # Project keys ("PAY", "OPS") whose bare keys are tickets; outside a URL, words like
+        # SHA-256 or UTF-8 look just the same
+        self.ticket_prefixes = frozenset(ticket_prefixes)
+        self.failure_ttl = failure_ttl
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="task-link") if resolver else None
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    # TASK_TITLE_RESOLVER, TASK_TICKET_URL, TASK_TICKET_PREFIXES (comma-separated), TASK_RESOLVE_TIMEOUT,
+    # TASK_TITLE_CACHE_SIZE, TASK_TITLE_CACHE_TTL
+    @classmethod
+    def from_env(cls):
+        return cls(
+            resolver=RESOLVERS[os.environ.get("TASK_TITLE_RESOLVER", "none")](),
+            cache=TTLCache(
+                maxsize=int(os.environ.get("TASK_TITLE_CACHE_SIZE", "2048")),
+                ttl=float(os.environ.get("TASK_TITLE_CACHE_TTL", "3600"))
+            ),
+            timeout=float(os.environ.get("TASK_RESOLVE_TIMEOUT", "1.0")),
+            ticket_url=os.environ.get("TASK_TICKET_URL"),
+            ticket_prefixes=[prefix.strip() for prefix in os.environ.get("TASK_TICKET_PREFIXES", "").split(",") if prefix.strip()]
+        )
+
+    # Links in order of first appearance, plus the lines that held no link at all
+    def extract(self, text):
+        links = OrderedDict()
+        notes = []
+        for line in (text or "").splitlines():
+            rest = line
+            found = []
+            for match in URL_PATTERN.finditer(line):
+                url = normalize_url(match.group())
+                key = TICKET_PATTERN.search(url)
+                found.append(TaskLink(url, key.group() if key else None))
+                rest = rest.replace(match.group(), " ")
+            for key in TICKET_PATTERN.findall(rest):
+                if key.rsplit("-", 1)[0] not in self.ticket_prefixes:
+                    continue
+                found.append(TaskLink(self.ticket_url.format(key=key) if self.ticket_url else None, key))
+                rest = rest.replace(key, " ")
+            rest = " ".join(rest.split()).strip(" -•*,;:")
+            if not found:
+                if rest:
+                    notes.append(rest)
+                continue
+            # "PAY-101 fix refund rounding": the text describes the line's only reference;
+            # next to several, it stays a line of its own
+            if rest and len(found) == 1:
+                found[0].note = rest
+            elif rest:
+                notes.append(rest)
+            for link in found:
+                existing = links.setdefault(link.identity, link)
+                # A bare key seen before its pasted URL takes the URL
+                existing.url = existing.url or link.url
+                if link.note and existing.note not in (None, link.note):
+                    # The reference already has a note from an earlier line; keep this one as text
+                    notes.append(link.note)
+                existing.note = existing.note or link.note
+        return list(links.values()), notes
+
+    def _resolve(self, link):
+        try:
+            title = self.resolver.resolve(link)
+            self.cache.set(link.identity, title)
+        except Exception as e:
+            logger.info(f"Could not resolve {link.identity}: {e}")
+            self.cache.set(link.identity, None, ttl=self.failure_ttl)
+            title = None
+        finally:
+            with self._lock:
+                self._inflight.pop(link.identity, None)
+        return title
+
+    # {identity: title} for the links, waiting at most `timeout` for uncached ones
+    def titles(self, links):
+        titles = {}
+        if self.resolver is None:
+            return titles
+        futures = {}
+        for link in links:
+            found, title = self.cache.get(link.identity)
+            if found:
+                titles[link.identity] = title
+                continue
+            with self._lock:
+                # The same ticket in flight for another notification is awaited, not fetched again
+                future = self._inflight.get(link.identity)
+                if future is None:
+                    future = self._inflight[link.identity] = self._executor.submit(self._resolve, link)
+            futures[link.identity] = future
+        if futures:
+            wait(futures.values(), timeout=self.timeout)
+        for identity, future in futures.items():
+            if future.done():
+                titles[identity] = future.result()
+        return titles
+
+    # mrkdwn list of the links, with titles where known, followed by any free-text lines;
+    # user text is escaped, so the result is safe to post as-is
+    def render(self, text):
+        links, notes = self.extract(text)
+        if not links:
+            return escape_mrkdwn(text) if text else text
+        titles = self.titles(links)
+        lines = []
+        for link in links:
+            title = titles.get(link.identity) or link.note
+            label = link.key or link.url.split("://", 1)[-1]
+            line = f"<{link.url}|{escape_mrkdwn(label)}>" if link.url else f"*{escape_mrkdwn(label)}*"
+            if title:
+                line += f" {escape_mrkdwn(title)}"
+            lines.append(f"• {line}")
+        return "\n".join(lines + [escape_mrkdwn(note) for note in notes])
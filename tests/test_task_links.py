@@ -0,0 +1,75 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from task_links import TaskLinkProcessor
+from reports import deploy_message_blocks, bulk_deploy_message_blocks
+from block_templates import MAX_SECTION_TEXT
+
+
+def processor():
+    return TaskLinkProcessor(ticket_url="https://tracker.example.com/browse/{key}", ticket_prefixes=("PAY",))
+
+
+def test_single_reference_takes_the_line_text_as_note():
+    links, notes = processor().extract("PAY-101 fix refund rounding")
+    assert [(link.key, link.note) for link in links] == [("PAY-101", "fix refund rounding")]
+    assert notes == []
+
+
+def test_text_next_to_several_keys_is_kept():
+    links, notes = processor().extract("PAY-1, PAY-2: refund rounding and currency fixes")
+    assert [(link.key, link.note) for link in links] == [("PAY-1", None), ("PAY-2", None)]
+    assert notes == ["refund rounding and currency fixes"]
+
+
+def test_text_next_to_several_urls_is_kept():
+    links, notes = processor().extract("Hotfix for login crash https://git.example.com/pr/1 https://git.example.com/pr/2")
+    assert [link.url for link in links] == ["https://git.example.com/pr/1", "https://git.example.com/pr/2"]
+    assert notes == ["Hotfix for login crash"]
+
+
+def test_second_note_for_a_reference_is_kept():
+    links, notes = processor().extract("PAY-1 refund rounding\nPAY-1 currency fixes")
+    assert [(link.key, link.note) for link in links] == [("PAY-1", "refund rounding")]
+    assert notes == ["currency fixes"]
+
+
+def test_url_after_bare_key_is_kept():
+    links, _ = processor().extract("PAY-7\nhttps://other.example.com/PAY-7")
+    assert [(link.key, link.url) for link in links] == [("PAY-7", "https://tracker.example.com/browse/PAY-7")]
+    links, _ = TaskLinkProcessor(ticket_prefixes=("PAY",)).extract("PAY-7\nhttps://other.example.com/PAY-7")
+    assert [(link.key, link.url) for link in links] == [("PAY-7", "https://other.example.com/PAY-7")]
+
+
+def test_unconfigured_prefix_is_not_a_ticket():
+    links, notes = processor().extract("Switch to SHA-256 and UTF-8")
+    assert links == []
+    assert notes == ["Switch to SHA-256 and UTF-8"]
+
+
+def test_render_lists_links_then_free_text():
+    rendered = processor().render("PAY-1, PAY-2: refund & rounding")
+    assert rendered == (
+        "• <https://tracker.example.com/browse/PAY-1|PAY-1>\n"
+        "• <https://tracker.example.com/browse/PAY-2|PAY-2>\n"
+        "refund &amp; rounding"
+    )
+
+
+def test_render_without_links_escapes_the_text():
+    assert processor().render("ship <it> & go") == "ship &lt;it&gt; &amp; go"
+
+
+def test_long_rendered_list_is_split_into_sections():
+    text = "\n".join(f"https://git.example.com/org/repo/pull/{number}" for number in range(70))
+    rendered = processor().render(text)
+    assert len(text) < MAX_SECTION_TEXT < len(rendered)
+    for blocks in (
+        deploy_message_blocks({"project_name": "payments-api", "deployment_type": "Production", "deployment_version": None, "task_links": rendered, "additional_notes": None}),
+        bulk_deploy_message_blocks({"deployment_type": "Production", "task_links": rendered, "additional_notes": None}, [("payments-api", "v1")])
+    ):
+        sections = [block["text"]["text"] for block in blocks if block["type"] == "section"]
+        assert all(len(text) <= MAX_SECTION_TEXT for text in sections)
+        assert "\n".join(sections).count("• <https://git.example.com") == 70
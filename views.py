@@ -0,0 +1,118 @@
+import json
+import time
+from forms import Form, select, radio, datepicker, number, text
+from records import BAReport, QAReport, DeployNotice
+from ack_watchdog import watchdog, views_opened
+
+# Modal views opened by the slash commands.
+# Each modal is built once at import time and registered in VIEWS; only private_metadata
+# changes between requests, so it is spliced into the pre-serialized JSON per call.
+
+TEAM_NAMES = ["Core", "Titan", "AIS", "App", "Badr", "404"]
+YES_NO_NA = ["Yes", "No", "N/A"]
+DEPLOYMENT_TYPES = ["Production", "Staging", "Development"]
+
+# Modal for /notify-deploy; private_metadata carries the target channel
+DEPLOY_FORM = Form(
+    "deploy_modal",
+    "Deployment Notification",
+    "Send",
+    ":wave: Hey!\n\nPlease fill the form to notify the team about the latest deployment.",
+    [
+        text("project_name", "Project Name"),
+        select("deployment_type", "Deployment Type", DEPLOYMENT_TYPES, "Select mode"),
+        text("deployment_version", "Deployment Version", "e.g., v1.4.2 (Optional)", optional=True),
+        text("task_links", "Key Changes & Tasks", "List task links separated by new lines", multiline=True),
+        text("additional_notes", "Additional Notes", "Any additional comments or notes? (Optional)", multiline=True, optional=True)
+    ],
+    record=DeployNotice
+)
+
+# Modal for "/notify-deploy bulk": many projects shipped together, one per line
+BULK_DEPLOY_FORM = Form(
+    "deploy_bulk_modal",
+    "Bulk Deployment",
+    "Send",
+    ":wave: Hey!\n\nList every project in this release, one per line as: project, version. Rows pasted from a spreadsheet work too.",
+    [
+        select("deployment_type", "Deployment Type", DEPLOYMENT_TYPES, "Select mode"),
+        text("projects", "Projects & Versions", "payments-api, v1.4.2", multiline=True),
+        text("task_links", "Key Changes & Tasks", "List task links separated by new lines (Optional)", multiline=True, optional=True),
+        text("additional_notes", "Additional Notes", "Any additional comments or notes? (Optional)", multiline=True, optional=True)
+    ]
+)
+
+# Modal for /report-ba; private_metadata carries "<channel_id>,<reminder_message_ts>"
+BA_FORM = Form(
+    "report_ba_modal",
+    "Deliverable Items Report",
+    "Generate",
+    ":wave: Hi!\n\nPlease fill the form to generate the report.",
+    [
+        select("team_name", "Team Name", TEAM_NAMES, "Select name"),
+        datepicker("date", "Date", "Select a date", block_id="datepicker"),
+        number("deliverable_tickets", "Deliverable Tickets"),
+        number("definition_of_done", "Definition of Done"),
+        number("tested_tickets", "Tested Tickets"),
+        radio("spent_time", "Update spent time sheet (all status)", YES_NO_NA),
+        radio("project_status", "Update project status sheet", YES_NO_NA),
+        radio("sprint_plan", "Update sprint plan sheet", YES_NO_NA),
+        radio("client_update", "Did we update clients?", YES_NO_NA, optional=True),
+        text("why_failed", "Why failed to done?", "Write in one sentence", multiline=True, optional=True),
+        text("additional_notes", "Additional Notes", "Any additional comments or notes?", multiline=True, optional=True)
+    ],
+    record=BAReport
+)
+
+# Modal for /report-qa; private_metadata carries "<channel_id>,<reminder_message_ts>"
+QA_FORM = Form(
+    "report_qa_modal",
+    "Deliverable Items Report",
+    "Generate",
+    ":wave: Hi!\n\nPlease fill the form to generate the report.",
+    [
+        select("team_name", "Team Name", TEAM_NAMES, "Select name"),
+        datepicker("date", "Date", "Select a date", block_id="datepicker"),
+        number("deliverable_tickets", "Deliverable Tickets"),
+        number("definition_of_done", "Definition of Done"),
+        number("tested_tickets", "Tested Tickets"),
+        number("defects", "Defects"),
+        radio("spent_time", "Update Actual in Spent Time Sheet", YES_NO_NA),
+        text("problem", "Problems of the team", "Write in one sentence", multiline=True, optional=True),
+        text("additional_notes", "Additional Notes", "Any additional comments or notes?", multiline=True, optional=True)
+    ],
+    record=QAReport
+)
+
+FORMS = {form.callback_id: form for form in (DEPLOY_FORM, BULK_DEPLOY_FORM, BA_FORM, QA_FORM)}
+
+
+# A modal built once, with its JSON split around the private_metadata value
+class ViewTemplate:
+    _PLACEHOLDER = "\x00private_metadata\x00"
+
+    def __init__(self, build):
+        self.view = build(self._PLACEHOLDER)
+        serialized = json.dumps(self.view, separators=(",", ":"))
+        self._prefix, self._suffix = serialized.split(json.dumps(self._PLACEHOLDER), 1)
+
+    # View dict for views_open; the block tree is shared, never mutate it
+    def render(self, private_metadata):
+        return dict(self.view, private_metadata=private_metadata)
+
+    def render_json(self, private_metadata):
+        return self._prefix + json.dumps(private_metadata) + self._suffix
+
+
+VIEWS = {callback_id: ViewTemplate(form.view) for callback_id, form in FORMS.items()}
+
+
+# Open a registered modal by sending its pre-serialized JSON.
+# Works with both WebClient and AsyncWebClient; await the result for the latter.
+# View build and API call times are reported to the ack watchdog under the trigger_id.
+def open_view(client, trigger_id, callback_id, private_metadata):
+    with watchdog.phase(trigger_id, "view_build"):
+        view = VIEWS[callback_id].render_json(private_metadata)
+    api_started = time.monotonic()
+    response = client.api_call("views.open", data={"trigger_id": trigger_id, "view": view})
+    return views_opened(trigger_id, response, api_started)
@@ -0,0 +1,105 @@
+import os
+import time
+import signal
+import logging
+import multiprocessing
+from multiprocessing.connection import wait
+
+logger = logging.getLogger(__name__)
+
+# Slack accepts at most 10 concurrent Socket Mode connections per app
+MAX_CONNECTIONS = 10
+
+
+# Number of Socket Mode worker processes requested by SOCKET_MODE_WORKERS
+def worker_count():
+    count = int(os.environ.get("SOCKET_MODE_WORKERS", "1"))
+    if count > MAX_CONNECTIONS:
+        logger.warning(f"SOCKET_MODE_WORKERS={count} exceeds Slack's limit, using {MAX_CONNECTIONS}")
+        count = MAX_CONNECTIONS
+    return max(1, count)
+
+
+# Run `target(worker_index, ready)` in `count` processes, each opening its own Socket Mode
+# connection; Slack spreads envelopes across the open connections. A worker sets `ready` once it
+# is connected. Workers that die are restarted.
+# SIGHUP reloads the workers onto the code now on disk, one at a time: a replacement starts and
+# connects before the worker it replaces gets SIGTERM and drains (see lifecycle.py), so Slack
+# always has an open connection. SIGTERM/SIGINT stop every worker the same way; workers still
+# running after stop_timeout are killed.
+# State is shared through the SQLite store, so the json backend is refused here.
+def run_workers(count, target, restart_delay=1.0, stop_timeout=30.0, ready_timeout=60.0):
+    if os.environ.get("STORAGE_BACKEND", "sqlite") != "sqlite":
+        raise RuntimeError("Socket Mode workers require STORAGE_BACKEND=sqlite")
+
+    # spawn, not fork: every worker builds its own app, sockets and database connections
+    context = multiprocessing.get_context("spawn")
+    processes = {}
+    # Replaced workers still draining
+    retiring = []
+    stopping = False
+    reload_requested = False
+
+    def spawn(index):
+        ready = context.Event()
+        process = context.Process(target=target, args=(index, ready), name=f"socket-mode-worker-{index}")
+        # Kept alongside the process: the event's semaphore goes away with the last reference
+        process.ready = ready
+        process.start()
+        logger.info(f"Started Socket Mode worker {index} (pid {process.pid})")
+        return process
+
+    # Swap worker `index` for a new process once that one is connected; a replacement that
+    # does not connect within ready_timeout is killed and the old worker kept
+    def replace(index):
+        process = spawn(index)
+        deadline = time.monotonic() + ready_timeout
+        while not process.ready.wait(0.5):
+            if stopping or not process.is_alive() or time.monotonic() > deadline:
+                logger.error(f"Replacement for Socket Mode worker {index} did not connect, keeping pid {processes[index].pid}")
+                process.kill()
+                process.join()
+                return False
+        old, processes[index] = processes[index], process
+        old.terminate()
+        retiring.append(old)
+        return True
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for process in list(processes.values()) + retiring:
+            if process.is_alive():
+                process.terminate()
+
+    def reload(signum, frame):
+        nonlocal reload_requested
+        reload_requested = True
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGHUP, reload)
+
+    for index in range(count):
+        processes[index] = spawn(index)
+
+    while not stopping:
+        if reload_requested:
+            reload_requested = False
+            logger.info("Reloading Socket Mode workers")
+            for index in list(processes):
+                if stopping or not replace(index):
+                    break
+        wait([process.sentinel for process in list(processes.values()) + retiring], timeout=1.0)
+        retiring[:] = [process for process in retiring if process.is_alive()]
+        for index, process in list(processes.items()):
+            if not process.is_alive() and not stopping:
+                logger.warning(f"Socket Mode worker {index} exited with {process.exitcode}, restarting")
+                time.sleep(restart_delay)
+                processes[index] = spawn(index)
+
+    deadline = time.monotonic() + stop_timeout
+    for process in list(processes.values()) + retiring:
+        process.join(max(0.0, deadline - time.monotonic()))
+        if process.is_alive():
+            process.kill()